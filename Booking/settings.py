@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.0/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -46,6 +47,10 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # першим, щоб total охоплював увесь ланцюжок middleware
+    'BookingApp.middleware.ServerTimingMiddleware',
+    # стиснення gzip/brotli великих відповідей (BOOKING_COMPRESSION); до інших middleware, що пишуть тіло
+    'BookingApp.middleware.CompressionMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -87,6 +92,53 @@ DATABASES = {
     }
 }
 
+# Профіль БД для продакшену: BOOKING_DB_PROFILE=production.
+# WAL + прагми на кожне з'єднання, постійні з'єднання між запитами і окреме read-only
+# з'єднання 'replica' для важких GET (список/деталі), щоб читачі не блокували запис.
+BOOKING_DB_PROFILE = os.environ.get('BOOKING_DB_PROFILE', 'development')
+
+BOOKING_SQLITE_PRAGMAS = {}
+
+if BOOKING_DB_PROFILE == 'production':
+    DATABASES['default'].update({
+        'CONN_MAX_AGE': 600,
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {'timeout': 20},
+    })
+    DATABASES['replica'] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': 'file:%s?mode=ro' % (BASE_DIR / 'db.sqlite3'),
+        'CONN_MAX_AGE': 600,
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {'timeout': 20},
+        'TEST': {'MIRROR': 'default'},
+    }
+    DATABASE_ROUTERS = ['BookingApp.routers.ReadReplicaRouter']
+    BOOKING_SQLITE_PRAGMAS = {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'cache_size': -64000,  # 64 МБ
+        'mmap_size': 268435456,  # 256 МБ
+        'temp_store': 'MEMORY',
+    }
+
+
+# Cache
+# Кеш каталогу готелів і кімнат (BookingApp.cache). locmem живе в межах одного процесу —
+# при кількох воркерах варто взяти FileBasedCache або DatabaseCache, щоб інвалідація була спільною.
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'booking-catalog',
+    }
+}
+
+BOOKING_CATALOG_CACHE_TIMEOUT = 300
+
+# OpenAPI-схема, згенерована командою generate_schema
+BOOKING_SCHEMA_PATH = BASE_DIR / 'schema' / 'openapi.json'
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.0/ref/settings/#auth-password-validators
@@ -131,13 +183,97 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework.authentication.BasicAuthentication',
+        # Basic auth з кешем перевірених облікових даних (без PBKDF2 на кожен запит)
+        'BookingApp.authentication.CachedBasicAuthentication',
         'rest_framework.authentication.SessionAuthentication',
         'rest_framework.authentication.TokenAuthentication',
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        # JWT без запиту User: request.user — TokenUser, зібраний із claims токена
+        'rest_framework_simplejwt.authentication.JWTStatelessUserAuthentication',
     ]
 }
 
+# Кеш перевірених Basic-облікових даних: максимум записів і час життя в секундах
+BOOKING_BASIC_AUTH_CACHE = {
+    'SIZE': 1024,
+    'TTL': 300,
+}
+
+# Server-Timing і статистика часу запитів по ендпоінтах (GET /stats/timings/ для адміністраторів).
+# ENABLED=False прибирає middleware повністю; HEADER=False лишає статистику, але не віддає заголовок клієнтам.
+BOOKING_SERVER_TIMING = {
+    'ENABLED': os.environ.get('BOOKING_SERVER_TIMING', '1') != '0',
+    'HEADER': True,
+    'WINDOW': 1000,
+}
+
+# Фонові задачі в БД (BookingApp.jobs), воркери: python manage.py run_jobs.
+# VISIBILITY_TIMEOUT — секунди, після яких задачу впалого воркера може взяти інший;
+# повтори через RETRY_BACKOFF * 2^(спроба-1) секунд; виконані задачі зберігаються KEEP_FINISHED_DAYS днів.
+BOOKING_JOBS = {
+    'VISIBILITY_TIMEOUT': 300,
+    'MAX_ATTEMPTS': 5,
+    'RETRY_BACKOFF': 10,
+    'POLL_INTERVAL': 1,
+    'KEEP_FINISHED_DAYS': 7,
+}
+
+# Архів бронювань (manage.py archive_reservations): виїзд раніше ніж AFTER_DAYS днів тому -> ArchivedReservation.
+# Списки читають архів лише для явного діапазону дат, що починається до цього горизонту.
+BOOKING_ARCHIVE = {
+    'AFTER_DAYS': 365,
+    'BATCH_SIZE': 1000,
+}
+
+# Утримання кімнат на час оформлення (POST /holds/): тривалість за замовчуванням і максимальна, хвилини.
+# Прострочені прибирає manage.py expire_holds (на доступність вони не впливають і до того).
+BOOKING_HOLDS = {
+    'TTL_MINUTES': 10,
+    'MAX_TTL_MINUTES': 30,
+}
+
+# Заголовок Idempotency-Key на POST бронювань і реєстрації: відповіді зберігаються TTL секунд;
+# повтор, поки перший запит ще виконується, чекає до WAIT секунд; прострочені ключі видаляє evict_idempotency_keys
+BOOKING_IDEMPOTENCY = {
+    'TTL': 24 * 3600,
+    'WAIT': 10,
+    'IN_FLIGHT_TIMEOUT': 60,
+}
+
+# Дельта-синхронізація GET /changes/?since=<cursor>: записів журналу на сторінку (за замовчуванням і максимум);
+# записи, старші за KEEP_DAYS днів, видаляє prune_changes — клієнт з давнішим курсором отримає 410
+BOOKING_CHANGES = {
+    'PAGE_SIZE': 500,
+    'MAX_PAGE_SIZE': 1000,
+    'KEEP_DAYS': 30,
+}
+
+# SSE-події бронювань (async/events/): BROKER 'local' — розсилка в межах процесу (один процес ASGI),
+# 'database' — через таблицю EventMessage для кількох процесів (опитування раз на POLL_INTERVAL секунд);
+# BUFFER — подій у черзі клієнта до resync, HEARTBEAT — секунд між коментарями-пінгами
+BOOKING_EVENTS = {
+    'BROKER': 'local',
+    'BUFFER': 100,
+    'HEARTBEAT': 15,
+    'MAX_TOPICS': 50,
+    'POLL_INTERVAL': 0.5,
+    'KEEP_SECONDS': 300,
+}
+
+# Стиснення відповідей (CompressionMiddleware): brotli, якщо встановлено пакет brotli, інакше gzip;
+# відповіді, менші за MIN_SIZE байт, не стискаються; потокові — завжди (розмір наперед невідомий)
+BOOKING_COMPRESSION = {
+    'ENABLED': True,
+    'MIN_SIZE': 1024,
+    'GZIP_LEVEL': 6,
+    'BROTLI_QUALITY': 5,
+}
+
+# розмір сторінки за замовчуванням для ?cursor / ?page_size на списках
+BOOKING_PAGE_SIZE = 100
+
+# межі цінових діапазонів (за ніч) для фасетів rooms/search/
+BOOKING_PRICE_BUCKETS = [50, 100, 150, 200, 300]
+
 AUTHENTICATION_BACKENDS = [
     'django.contrib.auth.backends.ModelBackend',
 ]
@@ -176,7 +312,7 @@ SIMPLE_JWT = {
     "SLIDING_TOKEN_LIFETIME": timedelta(minutes=5),
     "SLIDING_TOKEN_REFRESH_LIFETIME": timedelta(days=1),
 
-    "TOKEN_OBTAIN_SERIALIZER": "rest_framework_simplejwt.serializers.TokenObtainPairSerializer",
+    "TOKEN_OBTAIN_SERIALIZER": "BookingApp.serializers.ClaimsTokenObtainPairSerializer",
     "TOKEN_REFRESH_SERIALIZER": "rest_framework_simplejwt.serializers.TokenRefreshSerializer",
     "TOKEN_VERIFY_SERIALIZER": "rest_framework_simplejwt.serializers.TokenVerifySerializer",
     "TOKEN_BLACKLIST_SERIALIZER": "rest_framework_simplejwt.serializers.TokenBlacklistSerializer",
@@ -3,19 +3,25 @@ from rest_framework import permissions
 from drf_yasg.views import get_schema_view
 from drf_yasg import openapi
 
+from BookingApp.schema import stored_schema_view
+
+api_info = openapi.Info(
+   title="Snippets API",
+   default_version='v1',
+   description="Test description",
+   license=openapi.License(name="BSD License"),
+)
+
 schema_view = get_schema_view(
-   openapi.Info(
-      title="Snippets API",
-      default_version='v1',
-      description="Test description",
-      license=openapi.License(name="BSD License"),
-   ),
+   api_info,
    public=True,
    permission_classes=(permissions.AllowAny,),
 )
 
+# JSON-схема (і ?format=openapi, який запитують swagger/redoc) віддається з файлу,
+# згенерованого командою generate_schema, а сторінки swagger/redoc — без побудови схеми
 urlpatterns = [
-   path('swagger<format>/', schema_view.without_ui(cache_timeout=0), name='schema-json'),
-   path('swagger/', schema_view.with_ui('swagger', cache_timeout=0), name='schema-swagger-ui'),
-   path('redoc/', schema_view.with_ui('redoc', cache_timeout=0), name='schema-redoc'),
-]
\ No newline at end of file
+   path('swagger<format>/', stored_schema_view(schema_view.without_ui(cache_timeout=0)), name='schema-json'),
+   path('swagger/', stored_schema_view(schema_view.with_ui('swagger', cache_timeout=0), ui='swagger'), name='schema-swagger-ui'),
+   path('redoc/', stored_schema_view(schema_view.with_ui('redoc', cache_timeout=0), ui='redoc'), name='schema-redoc'),
+]
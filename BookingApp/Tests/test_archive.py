@@ -0,0 +1,73 @@
+from datetime import date, timedelta
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from BookingApp.models import ArchivedReservation, DailyRollup, Hotel, Room, RoomNight, Reservation
+from BookingApp.rollups import rebuild_rollups
+
+
+class ReservationArchiveTest(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpassword')
+        self.client.force_authenticate(user=self.user)
+        self.hotel = Hotel.objects.create(name='Hotel A', address='Address A')
+        self.room = Room.objects.create(hotel=self.hotel, room_number='101', room_type='Single', price_per_night=100)
+        today = timezone.localdate()
+        # три давні (понад рік тому) і одне актуальне бронювання
+        self.stays = [(today - timedelta(days=900 - 10 * i), today - timedelta(days=898 - 10 * i)) for i in range(3)]
+        self.stays.append((today + timedelta(days=5), today + timedelta(days=7)))
+        for check_in, check_out in self.stays:
+            Reservation.objects.create(hotel=self.hotel, room=self.room, client=self.user,
+                                       check_in_date=check_in, check_out_date=check_out)
+        self.ids = list(Reservation.objects.order_by('pk').values_list('pk', flat=True))
+
+    def archive(self, *args):
+        out = StringIO()
+        call_command('archive_reservations', '--batch-size', '2', *args, stdout=out)
+        return out.getvalue()
+
+    def listed(self, **params):
+        response = self.client.get(reverse('reservation-list'), params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response
+
+    def test_archiving_moves_old_stays_in_batches_and_is_idempotent(self):
+        rollups = list(DailyRollup.objects.order_by('pk').values_list('date', 'occupied_rooms', 'revenue'))
+        self.assertIn('Archived 3 reservations', self.archive())
+        self.assertEqual(list(Reservation.objects.values_list('pk', flat=True)), self.ids[3:])
+        self.assertEqual(sorted(ArchivedReservation.objects.values_list('pk', flat=True)), self.ids[:3])
+        self.assertEqual(RoomNight.objects.count(), 2)
+        # історія в зведеннях лишається, і бекфіл її не губить
+        self.assertEqual(list(DailyRollup.objects.order_by('pk').values_list('date', 'occupied_rooms', 'revenue')),
+                         rollups)
+        rebuild_rollups()
+        self.assertEqual(sorted(DailyRollup.objects.values_list('date', 'occupied_rooms', 'revenue')), sorted(rollups))
+
+        self.assertIn('Archived 0 reservations', self.archive())
+        self.assertEqual(ArchivedReservation.objects.count(), 3)
+
+    def test_archive_is_read_only_for_historical_ranges(self):
+        expected = self.listed().data
+        self.archive()
+        self.assertEqual([item['check_in_date'] for item in self.listed().data], [expected[3]['check_in_date']])
+        self.assertEqual(self.listed(start_date=date.today().isoformat()).data, expected[3:])
+
+        history = self.listed(start_date='2000-01-01')
+        self.assertEqual(history.data, expected)
+        self.assertEqual(self.listed(end_date=self.stays[1][1].isoformat()).data, expected[:2])
+        # курсорна пагінація і стрімінг по об'єднанню з архівом
+        page = self.listed(start_date='2000-01-01', page_size=3).data
+        self.assertEqual(page['results'], expected[:3])
+        self.assertEqual(self.client.get(page['next']).data['results'], expected[3:])
+        streamed = self.client.get(reverse('reservation-list'), {'start_date': '2000-01-01', 'stream': 'true'})
+        self.assertEqual(b''.join(streamed.streaming_content), history.content)
+
+        detail = reverse('reservation-detail', args=[self.ids[0]])
+        self.assertEqual(self.client.get(detail).status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(self.client.get(detail, {'archived': 'true'}).data, expected[0])
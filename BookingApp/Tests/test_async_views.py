@@ -0,0 +1,65 @@
+import base64
+from datetime import date
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from BookingApp.models import Hotel, Room, Reservation
+
+
+class AsyncViewsTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='testuser', password='testpassword')
+        self.hotel = Hotel.objects.create(name='Готель "A"', address='вулиця Хрещатик, 14')
+        self.room = Room.objects.create(hotel=self.hotel, room_number='101', room_type='Single', price_per_night='99.50')
+        Room.objects.create(hotel=self.hotel, room_number='102', room_type='Double', price_per_night=150)
+        self.reservation = Reservation.objects.create(hotel=self.hotel, room=self.room, client=self.user,
+                                                      check_in_date=date(2024, 5, 10), check_out_date=date(2024, 5, 12))
+        self.api = APIClient()
+        self.api.force_authenticate(user=self.user)
+        credentials = base64.b64encode(b'testuser:testpassword').decode()
+        self.auth = {'AUTHORIZATION': 'Basic %s' % credentials}
+
+    async def body(self, response):
+        if response.streaming:
+            return b''.join([chunk async for chunk in response.streaming_content])
+        return response.content
+
+    async def test_lists_match_sync_views(self):
+        for name in ['hotel-list', 'room-list', 'reservation-list']:
+            response = await self.async_client.get(reverse('async-' + name))
+            self.assertEqual(response.status_code, 200)
+            expected = await self.sync_get(name)
+            self.assertEqual(await self.body(response), expected)
+
+    async def test_details_require_authentication(self):
+        for name, pk in [('hotel-detail', self.hotel.pk), ('room-detail', self.room.pk),
+                         ('reservation-detail', self.reservation.pk)]:
+            url = reverse('async-' + name, args=[pk])
+            self.assertEqual((await self.async_client.get(url)).status_code, 401)
+            response = await self.async_client.get(url, headers=self.auth)
+            self.assertEqual(response.content, await self.sync_get(name, pk))
+            missing = await self.async_client.get(reverse('async-' + name, args=[999]), headers=self.auth)
+            self.assertEqual((missing.status_code, missing.json()), (404, {'detail': 'Not found.'}))
+
+    async def test_availability_search(self):
+        params = {'check_in_date': '2024-05-11', 'check_out_date': '2024-05-13'}
+        response = await self.async_client.get(reverse('async-availability-search'), params)
+        self.assertEqual([room['room_number'] for room in response.json()], ['102'])
+        params['check_out_date'] = '2024-05-01'
+        self.assertEqual((await self.async_client.get(reverse('async-availability-search'), params)).status_code, 400)
+        self.assertEqual((await self.async_client.post(reverse('async-hotel-list'))).status_code, 405)
+
+    async def test_server_timing_under_asgi(self):
+        response = await self.async_client.get(reverse('async-hotel-detail', args=[self.hotel.pk]), headers=self.auth)
+        # користувач (Basic, перший раз) + готель, обидва запити в потоці sync_to_async
+        self.assertIn('desc="2 queries"', response['Server-Timing'])
+
+    async def sync_get(self, name, pk=None):
+        response = await sync_to_async(self.api.get)(reverse(name, args=[pk] if pk else None))
+        return response.content
@@ -0,0 +1,77 @@
+import base64
+from datetime import date
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import hashers
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from BookingApp.authentication import verified_credentials
+from BookingApp.models import Hotel, Room, Reservation
+
+
+class AuthenticationFastPathTest(APITestCase):
+    def setUp(self):
+        verified_credentials.clear()
+        self.user = User.objects.create_user(username='testuser', password='testpassword')
+        self.hotel = Hotel.objects.create(name='Hotel A', address='Address A')
+        self.room = Room.objects.create(hotel=self.hotel, room_number='101', room_type='Single', price_per_night=100)
+
+    def basic(self, password='testpassword'):
+        credentials = base64.b64encode(('testuser:%s' % password).encode()).decode()
+        return {'HTTP_AUTHORIZATION': 'Basic ' + credentials}
+
+    def jwt(self):
+        response = self.client.post(reverse('token_obtain_pair'), {'username': 'testuser', 'password': 'testpassword'})
+        return {'HTTP_AUTHORIZATION': 'JWT ' + response.data['access']}
+
+    def test_basic_password_is_hashed_once(self):
+        with mock.patch('django.contrib.auth.base_user.check_password', wraps=hashers.check_password) as check:
+            for _ in range(3):
+                response = self.client.get(reverse('reservation-detail', args=[1]), **self.basic())
+                self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(check.call_count, 1)
+
+    def test_basic_cache_forgets_changed_password(self):
+        self.client.get(reverse('reservation-list'), **self.basic())
+        self.user.set_password('newpassword123')
+        self.user.save()
+        response = self.client.get(reverse('reservation-detail', args=[1]), **self.basic())
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_wrong_password_is_not_cached(self):
+        self.assertEqual(self.client.get(reverse('reservation-detail', args=[1]), **self.basic('wrong')).status_code,
+                         status.HTTP_401_UNAUTHORIZED)
+
+    def test_jwt_does_not_query_users(self):
+        headers = self.jwt()
+        Reservation.objects.create(hotel=self.hotel, room=self.room, client=self.user,
+                                   check_in_date=date(2024, 5, 10), check_out_date=date(2024, 5, 12))
+        reservation = Reservation.objects.get()
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse('reservation-detail', args=[reservation.pk]), **headers)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_jwt_user_can_book_and_delete_account(self):
+        headers = self.jwt()
+        data = {'hotel': self.hotel.pk, 'room': self.room.pk, 'client': self.user.pk,
+                'check_in_date': '2024-05-10', 'check_out_date': '2024-05-12'}
+        response = self.client.post(reverse('reservation-list'), data, format='json', **headers)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Reservation.objects.get().client, self.user)
+
+        response = self.client.delete(reverse('delete-user'), **headers)
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertFalse(User.objects.get().is_active)
+        # токен ще дійсний, але писати від імені деактивованого, а потім видаленого користувача не можна
+        data['check_in_date'], data['check_out_date'] = '2024-06-10', '2024-06-12'
+        response = self.client.post(reverse('reservation-list'), data, format='json', **headers)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        call_command('run_jobs', '--once', stdout=StringIO())
+        self.assertFalse(User.objects.exists())
+        response = self.client.post(reverse('reservation-list'), data, format='json', **headers)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
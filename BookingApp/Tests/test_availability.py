@@ -0,0 +1,46 @@
+from datetime import date
+
+from django.contrib.auth.models import User
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from BookingApp.models import Hotel, Room, Reservation
+
+
+class AvailabilitySearchViewTest(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpassword')
+        self.hotel = Hotel.objects.create(name='Hotel A', address='Address A')
+        self.other_hotel = Hotel.objects.create(name='Hotel B', address='Address B')
+        self.single = Room.objects.create(hotel=self.hotel, room_number='101', room_type='Single', price_per_night=100)
+        self.deluxe = Room.objects.create(hotel=self.hotel, room_number='102', room_type='Deluxe', price_per_night=250)
+        self.other = Room.objects.create(hotel=self.other_hotel, room_number='201', room_type='Single', price_per_night=90)
+        Reservation.objects.create(hotel=self.hotel, room=self.single, client=self.user,
+                                   check_in_date=date(2024, 5, 10), check_out_date=date(2024, 5, 15))
+
+    def search(self, **params):
+        params.setdefault('check_in_date', '2024-05-12')
+        params.setdefault('check_out_date', '2024-05-14')
+        return self.client.get(reverse('availability-search'), params)
+
+    def test_overlapping_room_is_excluded(self):
+        response = self.search(hotel=self.hotel.pk)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([room['id'] for room in response.data], [self.deluxe.pk])
+
+    def test_back_to_back_stays_do_not_overlap(self):
+        response = self.search(hotel=self.hotel.pk, check_in_date='2024-05-15', check_out_date='2024-05-16')
+        self.assertEqual([room['id'] for room in response.data], [self.single.pk, self.deluxe.pk])
+
+    def test_filters_by_room_type_and_price(self):
+        response = self.search(room_type='Single', max_price='95')
+        self.assertEqual([room['id'] for room in response.data], [self.other.pk])
+
+    def test_search_is_a_single_query(self):
+        with self.assertNumQueries(1):
+            self.search(hotel=self.hotel.pk, room_type='Deluxe', min_price='50')
+
+    def test_invalid_range(self):
+        response = self.search(check_in_date='2024-05-14', check_out_date='2024-05-12')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,96 @@
+from datetime import date
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.db import OperationalError
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from BookingApp.models import Hotel, Room, Reservation
+
+
+class ReservationBookingTest(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpassword')
+        self.client.force_authenticate(user=self.user)
+        self.hotel = Hotel.objects.create(name='Hotel A', address='Address A')
+        self.room = Room.objects.create(hotel=self.hotel, room_number='101', room_type='Single', price_per_night=100)
+
+    def book(self, check_in, check_out, room=None):
+        data = {'hotel': self.hotel.pk, 'room': (room or self.room).pk, 'client': self.user.pk,
+                'check_in_date': check_in, 'check_out_date': check_out}
+        return self.client.post(reverse('reservation-list'), data, format='json')
+
+    def test_overlapping_reservation_is_rejected(self):
+        self.assertEqual(self.book('2024-05-10', '2024-05-15').status_code, status.HTTP_201_CREATED)
+        response = self.book('2024-05-14', '2024-05-16')
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(Reservation.objects.count(), 1)
+
+    def test_adjacent_and_other_room_are_allowed(self):
+        other = Room.objects.create(hotel=self.hotel, room_number='102', room_type='Single', price_per_night=100)
+        self.assertEqual(self.book('2024-05-10', '2024-05-15').status_code, status.HTTP_201_CREATED)
+        self.assertEqual(self.book('2024-05-15', '2024-05-16').status_code, status.HTTP_201_CREATED)
+        self.assertEqual(self.book('2024-05-10', '2024-05-15', room=other).status_code, status.HTTP_201_CREATED)
+
+    def test_patch_checks_overlap_except_itself(self):
+        self.book('2024-05-10', '2024-05-15')
+        self.book('2024-05-20', '2024-05-25')
+        first, second = Reservation.objects.order_by('pk')
+        url = reverse('reservation-detail', args=[first.pk])
+        self.assertEqual(self.client.patch(url, {'check_out_date': '2024-05-18'}, format='json').status_code,
+                         status.HTTP_200_OK)
+        self.assertEqual(self.client.patch(url, {'check_out_date': '2024-05-21'}, format='json').status_code,
+                         status.HTTP_409_CONFLICT)
+
+    def test_invalid_date_range(self):
+        self.assertEqual(self.book('2024-05-15', '2024-05-10').status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_lock_timeout_is_retryable(self):
+        with mock.patch('BookingApp.services.lock_rooms', side_effect=OperationalError('database is locked')), \
+                mock.patch('BookingApp.services.LOCK_BACKOFF', 0):
+            response = self.book('2024-05-10', '2024-05-15')
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertIn('Retry-After', response)
+
+
+class ReservationBatchTest(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpassword')
+        self.client.force_authenticate(user=self.user)
+        self.hotel = Hotel.objects.create(name='Hotel A', address='Address A')
+        self.rooms = Room.objects.bulk_create([
+            Room(hotel=self.hotel, room_number=str(100 + i), room_type='Single', price_per_night=100) for i in range(50)
+        ])
+
+    def item(self, room, check_in='2024-05-10', check_out='2024-05-12'):
+        return {'hotel': self.hotel.pk, 'room': room.pk, 'client': self.user.pk,
+                'check_in_date': check_in, 'check_out_date': check_out}
+
+    def test_group_booking_in_a_few_queries(self):
+        # + 3 запити на денні зведення (ціни кімнат, вставка відсутніх рядків, один UPDATE)
+        # + 1 на чужі утримання кімнат, + 1 вставка в журнал змін
+        with self.assertNumQueries(14):
+            response = self.client.post(reverse('reservation-batch'), [self.item(room) for room in self.rooms], format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(response.data['results']), 50)
+        self.assertEqual(response.data['results'][0]['status'], 'created')
+        self.assertEqual(Reservation.objects.count(), 50)
+
+    def test_conflict_rejects_whole_batch(self):
+        Reservation.objects.create(hotel=self.hotel, room=self.rooms[1], client=self.user,
+                                   check_in_date=date(2024, 5, 11), check_out_date=date(2024, 5, 13))
+        items = [self.item(self.rooms[0]), self.item(self.rooms[1]),
+                 self.item(self.rooms[2]), self.item(self.rooms[2], '2024-05-11', '2024-05-14')]
+        response = self.client.post(reverse('reservation-batch'), items, format='json')
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual([item['status'] for item in response.data['results']], ['ok', 'conflict', 'ok', 'conflict'])
+        self.assertEqual(Reservation.objects.count(), 1)
+
+    def test_invalid_item_reports_errors_per_item(self):
+        items = [self.item(self.rooms[0]), dict(self.item(self.rooms[1]), room=999999)]
+        response = self.client.post(reverse('reservation-batch'), items, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data[0], {})
+        self.assertIn('room', response.data[1])
@@ -0,0 +1,56 @@
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from BookingApp.models import Hotel, Room
+
+
+class CatalogCacheTest(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='testuser', password='testpassword')
+        self.client.force_authenticate(user=self.user)
+        self.hotel = Hotel.objects.create(name='Hotel A', address='Address A')
+
+    def test_second_read_skips_database(self):
+        first = self.client.get(reverse('hotel-list'))
+        with self.assertNumQueries(0):
+            second = self.client.get(reverse('hotel-list'))
+        self.assertEqual(first.data, second.data)
+        self.assertEqual(first['ETag'], second['ETag'])
+
+    def test_conditional_get_returns_304(self):
+        etag = self.client.get(reverse('hotel-detail', args=[self.hotel.pk]))['ETag']
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse('hotel-detail', args=[self.hotel.pk]), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        last_modified = self.client.get(reverse('hotel-list'))['Last-Modified']
+        response = self.client.get(reverse('hotel-list'), HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_writes_invalidate_list_and_detail(self):
+        self.client.get(reverse('hotel-list'))
+        self.client.get(reverse('hotel-detail', args=[self.hotel.pk]))
+        self.client.put(reverse('hotel-detail', args=[self.hotel.pk]), {'name': 'Hotel B', 'address': 'Address A'}, format='json')
+        self.assertEqual(self.client.get(reverse('hotel-list')).data[0]['name'], 'Hotel B')
+        self.assertEqual(self.client.get(reverse('hotel-detail', args=[self.hotel.pk])).data['name'], 'Hotel B')
+
+    def test_room_change_keeps_other_details_cached(self):
+        rooms = [Room.objects.create(hotel=self.hotel, room_number=str(n), room_type='Single', price_per_night=100)
+                 for n in (101, 102)]
+        for room in rooms:
+            self.client.get(reverse('room-detail', args=[room.pk]))
+        self.client.put(reverse('room-detail', args=[rooms[0].pk]),
+                        {'hotel': self.hotel.pk, 'room_number': '101', 'room_type': 'Deluxe', 'price_per_night': 150},
+                        format='json')
+        with self.assertNumQueries(0):
+            self.client.get(reverse('room-detail', args=[rooms[1].pk]))
+        self.assertEqual(self.client.get(reverse('room-detail', args=[rooms[0].pk])).data['room_type'], 'Deluxe')
+
+    def test_missing_object_is_not_cached(self):
+        self.assertEqual(self.client.get(reverse('hotel-detail', args=[999])).status_code, status.HTTP_404_NOT_FOUND)
+        Hotel.objects.create(pk=999, name='Hotel C', address='Address C')
+        self.assertEqual(self.client.get(reverse('hotel-detail', args=[999])).status_code, status.HTTP_200_OK)
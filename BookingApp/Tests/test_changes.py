@@ -0,0 +1,116 @@
+from datetime import date, timedelta
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from BookingApp.archive import archive_reservations
+from BookingApp.jobs import claim_job, run_job
+from BookingApp.models import ChangeLog, Hotel, Room, Reservation
+
+
+class ChangesFeedTest(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpassword')
+        self.client.force_authenticate(user=self.user)
+        self.hotel = Hotel.objects.create(name='Hotel A', address='Address A')
+        self.room = Room.objects.create(hotel=self.hotel, room_number='101', room_type='Single', price_per_night=100)
+        self.reservation = Reservation.objects.create(hotel=self.hotel, room=self.room, client=self.user,
+                                                      check_in_date=date(2024, 5, 10), check_out_date=date(2024, 5, 12))
+
+    def changes(self, since=0, **params):
+        response = self.client.get(reverse('changes'), dict(params, since=since))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+
+    def summary(self, page):
+        return [(change['resource'], change['id'], change['action']) for change in page['changes']]
+
+    def test_full_sync_then_only_new_changes(self):
+        page = self.changes()
+        self.assertEqual(self.summary(page), [('hotels', self.hotel.pk, 'upsert'), ('rooms', self.room.pk, 'upsert'),
+                                              ('reservations', self.reservation.pk, 'upsert')])
+        self.assertEqual(page['changes'][0]['data'], {'name': 'Hotel A', 'address': 'Address A'})
+        self.assertFalse(page['has_more'])
+        self.assertEqual(self.changes(page['cursor'])['changes'], [])
+
+        # кілька змін одного об'єкта — один запис з поточними даними
+        cursor = page['cursor']
+        self.hotel.name = 'Hotel B'
+        self.hotel.save()
+        self.hotel.address = 'Address B'
+        self.hotel.save()
+        reservation_pk = self.reservation.pk
+        self.reservation.delete()
+        page = self.changes(cursor)
+        self.assertEqual(self.summary(page), [('hotels', self.hotel.pk, 'upsert'),
+                                              ('reservations', reservation_pk, 'delete')])
+        self.assertEqual(page['changes'][0]['data'], {'name': 'Hotel B', 'address': 'Address B'})
+        self.assertIsNone(page['changes'][1]['data'])
+
+    def test_pages_follow_the_cursor(self):
+        rooms = [Room.objects.create(hotel=self.hotel, room_number=str(200 + i), room_type='Double',
+                                     price_per_night=150) for i in range(4)]
+        seen = []
+        cursor, has_more = 0, True
+        while has_more:
+            page = self.changes(cursor, limit=2)
+            seen += self.summary(page)
+            cursor, has_more = page['cursor'], page['has_more']
+        self.assertEqual([item[1] for item in seen if item[0] == 'rooms'], [self.room.pk] + [room.pk for room in rooms])
+        self.assertEqual(self.client.get(reverse('changes'), {'limit': 0}).status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_tombstones_and_bulk_paths_are_logged(self):
+        cursor = self.changes()['cursor']
+        self.client.force_authenticate(user=User.objects.create_superuser(username='admin', password='admin'))
+        response = self.client.delete(reverse('hotel-detail', args=[self.hotel.pk]))
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(self.summary(self.changes(cursor)), [('hotels', self.hotel.pk, 'delete'),
+                                                              ('rooms', self.room.pk, 'delete')])
+
+        # фонове очищення видаляє бронювання пакетно; кімнати і готель — уже надгробки, повторів немає
+        cursor = self.changes(cursor)['cursor']
+        run_job(claim_job('test'))
+        self.assertEqual(self.summary(self.changes(cursor)), [('reservations', self.reservation.pk, 'delete')])
+
+    def test_archived_reservation_is_not_a_delete(self):
+        old = Reservation.objects.create(hotel=self.hotel, room=self.room, client=self.user,
+                                         check_in_date=date(2000, 1, 1), check_out_date=date(2000, 1, 3))
+        cursor = self.changes()['cursor']
+        archive_reservations()
+        self.assertEqual(self.changes(cursor)['changes'], [])
+        page = self.changes()
+        self.assertIn(('reservations', old.pk, 'upsert'), self.summary(page))
+        self.assertEqual(page['changes'][-1]['data']['check_in_date'], '2000-01-01')
+
+    def test_pruned_cursor_is_gone(self):
+        cursor = self.changes()['cursor']
+        Hotel.objects.create(name='Hotel C', address='Address C')
+        ChangeLog.objects.filter(pk__lte=cursor).update(created_at=timezone.now() - timedelta(days=60))
+        out = StringIO()
+        call_command('prune_changes', stdout=out)
+        self.assertIn('Pruned 3', out.getvalue())
+        response = self.client.get(reverse('changes'), {'since': 1})
+        self.assertEqual(response.status_code, status.HTTP_410_GONE)
+        # повна синхронізація і свіжий курсор працюють далі
+        self.assertEqual(len(self.changes()['changes']), 1)
+        self.assertEqual(self.changes(cursor)['changes'][0]['data']['name'], 'Hotel C')
+
+    def test_fully_pruned_log(self):
+        stale = self.changes(limit=1)['cursor']
+        Hotel.objects.create(name='Hotel C', address='Address C')
+        cursor = self.changes()['cursor']
+        ChangeLog.objects.update(created_at=timezone.now() - timedelta(days=60))
+        call_command('prune_changes', stdout=StringIO())
+        # лишається лише найновіший запис: актуальний курсор працює, старий — 410
+        self.assertEqual(list(ChangeLog.objects.values_list('pk', flat=True)), [cursor])
+        self.assertEqual(self.changes(cursor)['changes'], [])
+        self.assertEqual(self.client.get(reverse('changes'), {'since': stale}).status_code, status.HTTP_410_GONE)
+        # журнал очищено повністю — будь-який ненульовий курсор застарів, навіть без нових змін
+        ChangeLog.objects.all().delete()
+        self.assertEqual(self.client.get(reverse('changes'), {'since': cursor}).status_code, status.HTTP_410_GONE)
+        self.assertEqual(self.changes()['changes'], [])
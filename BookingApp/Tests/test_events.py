@@ -0,0 +1,125 @@
+import asyncio
+import json
+from datetime import date
+from unittest import mock
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+
+from BookingApp import events
+from BookingApp.models import EventMessage, Hotel, Room, Reservation
+from BookingApp.occupancy import delete_reservations
+
+
+class SubscriptionTest(SimpleTestCase):
+    async def test_full_buffer_drops_events_and_asks_for_resync(self):
+        subscription = events.Subscription(['hotel:1'], asyncio.get_running_loop(), size=2)
+        for i in range(5):
+            subscription.put({'id': i})
+        self.assertEqual(subscription.dropped, 3)
+        self.assertIs(await subscription.get(1), events.RESYNC)
+        self.assertIsNone(await subscription.get(0.01))
+        subscription.put({'id': 5})
+        self.assertEqual(await subscription.get(1), {'id': 5})
+
+
+class ReservationEventsTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpassword')
+        self.hotel = Hotel.objects.create(name='Hotel A', address='Address A')
+        self.room = Room.objects.create(hotel=self.hotel, room_number='101', room_type='Single', price_per_night=100)
+        self.other = Room.objects.create(hotel=self.hotel, room_number='102', room_type='Single', price_per_night=100)
+
+    def book(self, room=None):
+        with self.captureOnCommitCallbacks(execute=True):
+            return Reservation.objects.create(hotel=self.hotel, room=room or self.room, client=self.user,
+                                              check_in_date=date(2024, 5, 10), check_out_date=date(2024, 5, 12))
+
+    async def next_event(self, subscription):
+        event = await subscription.get(1)
+        self.assertIsNotNone(event)
+        return event
+
+    async def test_created_moved_and_deleted_reach_subscribers_once(self):
+        subscription = events.broker.subscribe(['hotel:%s' % self.hotel.pk, 'room:%s' % self.room.pk])
+        try:
+            reservation = await sync_to_async(self.book)()
+            self.assertEqual(await self.next_event(subscription), {
+                'action': 'created', 'id': reservation.pk, 'hotel': self.hotel.pk, 'room': self.room.pk,
+                'check_in_date': '2024-05-10', 'check_out_date': '2024-05-12'})
+            self.assertIsNone(await subscription.get(0.01))
+
+            # перенос в іншу кімнату доходить і до підписників старої кімнати
+            room_only = events.broker.subscribe(['room:%s' % self.room.pk])
+
+            def move():
+                with self.captureOnCommitCallbacks(execute=True):
+                    reservation.room = self.other
+                    reservation.save()
+            await sync_to_async(move)()
+            self.assertEqual((await self.next_event(room_only))['room'], self.other.pk)
+            events.broker.unsubscribe(room_only)
+            await self.next_event(subscription)
+
+            def delete():
+                with self.captureOnCommitCallbacks(execute=True):
+                    delete_reservations(Reservation.objects.filter(pk=reservation.pk))
+            await sync_to_async(delete)()
+            self.assertEqual((await self.next_event(subscription))['action'], 'deleted')
+        finally:
+            events.broker.unsubscribe(subscription)
+        self.assertEqual(events.broker.subscriber_count(), 0)
+
+    async def test_rolled_back_reservation_sends_nothing(self):
+        subscription = events.broker.subscribe(['room:%s' % self.room.pk])
+
+        def rollback():
+            with self.captureOnCommitCallbacks(execute=True):
+                with transaction.atomic():
+                    Reservation.objects.create(hotel=self.hotel, room=self.room, client=self.user,
+                                               check_in_date=date(2024, 5, 10), check_out_date=date(2024, 5, 12))
+                    transaction.set_rollback(True)
+        try:
+            await sync_to_async(rollback)()
+            self.assertIsNone(await subscription.get(0.05))
+        finally:
+            events.broker.unsubscribe(subscription)
+
+    async def test_sse_endpoint_streams_and_unsubscribes_on_disconnect(self):
+        response = await self.async_client.get(reverse('async-events'), {'hotel': self.hotel.pk})
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        stream = aiter(response.streaming_content)
+        self.assertEqual(await anext(stream), b'retry: 3000\n\n')
+        reservation = await sync_to_async(self.book)()
+        chunk = (await anext(stream)).decode()
+        self.assertTrue(chunk.startswith('event: reservation\ndata: '))
+        self.assertEqual(json.loads(chunk.split('data: ')[1])['id'], reservation.pk)
+        with mock.patch.object(events, 'HEARTBEAT', 0.01):
+            self.assertEqual(await anext(stream), b': ping\n\n')
+        # від'єднання клієнта: ASGIHandler скасовує задачу, що чекає на наступну подію
+        waiting = asyncio.ensure_future(anext(stream))
+        await asyncio.sleep(0.01)
+        waiting.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await waiting
+        self.assertEqual(events.broker.subscriber_count(), 0)
+
+        self.assertEqual((await self.async_client.get(reverse('async-events'))).status_code, 400)
+        self.assertEqual((await self.async_client.get(reverse('async-events'), {'room': 'x'})).status_code, 400)
+
+    async def test_database_broker_relays_between_processes(self):
+        # Два брокери — як два процеси: один лише пише в EventMessage, інший опитує таблицю
+        publisher, listener = events.DatabaseBroker(), events.DatabaseBroker()
+        with mock.patch.object(events, 'POLL_INTERVAL', 0.01), mock.patch.object(events, 'broker', publisher):
+            subscription = listener.subscribe(['room:%s' % self.room.pk])
+            await asyncio.sleep(0.05)
+            await sync_to_async(self.book)()
+            await sync_to_async(self.book)(self.other)
+            self.assertEqual(await sync_to_async(EventMessage.objects.count)(), 2)
+            self.assertEqual((await self.next_event(subscription))['room'], self.room.pk)
+            self.assertIsNone(await subscription.get(0.05))
+            listener.unsubscribe(subscription)
+            await asyncio.wait_for(listener.pollers[subscription.loop], 1)
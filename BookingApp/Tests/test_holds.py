@@ -0,0 +1,82 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from BookingApp.models import Hotel, Room, RoomHold, RoomNight, Reservation
+
+
+class RoomHoldTest(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpassword')
+        self.other = User.objects.create_user(username='other', password='testpassword')
+        self.client.force_authenticate(user=self.user)
+        self.hotel = Hotel.objects.create(name='Hotel A', address='Address A')
+        self.room = Room.objects.create(hotel=self.hotel, room_number='101', room_type='Single', price_per_night=100)
+        self.stay = {'hotel': self.hotel.pk, 'room': self.room.pk,
+                     'check_in_date': '2024-05-10', 'check_out_date': '2024-05-12'}
+
+    def hold(self, **extra):
+        return self.client.post(reverse('hold-list'), dict(self.stay, **extra), format='json')
+
+    def available(self):
+        response = self.client.get(reverse('availability-search'), {'check_in_date': '2024-05-11',
+                                                                    'check_out_date': '2024-05-13'})
+        return [room['id'] for room in response.data]
+
+    def test_hold_blocks_others_and_confirms_into_reservation(self):
+        response = self.hold(ttl_minutes=5)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertNotIn('ttl_minutes', response.data)
+        hold = RoomHold.objects.get(pk=response.data['id'])
+        self.assertAlmostEqual(hold.expires_at, timezone.now() + timedelta(minutes=5), delta=timedelta(seconds=5))
+        self.assertEqual(self.available(), [])
+
+        self.client.force_authenticate(user=self.other)
+        self.assertEqual(self.hold().status_code, status.HTTP_409_CONFLICT)
+        reservation = dict(self.stay, client=self.other.pk)
+        self.assertEqual(self.client.post(reverse('reservation-list'), reservation, format='json').status_code,
+                         status.HTTP_409_CONFLICT)
+        self.assertEqual(self.client.post(reverse('hold-confirm', args=[hold.pk])).status_code,
+                         status.HTTP_404_NOT_FOUND)
+
+        self.client.force_authenticate(user=self.user)
+        response = self.client.post(reverse('hold-confirm', args=[hold.pk]))
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['client'], self.user.pk)
+        self.assertFalse(RoomHold.objects.exists())
+        self.assertEqual(Reservation.objects.get().room, self.room)
+        self.assertEqual(RoomNight.objects.count(), 2)
+
+    def test_holder_cannot_confirm_over_own_reservation(self):
+        hold_id = self.hold().data['id']
+        reservation = dict(self.stay, client=self.user.pk, check_in_date='2024-05-11')
+        self.assertEqual(self.client.post(reverse('reservation-list'), reservation, format='json').status_code,
+                         status.HTTP_201_CREATED)
+        self.assertEqual(self.client.post(reverse('hold-confirm', args=[hold_id])).status_code,
+                         status.HTTP_409_CONFLICT)
+        self.assertEqual(Reservation.objects.count(), 1)
+        self.assertTrue(RoomHold.objects.filter(pk=hold_id).exists())
+
+    def test_expired_hold_frees_the_room_and_is_swept(self):
+        hold = RoomHold.objects.get(pk=self.hold().data['id'])
+        RoomHold.objects.update(expires_at=timezone.now() - timedelta(seconds=1))
+        self.assertEqual(self.available(), [self.room.pk])
+        self.assertEqual(self.client.post(reverse('hold-confirm', args=[hold.pk])).status_code, status.HTTP_410_GONE)
+        self.assertEqual(self.client.get(reverse('hold-detail', args=[hold.pk])).status_code, status.HTTP_404_NOT_FOUND)
+
+        out = StringIO()
+        call_command('expire_holds', stdout=out)
+        self.assertIn('Removed 1 expired holds', out.getvalue())
+        self.assertFalse(RoomHold.objects.exists())
+
+    def test_hold_can_be_released(self):
+        hold_id = self.hold().data['id']
+        self.assertEqual(self.client.delete(reverse('hold-detail', args=[hold_id])).status_code,
+                         status.HTTP_204_NO_CONTENT)
+        self.assertEqual(self.available(), [self.room.pk])
@@ -0,0 +1,93 @@
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from BookingApp.models import Hotel, IdempotencyKey, Room, Reservation
+
+
+class IdempotencyKeyTest(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpassword')
+        self.hotel = Hotel.objects.create(name='Hotel A', address='Address A')
+        self.room = Room.objects.create(hotel=self.hotel, room_number='101', room_type='Single', price_per_night=100)
+        self.stay = {'hotel': self.hotel.pk, 'room': self.room.pk, 'client': self.user.pk,
+                     'check_in_date': '2024-05-10', 'check_out_date': '2024-05-12'}
+
+    def register(self, key, email='test@gmail.com'):
+        data = {'email': email, 'first_name': 'John', 'last_name': 'Doe', 'password': 'password123'}
+        return self.client.post(reverse('register_user'), data, format='json', HTTP_IDEMPOTENCY_KEY=key)
+
+    def book(self, key):
+        return self.client.post(reverse('reservation-list'), self.stay, format='json', HTTP_IDEMPOTENCY_KEY=key)
+
+    def test_retry_replays_first_response_without_running_the_view(self):
+        first = self.register('key-1')
+        self.assertEqual(first.status_code, status.HTTP_201_CREATED)
+        with mock.patch('BookingApp.views.UserRegistrationSerializer') as serializer, self.assertNumQueries(1):
+            retry = self.register('key-1')
+        serializer.assert_not_called()
+        self.assertEqual((retry.status_code, retry.data), (first.status_code, first.data))
+        self.assertEqual(retry['Idempotent-Replayed'], 'true')
+        self.assertEqual(User.objects.filter(email='test@gmail.com').count(), 1)
+
+    def test_reservation_retry_does_not_book_twice(self):
+        self.client.force_authenticate(user=self.user)
+        first = self.book('key-1')
+        retry = self.book('key-1')
+        self.assertEqual((retry.status_code, retry.data), (status.HTTP_201_CREATED, first.data))
+        self.assertEqual(Reservation.objects.count(), 1)
+        # без ключа — звичайна поведінка
+        self.assertEqual(self.client.post(reverse('reservation-list'), self.stay, format='json').status_code,
+                         status.HTTP_409_CONFLICT)
+
+    def test_key_reused_for_a_different_request_is_rejected(self):
+        self.register('key-1')
+        self.assertEqual(self.register('key-1', email='other@gmail.com').status_code,
+                         status.HTTP_422_UNPROCESSABLE_ENTITY)
+
+    def in_flight(self, key, created_at=None):
+        # те, що лишає перший запит, поки виконується
+        response = self.register(key)
+        IdempotencyKey.objects.filter(key=key).update(status_code=None, response_body='',
+                                                      created_at=created_at or timezone.now())
+        User.objects.all().delete()
+        return response
+
+    def test_in_flight_duplicate_waits_for_the_first_request(self):
+        first = self.in_flight('key-1')
+
+        def finish(seconds):
+            IdempotencyKey.objects.update(status_code=201, response_body='{"message": "User registered successfully"}')
+
+        with mock.patch('BookingApp.idempotency.time.sleep', side_effect=finish) as sleep:
+            retry = self.register('key-1')
+        sleep.assert_called_once()
+        self.assertEqual((retry.status_code, retry.data), (first.status_code, first.data))
+        self.assertFalse(User.objects.exists())
+
+        self.in_flight('key-2')
+        with mock.patch('BookingApp.idempotency.IN_FLIGHT_WAIT', 0):
+            response = self.register('key-2')
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(response['Retry-After'], '1')
+
+    def test_abandoned_or_expired_key_is_executed_again(self):
+        self.in_flight('key-1', created_at=timezone.now() - timedelta(minutes=5))
+        self.assertEqual(self.register('key-1').status_code, status.HTTP_201_CREATED)
+        self.assertEqual(User.objects.filter(email='test@gmail.com').count(), 1)
+
+    def test_expired_keys_are_evicted(self):
+        self.register('key-1')
+        self.register('key-2', email='other@gmail.com')
+        IdempotencyKey.objects.filter(key='key-1').update(expires_at=timezone.now() - timedelta(seconds=1))
+        out = StringIO()
+        call_command('evict_idempotency_keys', '--batch-size', '1', stdout=out)
+        self.assertIn('Evicted 1 expired idempotency keys', out.getvalue())
+        self.assertEqual(list(IdempotencyKey.objects.values_list('key', flat=True)), ['key-2'])
@@ -0,0 +1,168 @@
+import base64
+from datetime import date, timedelta
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from BookingApp.authentication import verified_credentials
+from BookingApp.jobs import claim_job, enqueue, run_job, task
+from BookingApp.models import DailyRollup, Hotel, Job, Room, RoomNight, Reservation
+
+calls = []
+
+
+@task('test.record')
+def record(job):
+    calls.append(job.payload)
+
+
+@task('test.fail')
+def fail(job):
+    raise ValueError('boom')
+
+
+class JobQueueTest(TestCase):
+    def setUp(self):
+        calls.clear()
+
+    def test_job_is_claimed_by_one_worker_only(self):
+        job = enqueue('test.record', {'n': 1})
+        claimed = claim_job('worker-a')
+        self.assertEqual((claimed.pk, claimed.status, claimed.attempts), (job.pk, Job.RUNNING, 1))
+        self.assertIsNone(claim_job('worker-b'))
+        self.assertTrue(run_job(claimed))
+        self.assertEqual(calls, [{'n': 1}])
+        self.assertEqual(Job.objects.get().status, Job.DONE)
+
+    def test_delayed_job_waits(self):
+        enqueue('test.record', delay=60)
+        self.assertIsNone(claim_job('worker-a'))
+
+    def test_failed_job_is_retried_with_backoff_then_marked_failed(self):
+        enqueue('test.fail', max_attempts=2)
+        self.assertFalse(run_job(claim_job('worker-a')))
+        job = Job.objects.get()
+        self.assertEqual((job.status, job.attempts), (Job.QUEUED, 1))
+        self.assertIn('ValueError: boom', job.last_error)
+        self.assertGreater(job.run_after, timezone.now())
+        self.assertIsNone(claim_job('worker-a'))
+
+        Job.objects.update(run_after=timezone.now())
+        self.assertFalse(run_job(claim_job('worker-a')))
+        job = Job.objects.get()
+        self.assertEqual((job.status, job.attempts), (Job.FAILED, 2))
+
+    def test_expired_job_is_reclaimed_and_stale_worker_result_is_ignored(self):
+        enqueue('test.record')
+        stale = claim_job('worker-a')
+        Job.objects.update(locked_until=timezone.now() - timedelta(seconds=1))
+        fresh = claim_job('worker-b')
+        self.assertEqual((fresh.locked_by, fresh.attempts), ('worker-b', 2))
+
+        # воркер a прокинувся і завершив задачу — статус лишається за b
+        run_job(stale)
+        self.assertEqual(Job.objects.get().status, Job.RUNNING)
+        run_job(fresh)
+        self.assertEqual(Job.objects.get().status, Job.DONE)
+
+
+class DeleteUserJobTest(APITestCase):
+    def setUp(self):
+        verified_credentials.clear()
+        self.user = User.objects.create_user(username='testuser', password='testpassword')
+        hotel = Hotel.objects.create(name='Hotel A', address='Address A')
+        room = Room.objects.create(hotel=hotel, room_number='101', room_type='Single', price_per_night=100)
+        Reservation.objects.create(hotel=hotel, room=room, client=self.user,
+                                   check_in_date=date(2024, 5, 10), check_out_date=date(2024, 5, 12))
+        self.auth = {'HTTP_AUTHORIZATION': 'Basic ' + base64.b64encode(b'testuser:testpassword').decode()}
+
+    def test_delete_returns_immediately_and_worker_removes_account(self):
+        reservation = Reservation.objects.get()
+        self.assertEqual(self.client.get(reverse('reservation-detail', args=[reservation.pk]), **self.auth).status_code,
+                         status.HTTP_200_OK)
+        response = self.client.delete(reverse('delete-user'), **self.auth)
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(Job.objects.get(pk=response.data['job']).payload, {'user_id': self.user.pk})
+        self.assertTrue(Reservation.objects.exists())
+        # обліковий запис вимкнено одразу, навіть для закешованих облікових даних
+        self.assertFalse(User.objects.get().is_active)
+        self.assertEqual(self.client.get(reverse('reservation-list'), **self.auth).status_code,
+                         status.HTTP_401_UNAUTHORIZED)
+
+        out = StringIO()
+        call_command('run_jobs', '--once', stdout=out)
+        self.assertIn('ran 1 jobs, 0 failed', out.getvalue())
+        self.assertFalse(User.objects.exists())
+        self.assertFalse(Reservation.objects.exists())
+        self.assertFalse(RoomNight.objects.exists())
+
+
+class TombstonePurgeTest(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpassword')
+        self.client.force_authenticate(user=self.user)
+        self.hotel = Hotel.objects.create(name='Hotel A', address='Address A')
+        self.rooms = [Room.objects.create(hotel=self.hotel, room_number=str(100 + i), room_type='Single',
+                                          price_per_night=100) for i in range(3)]
+        for i, room in enumerate(self.rooms * 2):
+            Reservation.objects.create(hotel=self.hotel, room=room, client=self.user,
+                                       check_in_date=date(2024, 5, 1 + 3 * i), check_out_date=date(2024, 5, 3 + 3 * i))
+
+    def run_jobs(self):
+        with mock.patch('BookingApp.tasks.PURGE_BATCH_SIZE', 2):
+            call_command('run_jobs', '--once', stdout=StringIO())
+
+    def test_hotel_disappears_at_once_and_is_purged_in_batches(self):
+        response = self.client.delete(reverse('hotel-detail', args=[self.hotel.pk]))
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(response['Location'], 'http://testserver' + reverse('job-detail', args=[response.data['id']]))
+        self.assertEqual(response.data['status'], Job.QUEUED)
+
+        # надгробки: готель і кімнати вже не читаються, але рядки ще на місці
+        self.assertEqual(self.client.get(reverse('hotel-detail', args=[self.hotel.pk])).status_code, 404)
+        self.assertEqual(self.client.get(reverse('room-list')).data, [])
+        self.assertEqual(self.client.get(reverse('availability-search'), {
+            'check_in_date': '2025-01-01', 'check_out_date': '2025-01-02'}).data, [])
+        self.assertEqual(Reservation.objects.count(), 6)
+
+        self.run_jobs()
+        job = self.client.get(response['Location']).data
+        self.assertEqual(job['status'], Job.DONE)
+        self.assertEqual(job['progress'], {'reservations': {'deleted': 6, 'total': 6},
+                                           'archive': {'deleted': 0, 'total': 0},
+                                           'rollups': {'deleted': 12, 'total': 12},
+                                           'rooms': {'deleted': 3, 'total': 3}})
+        self.assertFalse(Hotel.all_objects.exists())
+        self.assertFalse(Room.all_objects.exists())
+        self.assertFalse(RoomNight.objects.exists())
+
+    def test_room_purge_keeps_rollups_in_step(self):
+        room = self.rooms[0]
+        response = self.client.delete(reverse('room-detail', args=[room.pk]))
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(self.client.get(reverse('room-detail', args=[room.pk])).status_code, 404)
+        # бронювати видалену кімнату вже не можна
+        data = {'hotel': self.hotel.pk, 'room': room.pk, 'client': self.user.pk,
+                'check_in_date': '2025-01-01', 'check_out_date': '2025-01-02'}
+        self.assertEqual(self.client.post(reverse('reservation-list'), data, format='json').status_code,
+                         status.HTTP_400_BAD_REQUEST)
+
+        self.run_jobs()
+        self.assertFalse(Room.all_objects.filter(pk=room.pk).exists())
+        self.assertEqual(Reservation.objects.count(), 4)
+        self.assertEqual(sum(DailyRollup.objects.values_list('occupied_rooms', flat=True)), RoomNight.objects.count())
+
+    def test_job_status_is_visible_to_its_owner_only(self):
+        job = self.client.delete(reverse('room-detail', args=[self.rooms[0].pk])).data
+        other = User.objects.create_user(username='other', password='testpassword')
+        self.client.force_authenticate(user=other)
+        self.assertEqual(self.client.get(reverse('job-detail', args=[job['id']])).status_code, 404)
+        other.is_staff = True
+        self.assertEqual(self.client.get(reverse('job-detail', args=[job['id']])).status_code, 200)
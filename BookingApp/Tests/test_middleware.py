@@ -0,0 +1,46 @@
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from BookingApp.cache import catalog_cache
+from BookingApp.middleware import stats
+from BookingApp.models import Hotel
+
+
+class ServerTimingMiddlewareTest(TestCase):
+    def setUp(self):
+        catalog_cache().clear()
+        stats.clear()
+        self.client = APIClient()
+        Hotel.objects.create(name='Hotel A', address='Address A')
+
+    def timings(self, response):
+        return dict(part.split(';', 1) for part in response['Server-Timing'].split(', '))
+
+    def test_header_has_db_view_render_and_total(self):
+        response = self.client.get(reverse('hotel-list'))
+        timings = self.timings(response)
+        self.assertEqual(set(timings), {'db', 'view', 'render', 'total'})
+        self.assertIn('desc="1 queries"', timings['db'])
+
+    def test_stats_are_grouped_by_view_and_admin_only(self):
+        self.client.get(reverse('hotel-list'))
+        self.client.get(reverse('hotel-list'))
+        self.client.post(reverse('register_user'), {}, format='json')
+
+        user = User.objects.create_user(username='testuser', password='testpassword')
+        self.client.force_authenticate(user=user)
+        self.assertEqual(self.client.get(reverse('timing-stats')).status_code, 403)
+
+        user.is_staff = True
+        self.client.force_authenticate(user=user)
+        endpoints = self.client.get(reverse('timing-stats')).data['endpoints']
+        self.assertEqual(endpoints['HotelListView.GET']['count'], 2)
+        # другий запит віддано з кешу каталогу без звернень до БД
+        self.assertEqual(endpoints['HotelListView.GET']['queries']['max'], 1)
+        self.assertEqual(endpoints['HotelListView.GET']['queries']['mean'], 0.5)
+        self.assertIn('register_user.POST', endpoints)
+
+        self.assertEqual(self.client.delete(reverse('timing-stats')).status_code, 204)
+        self.assertEqual(list(stats.snapshot()), ['TimingStatsView.DELETE'])
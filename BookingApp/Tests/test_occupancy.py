@@ -0,0 +1,123 @@
+from datetime import date
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from BookingApp.models import DailyRollup, Hotel, Room, Reservation, RoomNight
+
+
+class OccupancyCalendarTest(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpassword')
+        self.client.force_authenticate(user=self.user)
+        self.hotel = Hotel.objects.create(name='Hotel A', address='Address A')
+        self.room = Room.objects.create(hotel=self.hotel, room_number='101', room_type='Single', price_per_night=100)
+        self.free_room = Room.objects.create(hotel=self.hotel, room_number='102', room_type='Single', price_per_night=100)
+
+    def book(self, check_in, check_out):
+        data = {'hotel': self.hotel.pk, 'room': self.room.pk, 'client': self.user.pk,
+                'check_in_date': check_in, 'check_out_date': check_out}
+        response = self.client.post(reverse('reservation-list'), data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        return Reservation.objects.latest('pk')
+
+    def nights(self):
+        return list(RoomNight.objects.order_by('date').values_list('date', flat=True))
+
+    def test_reservation_writes_keep_nights_in_sync(self):
+        reservation = self.book('2024-05-10', '2024-05-12')
+        self.assertEqual(self.nights(), [date(2024, 5, 10), date(2024, 5, 11)])
+
+        self.client.patch(reverse('reservation-detail', args=[reservation.pk]), {'check_out_date': '2024-05-11'}, format='json')
+        self.assertEqual(self.nights(), [date(2024, 5, 10)])
+
+        self.client.delete(reverse('reservation-detail', args=[reservation.pk]))
+        self.assertEqual(self.nights(), [])
+
+    def test_string_dates_from_orm_create(self):
+        Reservation.objects.create(hotel=self.hotel, room=self.room, client=self.user,
+                                   check_in_date='2024-05-10', check_out_date='2024-05-12')
+        self.assertEqual(self.nights(), [date(2024, 5, 10), date(2024, 5, 11)])
+
+    def test_calendar_bitmap(self):
+        self.book('2024-05-10', '2024-05-12')
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse('hotel-calendar', args=[self.hotel.pk]),
+                                       {'start_date': '2024-05-09', 'days': 5})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['rooms'], [
+            {'room': self.room.pk, 'occupancy': '01100'},
+            {'room': self.free_room.pk, 'occupancy': '00000'},
+        ])
+
+    def test_calendar_unknown_hotel(self):
+        response = self.client.get(reverse('hotel-calendar', args=[999]), {'start_date': '2024-05-09'})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_rebuild_command(self):
+        self.book('2024-05-10', '2024-05-13')
+        RoomNight.objects.all().delete()
+        call_command('rebuild_occupancy', stdout=StringIO())
+        self.assertEqual(len(self.nights()), 3)
+        # повторний запуск не подвоює зведення
+        call_command('rebuild_occupancy', stdout=StringIO())
+        self.assertEqual(len(self.nights()), 3)
+        self.assertEqual(list(DailyRollup.objects.order_by('date').values_list('occupied_rooms', 'revenue')),
+                         [(1, 100), (1, 100), (1, 100)])
+
+
+class HotelExpandedDetailTest(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='testuser', password='testpassword')
+        self.client.force_authenticate(user=self.user)
+        self.hotel = Hotel.objects.create(name='Hotel A', address='Address A')
+
+    def add_rooms(self, count, booked=0):
+        start = Room.objects.count()
+        for i in range(start, start + count):
+            room = Room.objects.create(hotel=self.hotel, room_number=str(100 + i),
+                                       room_type='Double' if i % 2 else 'Single', price_per_night=100 + i)
+            if i < booked:
+                Reservation.objects.create(hotel=self.hotel, room=room, client=self.user,
+                                           check_in_date=date(2024, 5, 10), check_out_date=date(2024, 5, 12))
+
+    def get(self):
+        return self.client.get(reverse('hotel-detail', args=[self.hotel.pk]), {'expand': 'rooms', 'date': '2024-05-11'})
+
+    def test_rooms_aggregates_and_occupancy(self):
+        self.add_rooms(4, booked=3)
+        data = self.get().data
+        self.assertEqual((data['room_count'], data['occupied_rooms']), (4, 3))
+        self.assertEqual((data['min_price'], data['max_price'], data['avg_price']), ('100.00', '103.00', '101.50'))
+        self.assertEqual([(t['room_type'], t['rooms'], t['occupied_rooms']) for t in data['room_types']],
+                         [('Double', 2, 1), ('Single', 2, 2)])
+        self.assertEqual([room['occupied'] for room in data['rooms']], [True, True, True, False])
+
+    def test_query_count_does_not_depend_on_rooms(self):
+        self.add_rooms(2, booked=1)
+        with self.assertNumQueries(3):
+            self.assertEqual(self.get().status_code, status.HTTP_200_OK)
+        self.add_rooms(30, booked=20)
+        with self.assertNumQueries(3):
+            self.assertEqual(len(self.get().data['rooms']), 32)
+
+    def test_expanded_variant_is_not_cached(self):
+        self.add_rooms(1)
+        self.assertEqual(self.get().data['occupied_rooms'], 0)
+        Reservation.objects.create(hotel=self.hotel, room=Room.objects.get(), client=self.user,
+                                   check_in_date=date(2024, 5, 11), check_out_date=date(2024, 5, 12))
+        self.assertEqual(self.get().data['occupied_rooms'], 1)
+
+    def test_hotel_without_rooms_and_unknown_hotel(self):
+        data = self.get().data
+        self.assertEqual((data['room_count'], data['occupied_rooms'], data['rooms']), (0, 0, []))
+        response = self.client.get(reverse('hotel-detail', args=[999]), {'expand': 'rooms'})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        response = self.client.get(reverse('hotel-detail', args=[self.hotel.pk]), {'expand': 'everything'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
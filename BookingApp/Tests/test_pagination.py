@@ -0,0 +1,71 @@
+import json
+from datetime import date
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APITestCase
+
+from BookingApp.models import Hotel, Room, Reservation
+from BookingApp.serializers import HotelSerializer, RoomSerializer, ReservationSerializer, values_serializer
+
+
+class ListPaginationTest(APITestCase):
+    def setUp(self):
+        cache.clear()
+        Hotel.objects.bulk_create([Hotel(name='Hotel %d' % i, address='Address %d' % i) for i in range(7)])
+
+    def test_plain_list_is_unchanged(self):
+        response = self.client.get(reverse('hotel-list'))
+        self.assertEqual(len(response.data), 7)
+        self.assertEqual(response.data[0], {'name': 'Hotel 0', 'address': 'Address 0'})
+
+    def test_cursor_pages_cover_every_row_once(self):
+        names = []
+        url = reverse('hotel-list') + '?page_size=3'
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertLessEqual(len(response.data['results']), 3)
+            names += [hotel['name'] for hotel in response.data['results']]
+            url = response.data['next']
+        self.assertEqual(names, ['Hotel %d' % i for i in range(7)])
+
+    def test_stream_matches_plain_list(self):
+        plain = self.client.get(reverse('hotel-list'))
+        streamed = self.client.get(reverse('hotel-list'), {'stream': 'true'})
+        self.assertTrue(streamed.streaming)
+        self.assertEqual(json.loads(b''.join(streamed.streaming_content)), json.loads(plain.content))
+
+
+class ValuesListSerializerTest(APITestCase):
+    def setUp(self):
+        cache.clear()
+        user = User.objects.create_user(username='testuser', password='testpassword')
+        hotel = Hotel.objects.create(name='Готель "A"', address='вулиця Хрещатик, 14')
+        Hotel.objects.create(name='Hotel B', address='')
+        rooms = [Room.objects.create(hotel=hotel, room_number=str(100 + i), room_type='Single',
+                                     price_per_night=Decimal(price)) for i, price in enumerate(['100', '99.5', '0.01'])]
+        for i, room in enumerate(rooms):
+            Reservation.objects.create(hotel=hotel, room=room, client=user, check_in_date=date(2024, 5, 10 + i),
+                                       check_out_date=date(2024, 5, 12 + i))
+
+    def test_list_bytes_match_model_serializer(self):
+        for url, model, serializer_class in [
+            ('hotel-list', Hotel, HotelSerializer),
+            ('room-list', Room, RoomSerializer),
+            ('reservation-list', Reservation, ReservationSerializer),
+        ]:
+            expected = JSONRenderer().render(serializer_class(model.objects.order_by('pk'), many=True).data)
+            self.assertEqual(self.client.get(reverse(url)).content, expected)
+            fast = values_serializer(serializer_class)
+            self.assertEqual(JSONRenderer().render(fast.data(fast.queryset(model.objects.all()))), expected)
+
+    def test_pages_match_model_serializer(self):
+        response = self.client.get(reverse('room-list'), {'page_size': 2})
+        expected = RoomSerializer(Room.objects.order_by('pk')[:2], many=True).data
+        self.assertEqual(json.dumps(response.data['results']), json.dumps(expected))
+        self.assertIsNotNone(response.data['next'])
@@ -0,0 +1,124 @@
+import csv
+import gzip
+import io
+import json
+from datetime import date
+from unittest import skipUnless
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from BookingApp import middleware
+from BookingApp.models import Hotel, Room, Reservation
+from BookingApp.renderers import msgpack
+
+
+class ListFormatsTest(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='testuser', password='testpassword')
+        self.client.force_authenticate(user=self.user)
+        self.hotel = Hotel.objects.create(name='Hotel A', address='Address A')
+        self.room = Room.objects.create(hotel=self.hotel, room_number='101', room_type='Single', price_per_night=100)
+        for day in range(1, 6):
+            Reservation.objects.create(hotel=self.hotel, room=self.room, client=self.user,
+                                       check_in_date=date(2024, 5, day * 2), check_out_date=date(2024, 5, day * 2 + 1))
+        self.url = reverse('reservation-list')
+        self.expected = self.client.get(self.url).json()
+
+    def body(self, response):
+        return b''.join(response.streaming_content) if response.streaming else response.content
+
+    def test_columnar_json(self):
+        response = self.client.get(self.url, HTTP_ACCEPT='application/vnd.booking.columnar+json')
+        self.assertEqual(response['Content-Type'], 'application/vnd.booking.columnar+json')
+        self.assertIn('Accept', response['Vary'])
+        data = json.loads(response.content)
+        self.assertEqual(data['columns'], ['hotel', 'room', 'client', 'check_in_date', 'check_out_date'])
+        self.assertEqual([dict(zip(data['columns'], row)) for row in data['rows']], self.expected)
+
+        page = self.client.get(self.url, {'format': 'columnar', 'page_size': 2}).json()
+        self.assertEqual(len(page['results']['rows']), 2)
+        self.assertIsNotNone(page['next'])
+        streamed = json.loads(self.body(self.client.get(self.url, {'format': 'columnar', 'stream': 'true'})))
+        self.assertEqual(streamed, data)
+
+    def test_csv_export(self):
+        response = self.client.get(self.url, {'format': 'csv', 'stream': 'true'})
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Type'], 'text/csv; charset=utf-8')
+        body = self.body(response)
+        rows = list(csv.DictReader(io.StringIO(body.decode())))
+        self.assertEqual(rows, [{key: str(value) for key, value in row.items()} for row in self.expected])
+        # не потоком — той самий CSV; помилка валідації — теж CSV
+        self.assertEqual(self.client.get(self.url, HTTP_ACCEPT='text/csv').content, body)
+        page = self.client.get(self.url, {'format': 'csv', 'page_size': 2})
+        self.assertEqual(len(page.content.splitlines()), 3)
+        self.assertRegex(page['Link'], r'^<http://testserver/.*cursor=.*>; rel="next"$')
+        self.assertEqual(len(self.client.get(page['Link'][1:page['Link'].index('>')]).content.splitlines()), 3)
+
+        response = self.client.get(self.url, {'format': 'csv', 'start_date': 'x'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.content.splitlines()[0], b'start_date')
+
+    @skipUnless(msgpack, 'msgpack is not installed')
+    def test_msgpack(self):
+        response = self.client.get(self.url, HTTP_ACCEPT='application/msgpack')
+        self.assertEqual(msgpack.unpackb(response.content), self.expected)
+        response = self.client.get(self.url, {'format': 'msgpack', 'stream': 'true'})
+        self.assertFalse(response.streaming)
+        self.assertEqual(msgpack.unpackb(response.content), self.expected)
+
+
+class CompressionTest(APITestCase):
+    def setUp(self):
+        cache.clear()
+        Hotel.objects.bulk_create([Hotel(name='Hotel %d' % i, address='Street %d' % i) for i in range(100)])
+        self.url = reverse('hotel-list')
+
+    def test_large_responses_are_gzipped(self):
+        plain = self.client.get(self.url)
+        self.assertNotIn('Content-Encoding', plain)
+        self.assertIn('Accept-Encoding', plain['Vary'])
+
+        response = self.client.get(self.url, HTTP_ACCEPT_ENCODING='gzip, deflate')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(response.content), plain.content)
+        self.assertLess(len(response.content), len(plain.content))
+        self.assertTrue(response['ETag'].startswith('W/"'))
+        again = self.client.get(self.url, HTTP_ACCEPT_ENCODING='gzip', HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(again.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        # HTML (browsable API, адмінка) не стискається — BREACH
+        html = self.client.get(self.url, HTTP_ACCEPT='text/html', HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(html['Content-Type'], 'text/html; charset=utf-8')
+        self.assertNotIn('Content-Encoding', html)
+
+    @skipUnless(middleware.brotli, 'brotli is not installed')
+    def test_brotli_is_preferred(self):
+        plain = self.client.get(self.url)
+        response = self.client.get(self.url, HTTP_ACCEPT_ENCODING='gzip, br')
+        self.assertEqual(response['Content-Encoding'], 'br')
+        self.assertEqual(middleware.brotli.decompress(response.content), plain.content)
+
+        streamed = self.client.get(self.url, {'stream': 'true'}, HTTP_ACCEPT_ENCODING='br')
+        body = middleware.brotli.decompress(b''.join(streamed.streaming_content))
+        self.assertEqual(len(json.loads(body)), 100)
+
+    def test_small_and_streamed_responses(self):
+        hotel = Hotel.objects.first()
+        self.client.force_authenticate(user=User.objects.create_user(username='testuser', password='testpassword'))
+        small = self.client.get(reverse('hotel-detail', args=[hotel.pk]), HTTP_ACCEPT_ENCODING='gzip')
+        self.assertNotIn('Content-Encoding', small)
+
+        streamed = self.client.get(self.url, {'stream': 'true'}, HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(streamed['Content-Encoding'], 'gzip')
+        body = gzip.decompress(b''.join(streamed.streaming_content))
+        self.assertEqual(len(json.loads(body)), 100)
+
+    def test_accept_encoding_parsing(self):
+        self.assertEqual(middleware.accepted_encodings('gzip;q=0, br, identity'), {'br', 'identity'})
+        self.assertEqual(middleware.accepted_encodings(''), {''})
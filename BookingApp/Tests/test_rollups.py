@@ -0,0 +1,86 @@
+from datetime import date
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from BookingApp.models import DailyRollup, Hotel, Room, Reservation
+
+
+class DailyRollupTest(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpassword')
+        self.client.force_authenticate(user=self.user)
+        self.hotel = Hotel.objects.create(name='Hotel A', address='Address A')
+        self.single = Room.objects.create(hotel=self.hotel, room_number='101', room_type='Single', price_per_night='100.50')
+        self.double = Room.objects.create(hotel=self.hotel, room_number='201', room_type='Double', price_per_night=200)
+
+    def book(self, room, check_in, check_out):
+        data = {'hotel': self.hotel.pk, 'room': room.pk, 'client': self.user.pk,
+                'check_in_date': check_in, 'check_out_date': check_out}
+        response = self.client.post(reverse('reservation-list'), data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        return Reservation.objects.latest('pk')
+
+    def rollups(self):
+        return list(DailyRollup.objects.filter(occupied_rooms__gt=0).order_by('date', 'room_type')
+                    .values_list('date', 'room_type', 'occupied_rooms', 'revenue'))
+
+    def test_incremental_updates_match_backfill(self):
+        reservation = self.book(self.single, '2024-05-10', '2024-05-12')
+        self.book(self.double, '2024-05-11', '2024-05-12')
+        self.client.post(reverse('reservation-batch'), [
+            {'hotel': self.hotel.pk, 'room': self.double.pk, 'client': self.user.pk,
+             'check_in_date': '2024-05-12', 'check_out_date': '2024-05-13'},
+        ], format='json')
+        self.client.patch(reverse('reservation-detail', args=[reservation.pk]), {'check_out_date': '2024-05-11'}, format='json')
+        self.client.patch(reverse('reservation-detail', args=[reservation.pk]), {'check_in_date': '2024-05-09'}, format='json')
+
+        expected = [
+            (date(2024, 5, 9), 'Single', 1, 100.5),
+            (date(2024, 5, 10), 'Single', 1, 100.5),
+            (date(2024, 5, 11), 'Double', 1, 200),
+            (date(2024, 5, 12), 'Double', 1, 200),
+        ]
+        self.assertEqual(self.rollups(), expected)
+        call_command('backfill_rollups', stdout=StringIO())
+        self.assertEqual(self.rollups(), expected)
+
+        self.client.delete(reverse('reservation-detail', args=[reservation.pk]))
+        self.assertEqual([row[:3] for row in self.rollups()], [(date(2024, 5, 11), 'Double', 1), (date(2024, 5, 12), 'Double', 1)])
+
+    def test_room_price_and_type_changes_move_rollups(self):
+        reservation = self.book(self.single, '2024-05-10', '2024-05-11')
+        self.single.room_type, self.single.price_per_night = 'Suite', '300'
+        self.single.save()
+        self.assertEqual(self.rollups(), [(date(2024, 5, 10), 'Suite', 1, 300)])
+        call_command('backfill_rollups', stdout=StringIO())
+        self.assertEqual(self.rollups(), [(date(2024, 5, 10), 'Suite', 1, 300)])
+
+        reservation.delete()
+        self.assertFalse(DailyRollup.objects.exclude(occupied_rooms=0, revenue=0).exists())
+
+    def test_analytics_endpoint(self):
+        self.book(self.single, '2024-05-10', '2024-05-12')
+        self.book(self.double, '2024-05-11', '2024-05-12')
+        url = reverse('hotel-analytics', args=[self.hotel.pk])
+        params = {'start_date': '2024-05-10', 'end_date': '2024-05-13'}
+        self.assertEqual(self.client.get(url, params).status_code, status.HTTP_403_FORBIDDEN)
+
+        self.user.is_staff = True
+        self.client.force_authenticate(user=self.user)
+        with self.assertNumQueries(2):
+            data = self.client.get(url, params).data
+        self.assertEqual([(day['occupied_rooms'], day['occupancy_rate'], day['revenue']) for day in data['days']],
+                         [(1, 0.5, '100.50'), (2, 1.0, '300.50'), (0, 0.0, '0.00')])
+        self.assertEqual((data['occupied_room_nights'], data['occupancy_rate'], data['revenue']), (3, 0.5, '401.00'))
+
+        data = self.client.get(url, dict(params, room_type='Double')).data
+        self.assertEqual((data['room_count'], data['revenue']), (1, '200.00'))
+        self.assertEqual(self.client.get(url, {'start_date': '2024-05-10', 'end_date': '2024-05-10'}).status_code,
+                         status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.client.get(reverse('hotel-analytics', args=[999]), params).status_code,
+                         status.HTTP_404_NOT_FOUND)
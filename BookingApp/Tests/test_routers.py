@@ -0,0 +1,54 @@
+from unittest import mock
+
+from django.conf import settings
+from django.db import connections
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from BookingApp.models import Hotel
+from BookingApp.pagination import stream_json
+from BookingApp.routers import REPLICA_ALIAS, ReadReplicaRouter, replica_read
+
+
+class ReadReplicaRouterTest(SimpleTestCase):
+    def setUp(self):
+        self.router = ReadReplicaRouter()
+        patcher = mock.patch.dict(settings.DATABASES, {REPLICA_ALIAS: {}})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_marked_reads_go_to_replica(self):
+        self.assertIsNone(self.router.db_for_read(Hotel))
+        self.assertEqual(replica_read(lambda: self.router.db_for_read(Hotel))(), REPLICA_ALIAS)
+        self.assertIsNone(self.router.db_for_read(Hotel))
+
+    @override_settings(DATABASE_ROUTERS=['BookingApp.routers.ReadReplicaRouter'])
+    def test_streamed_lists_keep_the_replica(self):
+        # рядки потоку читаються вже після виходу з в'юхи, тобто з replica_read
+        with mock.patch('BookingApp.pagination.iter_json_array') as iter_json_array:
+            replica_read(lambda: stream_json(Hotel.objects.all(), list))()
+        self.assertEqual(iter_json_array.call_args.args[0].db, REPLICA_ALIAS)
+
+    def test_writes_and_migrations_use_primary(self):
+        self.assertEqual(replica_read(lambda: self.router.db_for_write(Hotel))(), 'default')
+        self.assertFalse(self.router.allow_migrate(REPLICA_ALIAS, 'BookingApp'))
+
+
+class ReadReplicaTransactionTest(TestCase):
+    def test_reads_inside_transaction_stay_on_primary(self):
+        with mock.patch.dict(settings.DATABASES, {REPLICA_ALIAS: {}}):
+            # TestCase уже всередині atomic-блоку
+            self.assertIsNone(replica_read(lambda: ReadReplicaRouter().db_for_read(Hotel))())
+
+
+class SqlitePragmasTest(TestCase):
+    @override_settings(BOOKING_SQLITE_PRAGMAS={'synchronous': 'NORMAL', 'cache_size': -64000})
+    def test_pragmas_applied_on_connect(self):
+        connection = connections.create_connection('default')
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute('PRAGMA synchronous')
+                self.assertEqual(cursor.fetchone()[0], 1)
+                cursor.execute('PRAGMA cache_size')
+                self.assertEqual(cursor.fetchone()[0], -64000)
+        finally:
+            connection.close()
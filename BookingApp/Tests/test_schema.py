@@ -0,0 +1,62 @@
+import json
+import os
+import tempfile
+from unittest import mock
+
+from django.test import TestCase, override_settings
+
+from BookingApp import schema
+
+
+class StoredSchemaTest(TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, 'openapi.json')
+        self.settings_override = override_settings(BOOKING_SCHEMA_PATH=self.path)
+        self.settings_override.enable()
+        schema.store.content = None
+
+    def tearDown(self):
+        schema.store.content = None
+        self.settings_override.disable()
+        self.tmpdir.cleanup()
+
+    def test_serves_generated_file_with_cache_headers(self):
+        schema.write_schema()
+        response = self.client.get('/swagger.json/')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('public', response['Cache-Control'])
+        with open(self.path, 'rb') as f:
+            self.assertEqual(response.content, f.read())
+        self.assertIn('/availability/', json.loads(response.content)['paths'])
+
+        response = self.client.get('/swagger.json/', HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 304)
+
+    def test_ui_schema_request_uses_stored_file(self):
+        schema.write_schema()
+        response = self.client.get('/redoc/', {'format': 'openapi'})
+        self.assertEqual(response['Content-Type'], 'application/json')
+
+    def test_ui_pages_do_not_generate_the_schema(self):
+        schema.write_schema()
+        with mock.patch('drf_yasg.generators.OpenAPISchemaGenerator.get_schema') as get_schema:
+            for url, template in (('/redoc/', 'redoc'), ('/swagger/', 'swagger-ui')):
+                response = self.client.get(url)
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response['Content-Type'], 'text/html; charset=utf-8')
+                self.assertIn('drf-yasg/%s.html' % template, [t.name for t in response.templates])
+        get_schema.assert_not_called()
+
+    def test_outdated_file_is_detected(self):
+        schema.write_schema()
+        self.assertIsNotNone(schema.read_stored_schema())
+        data = json.loads(open(self.path, 'rb').read())
+        data['info'][schema.FINGERPRINT_KEY] = 'old'
+        with open(self.path, 'w') as f:
+            json.dump(data, f)
+        self.assertIsNone(schema.read_stored_schema())
+        # застаріла схема не віддається — замість неї генерується актуальна
+        with self.assertLogs('BookingApp.schema', 'WARNING'):
+            response = self.client.get('/swagger.json/')
+        self.assertEqual(json.loads(response.content)['info'][schema.FINGERPRINT_KEY], schema.source_fingerprint())
@@ -0,0 +1,51 @@
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from BookingApp.models import Hotel, Room
+
+
+class RoomSearchTest(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.hotel = Hotel.objects.create(name='Hotel A', address='Address A')
+        other = Hotel.objects.create(name='Hotel B', address='Address B')
+        for i, (room_type, price) in enumerate([('Deluxe', '120'), ('Deluxe', '180'), ('Single', '45'),
+                                                ('Deluxe', '99.99'), ('Single', '100')]):
+            Room.objects.create(hotel=self.hotel, room_number=str(100 + i), room_type=room_type, price_per_night=Decimal(price))
+        Room.objects.create(hotel=other, room_number='1', room_type='Deluxe', price_per_night=110)
+
+    def search(self, **params):
+        response = self.client.get(reverse('room-search'), params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+
+    def test_filters_and_ordering(self):
+        data = self.search(hotel=self.hotel.pk, room_type='Deluxe', max_price='150', ordering='-price')
+        self.assertEqual([room['price_per_night'] for room in data['results']], ['120.00', '99.99'])
+        self.assertEqual(data['count'], 2)
+
+    def test_facets_for_filtered_rooms(self):
+        data = self.search(hotel=self.hotel.pk)
+        self.assertEqual(data['count'], 5)
+        self.assertEqual(data['facets']['room_type'], [{'value': 'Deluxe', 'count': 3}, {'value': 'Single', 'count': 2}])
+        self.assertEqual([bucket['count'] for bucket in data['facets']['price']], [1, 1, 2, 1, 0, 0])
+        self.assertEqual((data['facets']['price'][0]['min'], data['facets']['price'][0]['max']), (None, 50))
+
+    def test_pages_follow_ordering_in_two_queries(self):
+        prices = []
+        url = reverse('room-search') + '?ordering=price&page_size=2'
+        while url:
+            cache.clear()
+            with self.assertNumQueries(2):
+                data = self.client.get(url).data
+            prices += [Decimal(room['price_per_night']) for room in data['results']]
+            url = data['next']
+        self.assertEqual(prices, sorted(Room.objects.values_list('price_per_night', flat=True)))
+
+    def test_invalid_ordering(self):
+        response = self.client.get(reverse('room-search'), {'ordering': 'hotel__name'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
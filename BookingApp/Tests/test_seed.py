@@ -0,0 +1,40 @@
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db.models import Count
+from django.test import TestCase
+
+from BookingApp.models import ChangeLog, Hotel, Room, Reservation, RoomNight
+
+
+class SeedDataCommandTest(TestCase):
+    def call(self, *args):
+        out = StringIO()
+        call_command('seed_data', '--hotels', '2', '--rooms-per-hotel', '3', '--users', '4',
+                     '--reservations', '50', '--batch-size', '7', *args, stdout=out, stderr=StringIO())
+        return out.getvalue()
+
+    def test_seeds_requested_volumes_without_overlaps(self):
+        self.assertIn('Seeded 2 hotels, 6 rooms, 4 users and 50 reservations', self.call())
+        self.assertEqual(Hotel.objects.count(), 2)
+        self.assertEqual(Room.objects.count(), 6)
+        self.assertEqual(User.objects.filter(username__startswith='seed-42-').count(), 4)
+        self.assertEqual(Reservation.objects.count(), 50)
+        # Календар заповнений, і жодна ніч не зайнята двічі
+        nights = sum((r.check_out_date - r.check_in_date).days for r in Reservation.objects.all())
+        self.assertEqual(RoomNight.objects.count(), nights)
+        self.assertFalse(RoomNight.objects.values('room', 'date').annotate(n=Count('id')).filter(n__gt=1).exists())
+        # повна синхронізація з since=0 бачить і засіяні бронювання
+        self.assertEqual(ChangeLog.objects.filter(resource='reservations').count(), 50)
+
+    def test_same_seed_is_reproducible_and_refuses_to_run_twice(self):
+        self.call()
+        first = list(Reservation.objects.order_by('pk').values_list('check_in_date', 'check_out_date'))
+        with self.assertRaises(CommandError):
+            self.call()
+        Reservation.objects.all().delete()
+        User.objects.all().delete()
+        self.call()
+        self.assertEqual(list(Reservation.objects.order_by('pk').values_list('check_in_date', 'check_out_date')), first)
@@ -0,0 +1,74 @@
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase
+
+from BookingApp.models import Hotel, Room, RoomNight
+
+
+class ImportExportCommandTest(TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.user = User.objects.create_user(username='testuser', password='testpassword')
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def write(self, name, text):
+        path = os.path.join(self.tmpdir.name, name)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(text)
+        return path
+
+    def call(self, *args):
+        out = StringIO()
+        call_command(*args, stdout=out, stderr=StringIO())
+        return out.getvalue()
+
+    def test_import_hotels_and_rooms_from_csv(self):
+        self.call('import_data', 'hotels', self.write('hotels.csv', 'id,name,address\n5,Hotel A,Київ\n6,Hotel B,Львів\n'),
+                  '--batch-size', '1')
+        self.call('import_data', 'rooms', self.write('rooms.csv',
+                  'hotel,room_number,room_type,price_per_night\n5,101,Single,100.50\n6,201,Double,80\n999,301,Single,90\n'))
+        self.assertEqual(list(Hotel.objects.order_by('pk').values_list('pk', 'address')), [(5, 'Київ'), (6, 'Львів')])
+        self.assertEqual(Room.objects.count(), 2)
+        self.assertEqual(str(Room.objects.get(room_number='101').price_per_night), '100.50')
+
+    def test_import_skips_existing_ids(self):
+        hotel = Hotel.objects.create(name='Hotel A', address='Address A')
+        rows = [{'id': hotel.pk, 'name': 'Hotel B', 'address': 'Address B'},
+                {'id': hotel.pk + 1, 'name': 'Hotel C', 'address': 'Address C'},
+                {'id': hotel.pk + 1, 'name': 'Hotel D', 'address': 'Address D'}]
+        output = self.call('import_data', 'hotels', self.write('hotels.jsonl', '\n'.join(json.dumps(row) for row in rows)))
+        self.assertIn('Imported 1 hotels, skipped 2 rows.', output)
+        self.assertEqual(list(Hotel.objects.order_by('pk').values_list('name', flat=True)), ['Hotel A', 'Hotel C'])
+
+    def test_reservation_import_skips_overlaps_and_fills_calendar(self):
+        hotel = Hotel.objects.create(name='Hotel A', address='Address A')
+        room = Room.objects.create(hotel=hotel, room_number='101', room_type='Single', price_per_night=100)
+        rows = [
+            {'hotel': hotel.pk, 'room': room.pk, 'client': self.user.pk, 'check_in_date': '2024-05-10', 'check_out_date': '2024-05-12'},
+            {'hotel': hotel.pk, 'room': room.pk, 'client': self.user.pk, 'check_in_date': '2024-05-11', 'check_out_date': '2024-05-13'},
+        ]
+        path = self.write('reservations.jsonl', '\n'.join(json.dumps(row) for row in rows))
+        output = self.call('import_data', 'reservations', path)
+        self.assertIn('Imported 1 reservations, skipped 1 rows.', output)
+        self.assertEqual(RoomNight.objects.count(), 2)
+
+    def test_export_round_trip(self):
+        Hotel.objects.create(name='Hotel A', address='вулиця Хрещатик, 14')
+        path = os.path.join(self.tmpdir.name, 'hotels.jsonl')
+        self.call('export_data', 'hotels', path)
+        Hotel.objects.all().delete()
+        self.call('import_data', 'hotels', path)
+        self.assertEqual(list(Hotel.objects.values_list('name', 'address')), [('Hotel A', 'вулиця Хрещатик, 14')])
+
+    def test_export_csv_to_stdout(self):
+        Hotel.objects.create(name='Hotel A', address='Address A')
+        output = self.call('export_data', 'hotels', '--format', 'csv')
+        self.assertEqual(output.splitlines()[0], 'id,name,address')
+        self.assertEqual(len(output.splitlines()), 2)
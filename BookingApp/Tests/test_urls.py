@@ -43,4 +43,4 @@ class UrlsTest(TestCase):
 
     def test_delete_user_view(self):
         response = self.client.delete(reverse('delete-user'))
-        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
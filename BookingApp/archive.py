@@ -0,0 +1,72 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .models import ArchivedReservation, Reservation
+from .occupancy import bulk_delete
+from .pagination import UnionQuery
+
+ARCHIVE_SETTINGS = getattr(settings, 'BOOKING_ARCHIVE', {})
+ARCHIVE_AFTER_DAYS = ARCHIVE_SETTINGS.get('AFTER_DAYS', 365)
+ARCHIVE_BATCH_SIZE = ARCHIVE_SETTINGS.get('BATCH_SIZE', 1000)
+FIELDS = ('id', 'hotel_id', 'room_id', 'client_id', 'check_in_date', 'check_out_date')
+
+
+def archive_cutoff(today=None):
+    # В архів ідуть бронювання з check_out_date раніше за цю дату
+    return (today or timezone.localdate()) - timedelta(days=ARCHIVE_AFTER_DAYS)
+
+
+def reaches_archive(start_date, end_date):
+    # Чи може діапазон [start_date, end_date) зачепити архів: потрібен явний діапазон, що починається
+    # до горизонту (або без початку). Звичайні списки архів не читають.
+    if start_date is None and end_date is None:
+        return False
+    return start_date is None or start_date < archive_cutoff()
+
+
+def archive_reservations(cutoff=None, batch_size=None, progress=None):
+    # Перенос порціями по pk: кожна порція — одна транзакція (INSERT в архів + DELETE з основної),
+    # тож перерваний запуск безпечно повторити. Зведення DailyRollup не зменшуємо — історія лишається
+    # в аналітиці; ночі календаря RoomNight видаляються каскадом разом з бронюванням.
+    cutoff = cutoff or archive_cutoff()
+    batch_size = batch_size or ARCHIVE_BATCH_SIZE
+    old = Reservation.objects.filter(check_out_date__lt=cutoff).order_by('pk').values_list(*FIELDS)
+    total = 0
+    last_pk = 0
+    while True:
+        with transaction.atomic():
+            rows = list(old.filter(pk__gt=last_pk)[:batch_size])
+            if not rows:
+                break
+            ArchivedReservation.objects.bulk_create(
+                [ArchivedReservation(**dict(zip(FIELDS, row))) for row in rows], ignore_conflicts=True,
+            )
+            token = bulk_delete.set(True)
+            try:
+                Reservation.objects.filter(pk__in=[row[0] for row in rows]).delete()
+            finally:
+                bulk_delete.reset(token)
+        total += len(rows)
+        last_pk = rows[-1][0]
+        if progress:
+            progress(total)
+    return total
+
+
+def overlapping(queryset, start_date=None, end_date=None):
+    if start_date is not None:
+        queryset = queryset.filter(check_out_date__gt=start_date)
+    if end_date is not None:
+        queryset = queryset.filter(check_in_date__lt=end_date)
+    return queryset
+
+
+def reservations_in_range(start_date=None, end_date=None):
+    # Актуальні бронювання; архів додається (UNION ALL) лише для історичного діапазону
+    hot = overlapping(Reservation.objects.all(), start_date, end_date)
+    if not reaches_archive(start_date, end_date):
+        return hot
+    return UnionQuery([hot, overlapping(ArchivedReservation.objects.all(), start_date, end_date)])
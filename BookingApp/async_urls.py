@@ -0,0 +1,16 @@
+from django.urls import path
+
+from . import async_views
+
+# Ті самі GET-ендпоінти, що й у urls.py, але async (для запуску під ASGI: Booking/asgi.py)
+urlpatterns = [
+    path('hotels/', async_views.hotel_list, name='async-hotel-list'),
+    path('hotels/<int:pk>/', async_views.hotel_detail, name='async-hotel-detail'),
+    path('rooms/', async_views.room_list, name='async-room-list'),
+    path('room/<int:pk>/', async_views.room_detail, name='async-room-detail'),
+    path('reservations/', async_views.reservation_list, name='async-reservation-list'),
+    path('reservation/<int:pk>/', async_views.reservation_detail, name='async-reservation-detail'),
+    path('availability/', async_views.availability_search, name='async-availability-search'),
+    # Server-Sent Events: бронювання готелів/кімнат ?hotel=<id>&room=<id> створено, змінено чи видалено
+    path('events/', async_views.reservation_events, name='async-events'),
+]
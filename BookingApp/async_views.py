@@ -0,0 +1,153 @@
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.http import HttpResponse, StreamingHttpResponse
+from django.views.decorators.http import require_GET
+from rest_framework import exceptions
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+from rest_framework.utils.encoders import JSONEncoder
+
+from . import events
+from .models import Hotel, Room, Reservation
+from .pagination import aiter_json_array, pin_database
+from .routers import replica_read
+from .serializers import (
+    AvailabilitySearchSerializer, AvailableRoomSerializer, EventsQuerySerializer, HotelSerializer,
+    ReservationSerializer, RoomSerializer, values_serializer,
+)
+
+# Async-версії основних GET-ендпоінтів (звичайні Django async-в'юхи, DRF 3.14 async не підтримує).
+# Під ASGI вони не займають потік на весь запит: ORM через aget/aiterator, списки віддаються потоком,
+# тож повільні клієнти не блокують воркер. Відповіді побайтово такі ж, як у синхронних в'юх.
+
+encoder = JSONEncoder(ensure_ascii=False, separators=(',', ':'))
+
+
+def json_response(data, status=200, headers=None):
+    return HttpResponse(encoder.encode(data), content_type='application/json', status=status, headers=headers)
+
+
+def error_response(exc):
+    headers = {}
+    if isinstance(exc, (exceptions.NotAuthenticated, exceptions.AuthenticationFailed)):
+        headers['WWW-Authenticate'] = 'Basic realm="api"'
+    return json_response({'detail': exc.detail}, status=exc.status_code, headers=headers)
+
+
+async def authenticate(request):
+    # DRF-аутентифікатори синхронні (Basic може звернутися до БД) — виконуємо їх у потоці
+    drf_request = Request(request, authenticators=[auth() for auth in api_settings.DEFAULT_AUTHENTICATION_CLASSES])
+    user = await sync_to_async(lambda: drf_request.user)()
+    if not user or not user.is_authenticated:
+        raise exceptions.NotAuthenticated()
+    return user
+
+
+def login_required(view):
+    # Як IsAuthenticated у синхронних в'юх; публічні GET (IsAuthenticatedOrReadOnly) аутентифікацію не виконують
+    @wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        try:
+            request.api_user = await authenticate(request)
+        except exceptions.APIException as exc:
+            return error_response(exc)
+        return await view(request, *args, **kwargs)
+    return wrapper
+
+
+def stream_list(queryset, serializer_class):
+    fast = values_serializer(serializer_class)
+    return StreamingHttpResponse(aiter_json_array(pin_database(fast.queryset(queryset)), fast.data),
+                                 content_type='application/json')
+
+
+async def detail(model, serializer_class, pk):
+    try:
+        obj = await model.objects.aget(pk=pk)
+    except model.DoesNotExist:
+        return json_response({'detail': 'Not found.'}, status=404)
+    return json_response(serializer_class(obj).data)
+
+
+@require_GET
+@replica_read
+async def hotel_list(request):
+    return stream_list(Hotel.objects.all(), HotelSerializer)
+
+
+@require_GET
+@login_required
+@replica_read
+async def hotel_detail(request, pk):
+    return await detail(Hotel, HotelSerializer, pk)
+
+
+@require_GET
+@replica_read
+async def room_list(request):
+    return stream_list(Room.objects.all(), RoomSerializer)
+
+
+@require_GET
+@login_required
+@replica_read
+async def room_detail(request, pk):
+    return await detail(Room, RoomSerializer, pk)
+
+
+@require_GET
+@replica_read
+async def reservation_list(request):
+    return stream_list(Reservation.objects.all(), ReservationSerializer)
+
+
+@require_GET
+@login_required
+@replica_read
+async def reservation_detail(request, pk):
+    return await detail(Reservation, ReservationSerializer, pk)
+
+
+@require_GET
+@replica_read
+async def availability_search(request):
+    params = AvailabilitySearchSerializer(data=request.GET)
+    if not params.is_valid():
+        return json_response(params.errors, status=400)
+    data = params.validated_data
+    rooms = Room.objects.available(data['check_in_date'], data['check_out_date']).matching(
+        data.get('hotel'), data.get('room_type'), data.get('min_price'), data.get('max_price'))
+    fast = values_serializer(AvailableRoomSerializer)
+    return json_response(fast.data([row async for row in fast.queryset(rooms)]))
+
+
+async def event_stream(topics):
+    # Підписка — в самому генераторі: finally (відписка) виконається і при від'єднанні клієнта,
+    # коли ASGIHandler скасовує відповідь. Пінг-коментар раз на HEARTBEAT тримає з'єднання крізь проксі.
+    subscription = events.broker.subscribe(topics)
+    try:
+        yield 'retry: 3000\n\n'
+        while True:
+            event = await subscription.get(events.HEARTBEAT)
+            if event is None:
+                yield ': ping\n\n'
+            elif event is events.RESYNC:
+                yield 'event: resync\ndata: {}\n\n'
+            else:
+                yield 'event: reservation\ndata: %s\n\n' % encoder.encode(event)
+    finally:
+        events.broker.unsubscribe(subscription)
+
+
+@require_GET
+async def reservation_events(request):
+    # Замість опитування доступності: події про бронювання обраних готелів і кімнат. Лише під ASGI —
+    # під WSGI кожен підписник тримав би потік. Після resync (або перепідключення) доступність треба перечитати.
+    params = EventsQuerySerializer(data=request.GET)
+    if not params.is_valid():
+        return json_response(params.errors, status=400)
+    topics = ['hotel:%s' % pk for pk in params.validated_data.get('hotel', [])]
+    topics += ['room:%s' % pk for pk in params.validated_data.get('room', [])]
+    return StreamingHttpResponse(event_stream(topics), content_type='text/event-stream',
+                                 headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
@@ -0,0 +1,89 @@
+import hashlib
+import hmac
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from rest_framework import exceptions
+from rest_framework.authentication import BasicAuthentication
+
+CACHE_SETTINGS = getattr(settings, 'BOOKING_BASIC_AUTH_CACHE', {})
+
+
+class TTLCache:
+    # Обмежений LRU-кеш з часом життя записів, спільний для потоків одного процесу
+    def __init__(self, size=1024, ttl=300):
+        self.size = size
+        self.ttl = ttl
+        self.lock = threading.Lock()
+        self.items = OrderedDict()
+
+    def get(self, key):
+        with self.lock:
+            item = self.items.get(key)
+            if item is None:
+                return None
+            value, expires = item
+            if expires < time.monotonic():
+                del self.items[key]
+                return None
+            self.items.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self.lock:
+            self.items[key] = (value, time.monotonic() + self.ttl)
+            self.items.move_to_end(key)
+            while len(self.items) > self.size:
+                self.items.popitem(last=False)
+
+    def discard(self, predicate):
+        with self.lock:
+            for key in [key for key, (value, _) in self.items.items() if predicate(value)]:
+                del self.items[key]
+
+    def clear(self):
+        with self.lock:
+            self.items.clear()
+
+
+verified_credentials = TTLCache(CACHE_SETTINGS.get('SIZE', 1024), CACHE_SETTINGS.get('TTL', 300))
+
+
+def credentials_key(userid, password):
+    # У кеші лише HMAC від логіна і пароля, не сам пароль
+    message = ('%s\x00%s' % (userid, password)).encode()
+    return hmac.new(settings.SECRET_KEY.encode(), message, hashlib.sha256).digest()
+
+
+def forget_user(user_pk):
+    # Зміна пароля/деактивація/видалення: прибираємо перевірені облікові дані цього користувача
+    verified_credentials.discard(lambda user: user.pk == user_pk)
+
+
+class CachedBasicAuthentication(BasicAuthentication):
+    # Basic auth без PBKDF2 на кожен запит: після успішної перевірки пароля користувач
+    # запам'ятовується на TTL секунд у межах процесу
+    def authenticate_credentials(self, userid, password, request=None):
+        key = credentials_key(userid, password)
+        user = verified_credentials.get(key)
+        if user is not None:
+            return user, None
+        user, auth = super().authenticate_credentials(userid, password, request)
+        verified_credentials.set(key, user)
+        return user, auth
+
+
+def as_user(user):
+    # Для запису від імені користувача. TokenUser (JWT без запиту до БД) не є моделлю і не знає, що обліковий
+    # запис уже деактивовано (чекає на видалення) або видалено — тож тут, на шляхах запису, один запит до User
+    if isinstance(user, User):
+        return user
+    if not getattr(user, 'is_authenticated', False):
+        raise exceptions.NotAuthenticated()
+    account = User.objects.filter(pk=user.pk, is_active=True).only('pk', 'username').first()
+    if account is None:
+        raise exceptions.AuthenticationFailed('User is inactive or deleted.', code='user_inactive')
+    return account
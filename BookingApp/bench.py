@@ -0,0 +1,148 @@
+import json
+import logging
+import os
+import random
+import shutil
+import tempfile
+import time
+from contextlib import contextmanager
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.db import connections
+from django.test.utils import (
+    setup_databases, setup_test_environment, teardown_databases, teardown_test_environment,
+)
+
+from .cache import invalidate
+from .changes import record_changes
+from .models import Hotel, Room, Reservation
+from .occupancy import add_reservations_nights
+
+ROOM_TYPES = ['Single', 'Double', 'Twin', 'Deluxe', 'Suite']
+BASE_DATE = date(2024, 1, 1)
+BENCH_PASSWORD = 'bench-password'
+
+
+@contextmanager
+def scratch_database(verbosity=0):
+    # Бенчмарки працюють на окремій тимчасовій БД, щоб не чіпати робочу db.sqlite3.
+    # Для SQLite це файл, а не :memory:, щоб потоки бачили ті самі дані.
+    tmpdir = tempfile.mkdtemp(prefix='booking-bench-')
+    for alias in connections:
+        conn = connections[alias]
+        if conn.vendor == 'sqlite' and not conn.settings_dict.get('TEST', {}).get('MIRROR'):
+            conn.settings_dict.setdefault('TEST', {})
+            conn.settings_dict['TEST']['NAME'] = os.path.join(tmpdir, '%s.sqlite3' % alias)
+    # очікувані 4xx (конфлікти, 404) не повинні засмічувати звіт
+    logging.getLogger('django.request').setLevel(logging.ERROR)
+    setup_test_environment()
+    old_config = setup_databases(verbosity, interactive=False)
+    try:
+        yield
+    finally:
+        teardown_databases(old_config, verbosity)
+        teardown_test_environment()
+        shutil.rmtree(tmpdir, ignore_errors=True)
+
+
+def percentiles(samples, points=(50, 95, 99)):
+    if not samples:
+        return {'p%d' % p: None for p in points}
+    ordered = sorted(samples)
+    result = {}
+    for p in points:
+        index = min(len(ordered) - 1, int(round(p / 100.0 * (len(ordered) - 1))))
+        result['p%d' % p] = ordered[index]
+    return result
+
+
+@contextmanager
+def timer(samples):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        samples.append((time.perf_counter() - start) * 1000)
+
+
+def write_report(report, output=None, stdout=None):
+    text = json.dumps(report, indent=2, default=str)
+    if output:
+        with open(output, 'w') as f:
+            f.write(text)
+    if stdout is not None:
+        stdout.write(text)
+    return text
+
+
+def seed_users(count, rng, batch_size=1000, prefix=None):
+    # Пароль один на всіх і хешується один раз — PBKDF2 на кожного користувача зайвий
+    template = User()
+    template.set_password(BENCH_PASSWORD)
+    prefix = prefix or 'bench-%d' % rng.randrange(10 ** 9)
+    users = [
+        User(username='%s-%d' % (prefix, i), email='%s-%d@gmail.com' % (prefix, i), password=template.password)
+        for i in range(count)
+    ]
+    return User.objects.bulk_create(users, batch_size=batch_size)
+
+
+def seed_catalog(hotels, rooms_per_hotel, rng, batch_size=1000):
+    hotel_objs = Hotel.objects.bulk_create(
+        [Hotel(name='Hotel %d' % i, address='Street %d' % i) for i in range(hotels)],
+        batch_size=batch_size,
+    )
+    rooms = []
+    for hotel in hotel_objs:
+        for number in range(rooms_per_hotel):
+            rooms.append(Room(
+                hotel=hotel,
+                room_number=str(100 + number),
+                room_type=rng.choice(ROOM_TYPES),
+                price_per_night=Decimal(rng.randrange(4000, 40000)) / 100,
+            ))
+    rooms = Room.objects.bulk_create(rooms, batch_size=batch_size)
+    # bulk_create минає сигнали — скидаємо кеш каталогу і пишемо журнал змін явно
+    invalidate('hotels')
+    invalidate('rooms')
+    record_changes('hotels', [hotel.pk for hotel in hotel_objs])
+    record_changes('rooms', [room.pk for room in rooms])
+    return hotel_objs, rooms
+
+
+def iter_stays(rooms, clients, rng, start=BASE_DATE):
+    # Нескінченний потік бронювань без перетинів: для кожної кімнати дати йдуть одна за одною
+    cursors = {room.pk: start for room in rooms}
+    i = 0
+    while True:
+        room = rooms[i % len(rooms)]
+        check_in = cursors[room.pk] + timedelta(days=rng.randrange(0, 4))
+        check_out = check_in + timedelta(days=rng.randrange(1, 8))
+        cursors[room.pk] = check_out
+        yield Reservation(
+            hotel_id=room.hotel_id,
+            room_id=room.pk,
+            client_id=clients[i % len(clients)].pk,
+            check_in_date=check_in,
+            check_out_date=check_out,
+        )
+        i += 1
+
+
+def seed_reservations(stays, count, batch_size=5000, with_nights=False, progress=None):
+    created = 0
+    while created < count:
+        batch = Reservation.objects.bulk_create([next(stays) for _ in range(min(batch_size, count - created))])
+        if with_nights:
+            add_reservations_nights(batch)
+        record_changes('reservations', [reservation.pk for reservation in batch])
+        created += len(batch)
+        if progress:
+            progress(created)
+    return created
+
+
+def make_rng(seed=42):
+    return random.Random(seed)
@@ -0,0 +1,103 @@
+import hashlib
+import json
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.http import http_date, parse_http_date_safe, quote_etag
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.utils.encoders import JSONEncoder
+
+from .pagination import wants_stream
+
+CACHE_ALIAS = getattr(settings, 'BOOKING_CATALOG_CACHE', 'default')
+CACHE_TIMEOUT = getattr(settings, 'BOOKING_CATALOG_CACHE_TIMEOUT', 300)
+
+
+def catalog_cache():
+    return caches[CACHE_ALIAS]
+
+
+def generation_key(resource, pk=None):
+    return 'catalog:%s:gen' % resource if pk is None else 'catalog:%s:%s:gen' % (resource, pk)
+
+
+def get_generation(resource, pk=None):
+    # Покоління = час останньої зміни (ns). Воно ж іде в ключ кешу і в Last-Modified.
+    key = generation_key(resource, pk)
+    generation = catalog_cache().get(key)
+    if generation is None:
+        generation = time.time_ns()
+        catalog_cache().add(key, generation, None)
+        generation = catalog_cache().get(key, generation)
+    return generation
+
+
+def invalidate(resource, pk=None):
+    # Зміна об'єкта: нове покоління для його деталей і для списку ресурсу
+    now = time.time_ns()
+    keys = {generation_key(resource): now}
+    if pk is not None:
+        keys[generation_key(resource, pk)] = now
+    catalog_cache().set_many(keys, None)
+
+
+def invalidate_many(resource, pks):
+    # Те саме для змін через QuerySet.update(), що обходять post_save
+    now = time.time_ns()
+    keys = {generation_key(resource, pk): now for pk in pks}
+    keys[generation_key(resource)] = now
+    catalog_cache().set_many(keys, None)
+
+
+def response_key(request, resource, pk, generation):
+    query = hashlib.md5(request.get_full_path().encode()).hexdigest()
+    return 'catalog:%s:%s:%d:%s' % (resource, 'list' if pk is None else pk, generation, query)
+
+
+def make_entry(data, generation):
+    body = json.dumps(data, cls=JSONEncoder, sort_keys=True, ensure_ascii=False).encode()
+    return {
+        'data': data,
+        'etag': quote_etag(hashlib.md5(body).hexdigest()),
+        'last_modified': generation // 10 ** 9,
+    }
+
+
+def not_modified(request, entry):
+    if_none_match = request.META.get('HTTP_IF_NONE_MATCH')
+    if if_none_match is not None:
+        # слабке порівняння: стиснена відповідь віддає ту ж мітку з W/
+        tags = [tag.strip().removeprefix('W/') for tag in if_none_match.split(',')]
+        return entry['etag'] in tags or if_none_match.strip() == '*'
+    if_modified_since = parse_http_date_safe(request.META.get('HTTP_IF_MODIFIED_SINCE', ''))
+    return if_modified_since is not None and entry['last_modified'] <= if_modified_since
+
+
+def cached_get(resource, bypass=None):
+    # Read-through кеш для GET каталогу (готелі, кімнати) з ETag / Last-Modified.
+    # Повторний запит з If-None-Match отримує 304 без звернення до БД.
+    # bypass(request) — запити, відповідь на які залежить не лише від каталогу (напр. зайнятість)
+    def decorator(method):
+        @wraps(method)
+        def wrapper(self, request, *args, **kwargs):
+            if wants_stream(request) or (bypass is not None and bypass(request)):
+                return method(self, request, *args, **kwargs)
+            pk = kwargs.get('pk')
+            generation = get_generation(resource, pk)
+            key = response_key(request, resource, pk, generation)
+            entry = catalog_cache().get(key)
+            if entry is None:
+                response = method(self, request, *args, **kwargs)
+                if response.status_code != status.HTTP_200_OK or not isinstance(response, Response):
+                    return response
+                entry = make_entry(response.data, generation)
+                catalog_cache().set(key, entry, CACHE_TIMEOUT)
+            headers = {'ETag': entry['etag'], 'Last-Modified': http_date(entry['last_modified'])}
+            if not_modified(request, entry):
+                return Response(status=status.HTTP_304_NOT_MODIFIED, headers=headers)
+            return Response(entry['data'], headers=headers)
+        return wrapper
+    return decorator
@@ -0,0 +1,95 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+
+from .exceptions import CursorExpired
+from .models import ArchivedReservation, ChangeLog, Hotel, Reservation, Room
+from .serializers import HotelSerializer, ReservationSerializer, RoomSerializer, values_serializer
+
+CHANGES_SETTINGS = getattr(settings, 'BOOKING_CHANGES', {})
+PAGE_SIZE = CHANGES_SETTINGS.get('PAGE_SIZE', 500)
+MAX_PAGE_SIZE = CHANGES_SETTINGS.get('MAX_PAGE_SIZE', 1000)
+KEEP_DAYS = CHANGES_SETTINGS.get('KEEP_DAYS', 30)
+
+RESOURCES = {
+    'hotels': (Hotel, HotelSerializer),
+    'rooms': (Room, RoomSerializer),
+    'reservations': (Reservation, ReservationSerializer),
+}
+
+
+def record_change(resource, object_id, action=ChangeLog.UPSERT):
+    ChangeLog.objects.create(resource=resource, object_id=object_id, action=action)
+
+
+def record_changes(resource, object_ids, action=ChangeLog.UPSERT):
+    # Для шляхів без сигналів: bulk_create, QuerySet.update(), пакетне видалення
+    ChangeLog.objects.bulk_create([ChangeLog(resource=resource, object_id=pk, action=action) for pk in object_ids])
+
+
+def current_data(resource, ids):
+    # Поточний стан змінених об'єктів одним запитом на ресурс; видалених у результаті немає
+    model, serializer_class = RESOURCES[resource]
+    fast = values_serializer(serializer_class)
+    data = {row[0]: fast.to_representation(row) for row in fast.queryset(model.objects.filter(pk__in=ids))}
+    missing = set(ids) - set(data)
+    if resource == 'reservations' and missing:
+        # заархівоване бронювання не видалене — віддаємо його з архіву
+        archived = ArchivedReservation.objects.filter(pk__in=missing)
+        data.update({row[0]: fast.to_representation(row) for row in fast.queryset(archived)})
+    return data
+
+
+def cursor_expired(since, first_id=None):
+    # Розрив одразу після курсора — це або відкочені вставки, або журнал уже почищено (prune_changes).
+    # Почищено, якщо не лишилось жодного запису до курсора: тоді клієнт міг пропустити зміни.
+    # first_id=None — після курсора записів немає; якщо й до нього немає, журнал очищено повністю.
+    if since <= 0 or (first_id is not None and first_id <= since + 1):
+        return False
+    return not ChangeLog.objects.filter(pk__lte=since).exists()
+
+
+def changes_page(since=0, limit=PAGE_SIZE):
+    # Сторінка журналу після курсора: кожен об'єкт один раз, з останньою дією і поточними даними.
+    # Вартість — один запит до журналу і по одному на кожен змінений ресурс, незалежно від розміру каталогу.
+    # Курсор монотонний: SQLite виконує записи по черзі, тож рядок з меншим id не з'явиться після більшого.
+    entries = list(ChangeLog.objects.filter(pk__gt=since).order_by('pk')
+                   .values_list('pk', 'resource', 'object_id', 'action')[:limit + 1])
+    has_more = len(entries) > limit
+    entries = entries[:limit]
+    if cursor_expired(since, entries[0][0] if entries else None):
+        raise CursorExpired()
+
+    latest = {}
+    for pk, resource, object_id, action in entries:
+        latest.pop((resource, object_id), None)
+        latest[(resource, object_id)] = (pk, action)
+    wanted = {}
+    for (resource, object_id), (pk, action) in latest.items():
+        if action == ChangeLog.UPSERT and resource in RESOURCES:
+            wanted.setdefault(resource, []).append(object_id)
+    data = {resource: current_data(resource, ids) for resource, ids in wanted.items()}
+
+    changes = []
+    for (resource, object_id), (pk, action) in latest.items():
+        item = data.get(resource, {}).get(object_id)
+        if item is None:
+            # створений і вже видалений: його delete — далі в журналі
+            action = ChangeLog.DELETE
+        changes.append({'resource': resource, 'id': object_id, 'action': action, 'data': item})
+    return {'cursor': entries[-1][0] if entries else since, 'has_more': has_more, 'changes': changes}
+
+
+def prune_changes(days=None, batch_size=5000):
+    # Найновіший запис лишаємо завжди: за ним видно, куди дійшла послідовність, і клієнт з актуальним
+    # курсором після повного очищення не отримує зайвого 410
+    before = timezone.now() - timedelta(days=days if days is not None else KEEP_DAYS)
+    newest = ChangeLog.objects.order_by('-pk').values_list('pk', flat=True).first()
+    old = ChangeLog.objects.filter(created_at__lt=before).exclude(pk=newest).order_by('pk')
+    total = 0
+    while True:
+        batch = list(old.values_list('pk', flat=True)[:batch_size])
+        if not batch:
+            return total
+        total += ChangeLog.objects.filter(pk__in=batch).delete()[0]
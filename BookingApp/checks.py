@@ -0,0 +1,14 @@
+from django.core.checks import Warning, register
+
+from .schema import read_stored_schema, schema_path
+
+
+@register(deploy=True)
+def check_stored_schema(app_configs, **kwargs):
+    if read_stored_schema() is None:
+        return [Warning(
+            'Stored OpenAPI schema %s is missing or out of date.' % schema_path(),
+            hint='Run "manage.py generate_schema" during the build/deploy.',
+            id='BookingApp.W001',
+        )]
+    return []
@@ -0,0 +1,170 @@
+import asyncio
+import threading
+import time
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .models import EventMessage
+
+EVENTS_SETTINGS = getattr(settings, 'BOOKING_EVENTS', {})
+BROKER = EVENTS_SETTINGS.get('BROKER', 'local')
+BUFFER_SIZE = EVENTS_SETTINGS.get('BUFFER', 100)
+HEARTBEAT = EVENTS_SETTINGS.get('HEARTBEAT', 15)
+MAX_TOPICS = EVENTS_SETTINGS.get('MAX_TOPICS', 50)
+POLL_INTERVAL = EVENTS_SETTINGS.get('POLL_INTERVAL', 0.5)
+KEEP_SECONDS = EVENTS_SETTINGS.get('KEEP_SECONDS', 300)
+
+# Замість подій: буфер клієнта переповнювався, частину подій втрачено — клієнт має перечитати доступність
+RESYNC = object()
+
+
+def reservation_message(action, pk, hotel_id, room_id, check_in_date, check_out_date, rooms=()):
+    # rooms — ще (hotel_id, room_id), яких стосується подія: кімната, з якої бронювання перенесли
+    topics = {'hotel:%s' % hotel_id, 'room:%s' % room_id}
+    for other_hotel, other_room in rooms:
+        topics.update(('hotel:%s' % other_hotel, 'room:%s' % other_room))
+    event = {'action': action, 'id': pk, 'hotel': hotel_id, 'room': room_id,
+             'check_in_date': check_in_date.isoformat(), 'check_out_date': check_out_date.isoformat()}
+    return sorted(topics), event
+
+
+class Subscription:
+    # Підписка одного клієнта SSE: обмежена черга в його циклі подій. Публікація ніколи не чекає на клієнта —
+    # якщо той не встигає читати і черга повна, події далі відкидаються, а клієнт замість них отримає RESYNC
+    def __init__(self, topics, loop, size=BUFFER_SIZE):
+        self.topics = frozenset(topics)
+        self.loop = loop
+        self.queue = asyncio.Queue(maxsize=size)
+        self.overflowed = False
+        self.dropped = 0
+
+    def put(self, event):
+        if not self.overflowed:
+            try:
+                self.queue.put_nowait(event)
+                return
+            except asyncio.QueueFull:
+                self.overflowed = True
+        self.dropped += 1
+
+    async def get(self, timeout):
+        # Наступна подія, RESYNC або None, якщо за timeout секунд подій не було (час для heartbeat)
+        if self.overflowed:
+            # решта буфера без втрачених подій нічого не варта
+            self.overflowed = False
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            return RESYNC
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class LocalBroker:
+    # Розсилка в межах процесу: тема ('hotel:<id>' / 'room:<id>') -> підписки. Публікують синхронні потоки
+    # (сигнали ORM, sync_to_async), підписки живуть у циклі подій ASGI — тому одна передача call_soon_threadsafe
+    # на цикл для всіх його підписників, а не на кожного клієнта.
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.topics = defaultdict(set)
+
+    def subscribe(self, topics):
+        subscription = Subscription(topics, asyncio.get_running_loop())
+        with self.lock:
+            for topic in subscription.topics:
+                self.topics[topic].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self.lock:
+            for topic in subscription.topics:
+                subscribers = self.topics.get(topic)
+                if subscribers is not None:
+                    subscribers.discard(subscription)
+                    if not subscribers:
+                        del self.topics[topic]
+
+    def subscriber_count(self):
+        with self.lock:
+            return len(set().union(*self.topics.values()))
+
+    def deliver(self, messages):
+        by_loop = defaultdict(list)
+        with self.lock:
+            for topics, event in messages:
+                # підписаний і на готель, і на його кімнату отримує подію один раз
+                targets = set().union(*(self.topics.get(topic, ()) for topic in topics))
+                for subscription in targets:
+                    by_loop[subscription.loop].append((subscription, event))
+        for loop, items in by_loop.items():
+            try:
+                loop.call_soon_threadsafe(deliver_items, items)
+            except RuntimeError:
+                # цикл уже закрито — його підписки зникнуть разом з ним
+                pass
+
+    def publish(self, messages):
+        # Лише після коміту: відкочене бронювання подій не породжує
+        if messages:
+            transaction.on_commit(lambda: self.deliver(messages))
+
+
+def deliver_items(items):
+    for subscription, event in items:
+        subscription.put(event)
+
+
+class DatabaseBroker(LocalBroker):
+    # Заміна зовнішнього брокера (Redis pub/sub) для кількох процесів: publish пише рядки EventMessage у тій же
+    # транзакції, що й бронювання, а в кожному процесі один опитувач раз на POLL_INTERVAL читає нові рядки
+    # і розсилає локальним підписникам. Один запит на процес за інтервал, незалежно від кількості клієнтів.
+    def __init__(self):
+        super().__init__()
+        self.pollers = {}
+
+    def publish(self, messages):
+        EventMessage.objects.bulk_create([EventMessage(topics=topics, event=event) for topics, event in messages])
+
+    def subscribe(self, topics):
+        subscription = super().subscribe(topics)
+        poller = self.pollers.get(subscription.loop)
+        if poller is None or poller.done():
+            self.pollers[subscription.loop] = subscription.loop.create_task(self.poll())
+        return subscription
+
+    async def poll(self):
+        # Зупиняється, щойно в процесі не лишилось підписників; наступна підписка запустить новий
+        last = await EventMessage.objects.order_by('-pk').values_list('pk', flat=True).afirst() or 0
+        pruned = time.monotonic()
+        while self.topics:
+            await asyncio.sleep(POLL_INTERVAL)
+            messages = [row async for row in EventMessage.objects.filter(pk__gt=last).order_by('pk')
+                        .values_list('pk', 'topics', 'event')]
+            if messages:
+                last = messages[-1][0]
+                self.deliver([(topics, event) for _, topics, event in messages])
+            if time.monotonic() - pruned > KEEP_SECONDS:
+                pruned = time.monotonic()
+                await EventMessage.objects.filter(created_at__lt=timezone.now() - timedelta(seconds=KEEP_SECONDS)).adelete()
+
+
+broker = DatabaseBroker() if BROKER == 'database' else LocalBroker()
+
+
+def reservation_row(reservation):
+    return (reservation.pk, reservation.hotel_id, reservation.room_id,
+            reservation.check_in_date, reservation.check_out_date)
+
+
+def publish_reservation(action, reservation, rooms=()):
+    broker.publish([reservation_message(action, *reservation_row(reservation), rooms=rooms)])
+
+
+def publish_reservations(action, rows):
+    # rows — (pk, hotel_id, room_id, check_in_date, check_out_date); пакет — одна передача (або один INSERT)
+    broker.publish([reservation_message(action, *row) for row in rows])
@@ -0,0 +1,36 @@
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+
+class ReservationConflict(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = 'The room is already booked for these dates.'
+    default_code = 'reservation_conflict'
+
+
+class BatchConflict(ReservationConflict):
+    default_detail = 'Some rooms of the batch are already booked for these dates.'
+
+    def __init__(self, results):
+        super().__init__({'detail': self.default_detail, 'results': results})
+
+
+class RoomBusy(APIException):
+    # Кімнату зараз бронює інший запит — клієнт може повторити через wait секунд (Retry-After)
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = 'The room is being booked by another request, please retry.'
+    default_code = 'room_busy'
+    wait = 1
+
+
+class HoldExpired(APIException):
+    status_code = status.HTTP_410_GONE
+    default_detail = 'The hold has expired or was already confirmed.'
+    default_code = 'hold_expired'
+
+
+class CursorExpired(APIException):
+    # Журнал змін після курсора вже почищено — клієнту потрібна повна синхронізація з since=0
+    status_code = status.HTTP_410_GONE
+    default_detail = 'The change log was pruned past this cursor, resync from since=0.'
+    default_code = 'cursor_expired'
@@ -0,0 +1,136 @@
+import hashlib
+import json
+import time
+from datetime import timedelta
+from functools import wraps
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.exceptions import APIException, ValidationError
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.utils.encoders import JSONEncoder
+
+from .models import IdempotencyKey
+
+IDEMPOTENCY_SETTINGS = getattr(settings, 'BOOKING_IDEMPOTENCY', {})
+KEY_TTL = IDEMPOTENCY_SETTINGS.get('TTL', 24 * 3600)
+# Скільки повтор чекає, поки перший запит з тим самим ключем завершиться, перш ніж віддати 409
+IN_FLIGHT_WAIT = IDEMPOTENCY_SETTINGS.get('WAIT', 10)
+# Після цього незавершений запит вважаємо покинутим (процес упав) і виконуємо повтор заново
+IN_FLIGHT_TIMEOUT = IDEMPOTENCY_SETTINGS.get('IN_FLIGHT_TIMEOUT', 60)
+POLL_INTERVAL = 0.05
+HEADER = 'HTTP_IDEMPOTENCY_KEY'
+
+encoder = JSONEncoder(ensure_ascii=False)
+
+
+class KeyInFlight(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = 'A request with this Idempotency-Key is still being processed, please retry.'
+    default_code = 'idempotency_key_in_flight'
+    wait = 1
+
+
+class KeyReused(APIException):
+    status_code = status.HTTP_422_UNPROCESSABLE_ENTITY
+    default_detail = 'This Idempotency-Key was already used for a different request.'
+    default_code = 'idempotency_key_reused'
+
+
+def request_fingerprint(request):
+    digest = hashlib.sha256()
+    for part in (request.method.encode(), request.get_full_path().encode(), request.body):
+        digest.update(part)
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+
+def claim(scope, key, fingerprint):
+    # Один SELECT для повтору; для нового ключа ще INSERT. None — ключ наш і запит треба виконати,
+    # інакше — наявний рядок (готова відповідь або запит, що ще виконується).
+    now = timezone.now()
+    entries = IdempotencyKey.objects.filter(scope=scope, key=key)
+    entry = entries.first()
+    fresh = {'request_hash': fingerprint, 'status_code': None, 'response_body': '',
+             'created_at': now, 'expires_at': now + timedelta(seconds=KEY_TTL)}
+    if entry is None:
+        try:
+            with transaction.atomic():
+                IdempotencyKey.objects.create(scope=scope, key=key, **fresh)
+            return None
+        except IntegrityError:
+            # паралельний запит щойно вставив той самий ключ (або вже й видалив — тоді пробуємо ще раз)
+            return entries.first() or claim(scope, key, fingerprint)
+    abandoned = now - timedelta(seconds=IN_FLIGHT_TIMEOUT)
+    if entry.expires_at <= now or (entry.status_code is None and entry.created_at < abandoned):
+        # прострочений або покинутий — перехоплюємо умовним UPDATE (двоє повторів не перехоплять разом)
+        stale = Q(expires_at__lte=now) | Q(status_code__isnull=True, created_at__lt=abandoned)
+        if entries.filter(stale).update(**fresh):
+            return None
+        return entries.first() or claim(scope, key, fingerprint)
+    return entry
+
+
+def replay(entry):
+    return Response(json.loads(entry.response_body), status=entry.status_code, headers={'Idempotent-Replayed': 'true'})
+
+
+def execute(view, args, kwargs, entries):
+    # Зберігаємо відповіді < 500; помилку сервера чи виняток не запам'ятовуємо — повтор виконається знову
+    try:
+        response = view(*args, **kwargs)
+    except Exception:
+        entries.delete()
+        raise
+    if isinstance(response, Response) and response.status_code < 500:
+        entries.update(status_code=response.status_code, response_body=encoder.encode(response.data))
+    else:
+        entries.delete()
+    return response
+
+
+def idempotent(scope):
+    # Заголовок Idempotency-Key для POST: перша відповідь зберігається на KEY_TTL секунд і віддається повторам
+    # без валідації, хешування пароля чи вставок; одночасний повтор чекає на перший запит, а не виконується вдруге.
+    # Ключі окремі для кожного ендпоінту і користувача; той самий ключ з іншим тілом — 422.
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            request = next(arg for arg in args if isinstance(arg, Request))
+            key = request.META.get(HEADER)
+            if not key:
+                return view(*args, **kwargs)
+            if len(key) > 255:
+                raise ValidationError({'Idempotency-Key': 'At most 255 characters.'})
+            owner = 'user:%s' % request.user.pk if request.user.is_authenticated else 'anonymous'
+            entry_scope = '%s:%s' % (scope, owner)
+            fingerprint = request_fingerprint(request)
+            deadline = time.monotonic() + IN_FLIGHT_WAIT
+            while True:
+                entry = claim(entry_scope, key, fingerprint)
+                if entry is None:
+                    return execute(view, args, kwargs, IdempotencyKey.objects.filter(scope=entry_scope, key=key))
+                if entry.request_hash != fingerprint:
+                    raise KeyReused()
+                if entry.status_code is not None:
+                    return replay(entry)
+                if time.monotonic() >= deadline:
+                    raise KeyInFlight()
+                time.sleep(POLL_INTERVAL)
+        return wrapper
+    return decorator
+
+
+def evict_keys(batch_size=1000, now=None):
+    # Прострочені ключі — порціями по pk, кожна одним DELETE
+    expired = IdempotencyKey.objects.filter(expires_at__lte=now or timezone.now()).order_by('pk')
+    total = 0
+    while True:
+        batch = list(expired.values_list('pk', flat=True)[:batch_size])
+        if not batch:
+            return total
+        total += IdempotencyKey.objects.filter(pk__in=batch).delete()[0]
@@ -0,0 +1,109 @@
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .models import Job
+
+JOB_SETTINGS = getattr(settings, 'BOOKING_JOBS', {})
+VISIBILITY_TIMEOUT = JOB_SETTINGS.get('VISIBILITY_TIMEOUT', 300)
+MAX_ATTEMPTS = JOB_SETTINGS.get('MAX_ATTEMPTS', 5)
+RETRY_BACKOFF = JOB_SETTINGS.get('RETRY_BACKOFF', 10)
+MAX_RETRY_DELAY = 3600
+# Скільки готових задач перебирає воркер за одну спробу взяти задачу (інші воркери могли забрати перші)
+CLAIM_CANDIDATES = 10
+
+registry = {}
+
+
+class LeaseExpired(Exception):
+    # Задачу забрав інший воркер (оренда минула) — цей запуск треба припинити
+    pass
+
+
+def task(name):
+    # Реєстрація обробника: handler(job), параметри — в job.payload (JSON)
+    def register(func):
+        registry[name] = func
+        return func
+    return register
+
+
+def enqueue(name, payload=None, delay=0, max_attempts=None, owner=None):
+    if name not in registry:
+        raise KeyError('Unknown job %r' % name)
+    return Job.objects.create(
+        name=name, payload=payload or {}, run_after=timezone.now() + timedelta(seconds=delay),
+        max_attempts=max_attempts or MAX_ATTEMPTS, owner=owner,
+    )
+
+
+def claimable(now):
+    # Готова задача в черзі або взята воркером, чий час вийшов (воркер упав чи завис)
+    return Q(status=Job.QUEUED, run_after__lte=now) | Q(status=Job.RUNNING, locked_until__lt=now)
+
+
+def claim_job(worker_id, timeout=None):
+    # Без SELECT ... FOR UPDATE (SQLite): умовний UPDATE по pk з тією ж умовою — compare-and-swap.
+    # Якщо двоє воркерів обрали одну задачу, UPDATE оновить рядок лише в одного з них.
+    now = timezone.now()
+    locked_until = now + timedelta(seconds=timeout or VISIBILITY_TIMEOUT)
+    candidates = Job.objects.filter(claimable(now)).order_by('run_after', 'pk').values_list('pk', flat=True)
+    for pk in candidates[:CLAIM_CANDIDATES]:
+        claimed = Job.objects.filter(claimable(now), pk=pk).update(
+            status=Job.RUNNING, locked_by=worker_id, locked_until=locked_until, attempts=F('attempts') + 1,
+        )
+        if claimed:
+            return Job.objects.get(pk=pk)
+    return None
+
+
+def owned(job):
+    return Job.objects.filter(pk=job.pk, status=Job.RUNNING, locked_by=job.locked_by)
+
+
+def report_progress(job, timeout=None, **progress):
+    # Для довгих обробників між порціями: записати хід виконання і продовжити оренду одним UPDATE
+    job.progress.update(progress)
+    job.locked_until = timezone.now() + timedelta(seconds=timeout or VISIBILITY_TIMEOUT)
+    if not owned(job).update(progress=job.progress, locked_until=job.locked_until):
+        raise LeaseExpired(job.pk)
+
+
+def retry_delay(attempts):
+    return min(MAX_RETRY_DELAY, RETRY_BACKOFF * 2 ** (attempts - 1))
+
+
+def fail_job(job, error):
+    now = timezone.now()
+    if job.attempts < job.max_attempts:
+        changes = {'status': Job.QUEUED, 'run_after': now + timedelta(seconds=retry_delay(job.attempts))}
+    else:
+        changes = {'status': Job.FAILED, 'finished_at': now}
+    owned(job).update(locked_by='', locked_until=None, last_error=error, **changes)
+
+
+def run_job(job):
+    # Повертає True, якщо обробник відпрацював без помилки. Оновлення статусу — лише поки задача за цим
+    # воркером: якщо оренда минула і задачу вже виконує інший, результат цього запуску відкидається.
+    if job.attempts > job.max_attempts:
+        # попередній запуск не встиг за VISIBILITY_TIMEOUT і спроби вичерпано
+        fail_job(job, job.last_error or 'Visibility timeout expired')
+        return False
+    handler = registry.get(job.name)
+    try:
+        if handler is None:
+            raise KeyError('Unknown job %r' % job.name)
+        handler(job)
+    except Exception:
+        fail_job(job, traceback.format_exc())
+        return False
+    owned(job).update(status=Job.DONE, locked_by='', locked_until=None, finished_at=timezone.now())
+    return True
+
+
+def prune_jobs(days=None):
+    before = timezone.now() - timedelta(days=days if days is not None else JOB_SETTINGS.get('KEEP_FINISHED_DAYS', 7))
+    return Job.objects.filter(status__in=[Job.DONE, Job.FAILED], finished_at__lt=before).delete()[0]
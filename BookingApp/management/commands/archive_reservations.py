@@ -0,0 +1,29 @@
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from BookingApp.archive import ARCHIVE_AFTER_DAYS, ARCHIVE_BATCH_SIZE, archive_reservations
+from BookingApp.models import ArchivedReservation
+
+
+class Command(BaseCommand):
+    help = ('Move reservations that checked out more than --after-days ago into the archive table, in batches. '
+            'Safe to interrupt and re-run; daily rollups keep the archived history.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--after-days', type=int, default=ARCHIVE_AFTER_DAYS)
+        parser.add_argument('--before', type=date.fromisoformat,
+                            help='Archive stays that checked out before this date instead of using --after-days.')
+        parser.add_argument('--batch-size', type=int, default=ARCHIVE_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        cutoff = options['before'] or timezone.localdate() - timedelta(days=options['after_days'])
+
+        def progress(done):
+            if options['verbosity'] > 1:
+                self.stderr.write('%d reservations archived' % done)
+
+        moved = archive_reservations(cutoff, options['batch_size'], progress)
+        self.stdout.write(self.style.SUCCESS('Archived %d reservations checked out before %s (%d in archive).' % (
+            moved, cutoff, ArchivedReservation.objects.count())))
@@ -0,0 +1,24 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand
+
+from BookingApp.rollups import rebuild_rollups
+
+
+class Command(BaseCommand):
+    help = ('Rebuild daily occupancy/revenue rollups from the nightly occupancy calendar, for all dates or for '
+            '[--start-date, --end-date). Run rebuild_occupancy first if the calendar itself is out of date.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--start-date', type=date.fromisoformat)
+        parser.add_argument('--end-date', type=date.fromisoformat)
+        parser.add_argument('--batch-size', type=int, default=5000)
+
+    def handle(self, *args, **options):
+        def progress(done):
+            if options['verbosity'] > 1:
+                self.stderr.write('%d rollup rows written' % done)
+
+        total = rebuild_rollups(options['start_date'], options['end_date'], options['batch_size'], progress)
+        self.stdout.write(self.style.SUCCESS('Rebuilt %d daily rollup rows.' % total))
+
@@ -0,0 +1,202 @@
+import json
+import threading
+import time
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from BookingApp import bench
+from BookingApp.models import Reservation
+from BookingApp.serializers import ClaimsTokenObtainPairSerializer
+from BookingApp.urls import urlpatterns
+
+
+def random_stay(ctx, room=None):
+    room = room or ctx['rng'].choice(ctx['rooms'])
+    # Далеко в майбутньому, щоб нові бронювання здебільшого не конфліктували з засіяними
+    check_in = bench.BASE_DATE + timedelta(days=20000 + ctx['rng'].randrange(20000))
+    return {'hotel': room.hotel_id, 'room': room.pk, 'client': ctx['user'].pk,
+            'check_in_date': check_in.isoformat(),
+            'check_out_date': (check_in + timedelta(days=ctx['rng'].randrange(1, 5))).isoformat()}
+
+
+def throwaway_user(ctx):
+    ctx['counter'][0] += 1
+    return User.objects.create(username='bench-delete-%d-%d' % (threading.get_ident(), ctx['counter'][0]))
+
+
+# Сценарій на кожен маршрут з BookingApp/urls.py: (method, url kwargs, query/body, користувач).
+# Маршрути без сценарію потрапляють у звіт як skipped, щоб нові ендпоінти було видно.
+SCENARIOS = {
+    'hotel-list': lambda ctx: ('get', {}, {}, None),
+    'hotel-detail': lambda ctx: ('get', {'pk': ctx['rng'].choice(ctx['hotels']).pk}, {}, None),
+    'hotel-calendar': lambda ctx: ('get', {'pk': ctx['rng'].choice(ctx['hotels']).pk},
+                                   {'start_date': bench.BASE_DATE.isoformat(), 'days': 365}, None),
+    'hotel-analytics': lambda ctx: ('get', {'pk': ctx['rng'].choice(ctx['hotels']).pk},
+                                    {'start_date': bench.BASE_DATE.isoformat(), 'end_date': '2024-12-31'}, ctx['admin']),
+    'room-list': lambda ctx: ('get', {}, {}, None),
+    'room-search': lambda ctx: ('get', {}, {'room_type': ctx['rng'].choice(bench.ROOM_TYPES),
+                                            'max_price': ctx['rng'].randrange(100, 400), 'ordering': 'price'}, None),
+    'room-detail': lambda ctx: ('get', {'pk': ctx['rng'].choice(ctx['rooms']).pk}, {}, None),
+    'reservation-list': lambda ctx: ('get', {}, {'page_size': 100}, None),
+    'reservation-detail': lambda ctx: ('get', {'pk': ctx['rng'].choice(ctx['reservation_ids'])}, {}, None),
+    'reservation-batch': lambda ctx: ('post', {}, [random_stay(ctx) for _ in range(5)], None),
+    'hold-list': lambda ctx: ('post', {}, random_stay(ctx), None),
+    # seed_catalog пише в журнал змін кожен готель і кімнату — курсор з будь-якого місця журналу
+    'changes': lambda ctx: ('get', {}, {'since': ctx['rng'].randrange(len(ctx['rooms'])), 'limit': 500}, None),
+    'availability-search': lambda ctx: ('get', {}, {
+        'check_in_date': (bench.BASE_DATE + timedelta(days=ctx['rng'].randrange(365))).isoformat(),
+        'check_out_date': (bench.BASE_DATE + timedelta(days=366 + ctx['rng'].randrange(7))).isoformat(),
+        'hotel': ctx['rng'].choice(ctx['hotels']).pk,
+    }, None),
+    'register_user': lambda ctx: ('post', {}, {
+        'email': 'bench%d@gmail.com' % ctx['rng'].randrange(10 ** 12), 'first_name': 'Bench',
+        'last_name': 'User', 'password': bench.BENCH_PASSWORD}, None),
+    'delete-user': lambda ctx: ('delete', {}, {}, throwaway_user(ctx)),
+    'token_obtain_pair': lambda ctx: ('post', {}, {'username': ctx['user'].username, 'password': bench.BENCH_PASSWORD}, None),
+    'token_refresh': lambda ctx: ('post', {}, {'refresh': ctx['refresh']}, None),
+    'token_verify': lambda ctx: ('post', {}, {'token': ctx['access']}, None),
+    'timing-stats': lambda ctx: ('get', {}, {}, ctx['admin']),
+}
+# Варіанти вже покритих маршрутів: інший метод або параметри
+EXTRA_SCENARIOS = {
+    'hotel-detail:expand': ('hotel-detail', lambda ctx: ('get', {'pk': ctx['rng'].choice(ctx['hotels']).pk},
+                                                         {'expand': 'rooms', 'date': bench.BASE_DATE.isoformat()}, None)),
+    'reservation-list:post': ('reservation-list', lambda ctx: ('post', {}, random_stay(ctx), None)),
+}
+
+
+def route_names():
+    return [pattern.name for pattern in urlpatterns if getattr(pattern, 'name', None)]
+
+
+class Command(BaseCommand):
+    help = ('Drive every BookingApp route through APIClient with concurrent workers on a scratch database and '
+            'report latency percentiles, queries per request and throughput as JSON.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=4)
+        parser.add_argument('--requests', type=int, default=100, help='Requests per route.')
+        parser.add_argument('--hotels', type=int, default=20)
+        parser.add_argument('--rooms-per-hotel', type=int, default=20)
+        parser.add_argument('--reservations', type=int, default=5000)
+        parser.add_argument('--routes', help='Comma separated subset of route names.')
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--output', help='Write the JSON report to this file.')
+        parser.add_argument('--compare', help='Previous JSON report; routes whose p95 grew more than --threshold are flagged.')
+        parser.add_argument('--threshold', type=float, default=0.2)
+
+    def handle(self, *args, **options):
+        scenarios = {name: (name, SCENARIOS[name]) for name in route_names() if name in SCENARIOS}
+        scenarios.update(EXTRA_SCENARIOS)
+        if options['routes']:
+            wanted = options['routes'].split(',')
+            scenarios = {name: value for name, value in scenarios.items() if name in wanted}
+
+        report = {
+            'benchmark': 'api',
+            'settings': {key: options[key] for key in ('workers', 'requests', 'hotels', 'rooms_per_hotel', 'reservations', 'seed')},
+            'routes': {},
+            'skipped': [name for name in route_names() if name not in SCENARIOS],
+        }
+        with bench.scratch_database():
+            rng = bench.make_rng(options['seed'])
+            users = bench.seed_users(options['workers'], rng)
+            hotels, rooms = bench.seed_catalog(options['hotels'], options['rooms_per_hotel'], rng)
+            bench.seed_reservations(bench.iter_stays(rooms, users, rng), options['reservations'], with_nights=True)
+            shared = {
+                'hotels': hotels,
+                'rooms': rooms,
+                'reservation_ids': list(Reservation.objects.values_list('pk', flat=True)[:1000]),
+                'admin': User.objects.create(username='bench-admin', is_staff=True),
+            }
+            connection.close()
+            for name, (route, scenario) in scenarios.items():
+                result = self.run_route(name, route, scenario, users, shared, options)
+                report['routes'][name] = result
+                self.stderr.write('%-24s p50=%7.2fms p95=%7.2fms q/req=%5.1f %7.1f req/s %s' % (
+                    name, result['p50_ms'], result['p95_ms'], result['queries_per_request'],
+                    result['throughput_rps'], result['status_codes']))
+
+        if options['compare']:
+            report['regressions'] = self.compare(report, options['compare'], options['threshold'])
+        bench.write_report(report, options['output'], self.stdout)
+
+    def run_route(self, name, route, scenario, users, shared, options):
+        samples = []
+        queries = []
+        codes = {}
+        lock = threading.Lock()
+        per_worker = max(1, options['requests'] // options['workers'])
+
+        def worker(index):
+            user = users[index]
+            refresh = ClaimsTokenObtainPairSerializer.get_token(user)
+            # Окремий генератор на маршрут і потік, щоб POST-сценарії не повторювали одні й ті самі дати
+            ctx = dict(shared, rng=bench.make_rng('%s:%s:%d' % (options['seed'], name, index)), user=user,
+                       refresh=str(refresh), access=str(refresh.access_token), counter=[0])
+            api = APIClient()
+            local_samples, local_queries, local_codes = [], [], {}
+            try:
+                for _ in range(per_worker):
+                    method, kwargs, data, as_user = scenario(ctx)
+                    api.force_authenticate(user=as_user or user)
+                    url = reverse(route, kwargs=kwargs)
+                    with CaptureQueriesContext(connection) as captured, bench.timer(local_samples):
+                        if method == 'get':
+                            response = api.get(url, data)
+                        else:
+                            response = getattr(api, method)(url, data, format='json')
+                    local_queries.append(len(captured.captured_queries))
+                    local_codes[response.status_code] = local_codes.get(response.status_code, 0) + 1
+            finally:
+                connection.close()
+            with lock:
+                samples.extend(local_samples)
+                queries.extend(local_queries)
+                for code, count in local_codes.items():
+                    codes[code] = codes.get(code, 0) + count
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(options['workers'])]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+
+        result = {
+            'requests': len(samples),
+            'throughput_rps': len(samples) / elapsed,
+            'queries_per_request': sum(queries) / len(queries),
+            'status_codes': {str(code): count for code, count in sorted(codes.items())},
+        }
+        result.update({key + '_ms': value for key, value in bench.percentiles(samples).items()})
+        return result
+
+    def compare(self, report, path, threshold):
+        try:
+            with open(path) as f:
+                baseline = json.load(f)['routes']
+        except (OSError, ValueError, KeyError) as exc:
+            raise CommandError('Cannot read baseline report %s: %s' % (path, exc))
+        regressions = []
+        for name, result in report['routes'].items():
+            before = baseline.get(name)
+            if not before or not before.get('p95_ms'):
+                continue
+            change = result['p95_ms'] / before['p95_ms'] - 1
+            if change > threshold or result['queries_per_request'] > before['queries_per_request']:
+                regressions.append({
+                    'route': name,
+                    'p95_ms_before': before['p95_ms'], 'p95_ms_after': result['p95_ms'],
+                    'queries_before': before['queries_per_request'], 'queries_after': result['queries_per_request'],
+                })
+                self.stderr.write(self.style.WARNING('regression: %s p95 %+.0f%%, queries %.1f -> %.1f' % (
+                    name, change * 100, before['queries_per_request'], result['queries_per_request'])))
+        return regressions
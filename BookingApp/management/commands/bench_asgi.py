@@ -0,0 +1,156 @@
+import asyncio
+import threading
+import time
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from django.core.handlers.asgi import ASGIHandler
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand
+from django.db import connections
+from django.urls import reverse
+
+from BookingApp import bench
+
+MODES = ('wsgi', 'asgi-sync', 'asgi-async')
+
+
+class InFlight:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.current = 0
+        self.peak = 0
+
+    def __enter__(self):
+        with self.lock:
+            self.current += 1
+            self.peak = max(self.peak, self.current)
+
+    def __exit__(self, *exc):
+        with self.lock:
+            self.current -= 1
+
+
+def wsgi_environ(path, query):
+    return {
+        'REQUEST_METHOD': 'GET', 'PATH_INFO': path, 'QUERY_STRING': query, 'SCRIPT_NAME': '',
+        'SERVER_NAME': 'testserver', 'SERVER_PORT': '80', 'SERVER_PROTOCOL': 'HTTP/1.1', 'HTTP_HOST': 'testserver',
+        'wsgi.input': BytesIO(), 'wsgi.errors': BytesIO(), 'wsgi.url_scheme': 'http',
+        'wsgi.version': (1, 0), 'wsgi.multithread': True, 'wsgi.multiprocess': False, 'wsgi.run_once': False,
+    }
+
+
+def run_wsgi(path, query, clients, workers, delay):
+    # Потоковий WSGI-сервер (як gunicorn --threads): повільний клієнт тримає потік, доки не дочитає тіло
+    handler = WSGIHandler()
+    in_flight = InFlight()
+    samples = []
+    statuses = set()
+
+    def client(queued_at):
+        with in_flight:
+            response = handler(wsgi_environ(path, query), lambda status, headers: statuses.add(status[:3]))
+            try:
+                for _ in response:
+                    time.sleep(delay)
+            finally:
+                response.close()
+                connections.close_all()
+        samples.append((time.perf_counter() - queued_at) * 1000)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for future in [pool.submit(client, time.perf_counter()) for _ in range(clients)]:
+            future.result()
+    return time.perf_counter() - start, samples, in_flight.peak, sorted(statuses)
+
+
+def run_asgi(path, query, clients, delay):
+    # Цикл подій з ASGIHandler; клієнт повільно «читає» кожне повідомлення тіла
+    handler = ASGIHandler()
+    in_flight = InFlight()
+    samples = []
+    statuses = set()
+
+    async def client():
+        started = time.perf_counter()
+        scope = {
+            'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': 'GET', 'scheme': 'http',
+            'path': path, 'raw_path': path.encode(), 'query_string': query.encode(), 'root_path': '',
+            'headers': [(b'host', b'testserver')], 'client': ('127.0.0.1', 0), 'server': ('testserver', 80),
+        }
+        requested = False
+        disconnected = asyncio.Event()
+
+        async def receive():
+            nonlocal requested
+            if not requested:
+                requested = True
+                return {'type': 'http.request', 'body': b'', 'more_body': False}
+            await disconnected.wait()
+            return {'type': 'http.disconnect'}
+
+        async def send(message):
+            if message['type'] == 'http.response.start':
+                statuses.add(str(message['status']))
+            elif message['type'] == 'http.response.body':
+                await asyncio.sleep(delay)
+
+        with in_flight:
+            await handler(scope, receive, send)
+        disconnected.set()
+        samples.append((time.perf_counter() - started) * 1000)
+
+    async def main():
+        await asyncio.gather(*[client() for _ in range(clients)])
+
+    start = time.perf_counter()
+    asyncio.run(main())
+    return time.perf_counter() - start, samples, in_flight.peak, sorted(statuses)
+
+
+class Command(BaseCommand):
+    help = ('Compare how many slow clients one process serves concurrently: sync views under a threaded WSGI server, '
+            'sync views under ASGI and the async views (BookingApp/async_views.py) under ASGI.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--clients', type=int, default=200, help='Concurrent clients per mode.')
+        parser.add_argument('--workers', type=int, default=8, help='WSGI server threads.')
+        parser.add_argument('--client-delay', type=float, default=0.1, help='Seconds a client spends on each body chunk.')
+        parser.add_argument('--hotels', type=int, default=50)
+        parser.add_argument('--modes', default=','.join(MODES))
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--output', help='Write the JSON report to this file.')
+
+    def handle(self, *args, **options):
+        report = {'benchmark': 'asgi', 'settings': {key: options[key] for key in
+                                                    ('clients', 'workers', 'client_delay', 'hotels')},
+                  'modes': {}}
+        with bench.scratch_database():
+            bench.seed_catalog(options['hotels'], 1, bench.make_rng(options['seed']))
+            connections.close_all()
+            # синхронний потоковий список під ASGI Django попереджає, що вичитає його цілком — це і міряємо
+            warnings.filterwarnings('ignore', 'StreamingHttpResponse must consume synchronous iterators')
+
+            # Той самий невеликий потоковий список готелів: синхронна в'юха (?stream=true) і async-в'юха.
+            # Тіло маленьке, тож час запиту визначає повільний клієнт, а не серіалізація.
+            sync_path, async_path = reverse('hotel-list'), reverse('async-hotel-list')
+            for mode in options['modes'].split(','):
+                if mode == 'wsgi':
+                    result = run_wsgi(sync_path, 'stream=true', options['clients'], options['workers'],
+                                      options['client_delay'])
+                elif mode == 'asgi-sync':
+                    result = run_asgi(sync_path, 'stream=true', options['clients'], options['client_delay'])
+                else:
+                    result = run_asgi(async_path, '', options['clients'], options['client_delay'])
+                elapsed, samples, peak, statuses = result
+                point = {'wall_s': elapsed, 'throughput_rps': len(samples) / elapsed,
+                         'peak_in_flight': peak, 'statuses': statuses}
+                point.update({key + '_ms': value for key, value in bench.percentiles(samples).items()})
+                report['modes'][mode] = point
+                self.stderr.write('%-10s %d clients: %6.2fs, %7.1f req/s, peak in flight %d, p95 %.0fms' % (
+                    mode, len(samples), elapsed, point['throughput_rps'], peak, point['p95_ms']))
+                connections.close_all()
+
+        bench.write_report(report, options['output'], self.stdout)
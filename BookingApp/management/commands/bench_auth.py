@@ -0,0 +1,60 @@
+import base64
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.authentication import BasicAuthentication
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+from rest_framework_simplejwt.authentication import JWTAuthentication, JWTStatelessUserAuthentication
+
+from BookingApp import bench
+from BookingApp.authentication import CachedBasicAuthentication, verified_credentials
+from BookingApp.serializers import ClaimsTokenObtainPairSerializer
+
+
+class Command(BaseCommand):
+    help = 'Measure per-request authentication CPU time and queries for Basic and JWT, before and after the fast path.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=200)
+        parser.add_argument('--output', help='Write the JSON report to this file.')
+
+    def handle(self, *args, **options):
+        factory = APIRequestFactory()
+        report = {'benchmark': 'auth', 'requests': options['requests'], 'results': []}
+
+        with bench.scratch_database():
+            user = bench.seed_users(1, bench.make_rng())[0]
+            basic = 'Basic ' + base64.b64encode(('%s:%s' % (user.username, bench.BENCH_PASSWORD)).encode()).decode()
+            jwt = 'JWT %s' % ClaimsTokenObtainPairSerializer.get_token(user).access_token
+            verified_credentials.clear()
+
+            cases = [
+                ('basic', BasicAuthentication, basic),
+                ('basic_cached', CachedBasicAuthentication, basic),
+                ('jwt', JWTAuthentication, jwt),
+                ('jwt_stateless', JWTStatelessUserAuthentication, jwt),
+            ]
+            for name, authentication_class, header in cases:
+                authenticator = authentication_class()
+                samples = []
+                with CaptureQueriesContext(connection) as ctx:
+                    cpu_start = time.process_time()
+                    for _ in range(options['requests']):
+                        request = Request(factory.get('/api/booking/reservations/', HTTP_AUTHORIZATION=header))
+                        with bench.timer(samples):
+                            result = authenticator.authenticate(request)
+                        assert result is not None and result[0].pk == user.pk
+                    cpu = time.process_time() - cpu_start
+                result = {
+                    'case': name,
+                    'cpu_ms_per_request': cpu * 1000 / options['requests'],
+                    'queries_per_request': len(ctx.captured_queries) / options['requests'],
+                }
+                result.update({key + '_ms': value for key, value in bench.percentiles(samples).items()})
+                report['results'].append(result)
+                self.stderr.write('%(case)s: %(cpu_ms_per_request).3f ms CPU, %(queries_per_request).2f queries' % result)
+
+        bench.write_report(report, options['output'], self.stdout)
@@ -0,0 +1,62 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from BookingApp import bench
+from BookingApp.models import Room
+
+
+class Command(BaseCommand):
+    help = 'Measure availability search latency while the reservation table grows (runs on a scratch database).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', default='10000,100000,1000000',
+                            help='Comma separated reservation table sizes to measure at.')
+        parser.add_argument('--hotels', type=int, default=50)
+        parser.add_argument('--rooms-per-hotel', type=int, default=20)
+        parser.add_argument('--queries', type=int, default=200, help='Searches per measurement point.')
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--output', help='Write the JSON report to this file.')
+
+    def handle(self, *args, **options):
+        sizes = sorted(int(size) for size in options['sizes'].split(','))
+        rng = bench.make_rng(options['seed'])
+        report = {'benchmark': 'availability', 'points': []}
+
+        with bench.scratch_database():
+            clients = bench.seed_users(10, rng)
+            hotels, rooms = bench.seed_catalog(options['hotels'], options['rooms_per_hotel'], rng)
+            stays = bench.iter_stays(rooms, clients, rng)
+            api = APIClient()
+            total = 0
+
+            for size in sizes:
+                total += bench.seed_reservations(stays, size - total)
+                samples = []
+                queries = []
+                for _ in range(options['queries']):
+                    check_in = bench.BASE_DATE + timedelta(days=rng.randrange(0, 3650))
+                    params = {
+                        'check_in_date': check_in.isoformat(),
+                        'check_out_date': (check_in + timedelta(days=rng.randrange(1, 8))).isoformat(),
+                        'hotel': rng.choice(hotels).pk,
+                    }
+                    with CaptureQueriesContext(connection) as ctx, bench.timer(samples):
+                        response = api.get('/api/booking/availability/', params)
+                    assert response.status_code == 200, response.content
+                    queries.append(len(ctx.captured_queries))
+
+                point = {'reservations': total, 'queries_per_search': max(queries)}
+                point.update({key + '_ms': value for key, value in bench.percentiles(samples).items()})
+                report['points'].append(point)
+                self.stderr.write('%(reservations)d reservations: p50=%(p50_ms).2fms p95=%(p95_ms).2fms' % point)
+
+            # План запиту показує, що перетин дат шукається по індексу, а не скануванням таблиці
+            report['query_plan'] = Room.objects.available(
+                params['check_in_date'], params['check_out_date'],
+            ).filter(hotel_id=params['hotel']).explain()
+
+        bench.write_report(report, options['output'], self.stdout)
@@ -0,0 +1,98 @@
+import threading
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.db.models import Exists, OuterRef
+from rest_framework.test import APIClient
+
+from BookingApp import bench
+from BookingApp.models import Reservation
+
+
+def count_double_bookings():
+    clash = Reservation.objects.filter(
+        room=OuterRef('room'),
+        check_in_date__lt=OuterRef('check_out_date'),
+        check_out_date__gt=OuterRef('check_in_date'),
+    ).exclude(pk=OuterRef('pk'))
+    return Reservation.objects.filter(Exists(clash)).count()
+
+
+class Command(BaseCommand):
+    help = 'Concurrent reservation load test: throughput per worker count and double booking check (scratch database).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', default='1,2,4,8', help='Comma separated worker thread counts.')
+        parser.add_argument('--requests', type=int, default=200, help='Booking attempts per worker.')
+        parser.add_argument('--rooms', type=int, default=50)
+        parser.add_argument('--days', type=int, default=60, help='Date window the attempts fall into.')
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--output', help='Write the JSON report to this file.')
+
+    def handle(self, *args, **options):
+        report = {'benchmark': 'booking', 'vendor': connection.vendor, 'runs': []}
+        for workers in sorted(int(w) for w in options['workers'].split(',')):
+            with bench.scratch_database():
+                report['runs'].append(self.run(workers, options))
+            run = report['runs'][-1]
+            self.stderr.write('%(workers)d workers: %(throughput_rps).1f req/s, %(created)d created, '
+                              '%(conflicts)d conflicts, %(double_bookings)d double bookings' % run)
+        bench.write_report(report, options['output'], self.stdout)
+
+    def run(self, workers, options):
+        rng = bench.make_rng(options['seed'])
+        users = bench.seed_users(workers, rng)
+        hotels, rooms = bench.seed_catalog(1, options['rooms'], rng)
+        connection.close()
+
+        counts = {}
+        samples = []
+        lock = threading.Lock()
+
+        def worker(index):
+            local_rng = bench.make_rng(options['seed'] + index)
+            api = APIClient()
+            api.force_authenticate(user=users[index])
+            local_counts = {}
+            local_samples = []
+            try:
+                for _ in range(options['requests']):
+                    room = local_rng.choice(rooms)
+                    check_in = bench.BASE_DATE + timedelta(days=local_rng.randrange(options['days']))
+                    data = {
+                        'hotel': room.hotel_id, 'room': room.pk, 'client': users[index].pk,
+                        'check_in_date': check_in.isoformat(),
+                        'check_out_date': (check_in + timedelta(days=local_rng.randrange(1, 5))).isoformat(),
+                    }
+                    with bench.timer(local_samples):
+                        response = api.post('/api/booking/reservations/', data, format='json')
+                    local_counts[response.status_code] = local_counts.get(response.status_code, 0) + 1
+            finally:
+                connection.close()
+            with lock:
+                samples.extend(local_samples)
+                for code, count in local_counts.items():
+                    counts[code] = counts.get(code, 0) + count
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(workers)]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+
+        run = {
+            'workers': workers,
+            'attempts': sum(counts.values()),
+            'created': counts.get(201, 0),
+            'conflicts': counts.get(409, 0),
+            'busy': counts.get(503, 0),
+            'status_codes': counts,
+            'throughput_rps': sum(counts.values()) / elapsed,
+            'double_bookings': count_double_bookings(),
+        }
+        run.update({key + '_ms': value for key, value in bench.percentiles(samples).items()})
+        return run
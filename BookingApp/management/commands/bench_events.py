@@ -0,0 +1,128 @@
+import asyncio
+import time
+import resource
+from datetime import timedelta
+
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIHandler
+from django.core.management.base import BaseCommand
+from django.db import connections
+from django.urls import reverse
+
+from BookingApp import bench, events
+from BookingApp.models import Reservation
+
+
+class Subscriber:
+    # Клієнт SSE поверх ASGIHandler: лише рахує отримані події, нічого не читає повільно
+    def __init__(self, handler, path, query):
+        self.scope = {
+            'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': 'GET', 'scheme': 'http',
+            'path': path, 'raw_path': path.encode(), 'query_string': query.encode(), 'root_path': '',
+            'headers': [(b'host', b'testserver'), (b'accept', b'text/event-stream')],
+            'client': ('127.0.0.1', 0), 'server': ('testserver', 80),
+        }
+        self.handler = handler
+        self.requested = False
+        self.connected = asyncio.Event()
+        self.disconnected = asyncio.Event()
+        self.received = []
+
+    async def receive(self):
+        if not self.requested:
+            self.requested = True
+            return {'type': 'http.request', 'body': b'', 'more_body': False}
+        await self.disconnected.wait()
+        return {'type': 'http.disconnect'}
+
+    async def send(self, message):
+        if message['type'] != 'http.response.body':
+            return
+        if message['body'].startswith(b'event: reservation'):
+            self.received.append(time.perf_counter())
+        else:
+            self.connected.set()
+
+    async def run(self):
+        await self.handler(self.scope, self.receive, self.send)
+
+
+async def loop_lag(seconds, step=0.01):
+    # Наскільки пізніше за заплановане прокидається корутина, поки підписники простоюють
+    samples = []
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        await asyncio.sleep(step)
+        samples.append((time.perf_counter() - start - step) * 1000)
+    return bench.percentiles(samples)
+
+
+class Command(BaseCommand):
+    help = ('Connect thousands of idle SSE subscribers (async/events/) to one process through ASGIHandler and '
+            'report memory per subscriber, event loop lag while idle and the time to fan reservation events out.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--subscribers', type=int, default=5000)
+        parser.add_argument('--hotels', type=int, default=10, help='Subscribers are spread over this many hotels.')
+        parser.add_argument('--events', type=int, default=5, help='Reservations created in the first hotel.')
+        parser.add_argument('--idle', type=float, default=2.0, help='Seconds to measure loop lag with idle subscribers.')
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--output', help='Write the JSON report to this file.')
+
+    def handle(self, *args, **options):
+        report = {'benchmark': 'events', 'broker': type(events.broker).__name__,
+                  'settings': {key: options[key] for key in ('subscribers', 'hotels', 'events', 'idle')}}
+        with bench.scratch_database():
+            rng = bench.make_rng(options['seed'])
+            hotels, rooms = bench.seed_catalog(options['hotels'], 1, rng)
+            client = bench.seed_users(1, rng)[0]
+            connections.close_all()
+            report.update(asyncio.run(self.measure(options, hotels, rooms[0], client)))
+            connections.close_all()
+        bench.write_report(report, options['output'], self.stdout)
+
+    async def measure(self, options, hotels, room, client):
+        handler = ASGIHandler()
+        path = reverse('async-events')
+        # пік RSS процесу (у КіБ на Linux): підписники лише додають пам'ять, тож різниця — їхня вартість
+        baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        started = time.perf_counter()
+        subscribers = [Subscriber(handler, path, 'hotel=%d' % hotels[i % len(hotels)].pk)
+                       for i in range(options['subscribers'])]
+        tasks = [asyncio.create_task(subscriber.run()) for subscriber in subscribers]
+        await asyncio.gather(*[subscriber.connected.wait() for subscriber in subscribers])
+        connect_s = time.perf_counter() - started
+        memory = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - baseline
+        self.stderr.write('%d subscribers connected in %.2fs, %.1f KiB each' % (
+            len(subscribers), connect_s, memory / len(subscribers)))
+
+        lag = await loop_lag(options['idle'])
+        self.stderr.write('idle loop lag p95 %.2fms, p99 %.2fms' % (lag['p95'], lag['p99']))
+
+        # Бронювання першого готелю: сигнал -> on_commit -> розсилка в цикл подій
+        targets = [subscriber for subscriber in subscribers if subscriber.scope['query_string'] ==
+                   ('hotel=%d' % room.hotel_id).encode()]
+        fan_out = []
+        for i in range(options['events']):
+            check_in = bench.BASE_DATE + timedelta(days=3 * i)
+            start = time.perf_counter()
+            await sync_to_async(Reservation.objects.create)(
+                hotel_id=room.hotel_id, room=room, client=client, check_in_date=check_in,
+                check_out_date=check_in + timedelta(days=2))
+            while sum(len(subscriber.received) > i for subscriber in targets) < len(targets):
+                await asyncio.sleep(0.001)
+            fan_out.append((max(subscriber.received[i] for subscriber in targets) - start) * 1000)
+        self.stderr.write('event to %d subscribers: p50 %.1fms' % (len(targets), bench.percentiles(fan_out)['p50']))
+
+        for subscriber in subscribers:
+            subscriber.disconnected.set()
+        await asyncio.gather(*tasks)
+        return {
+            'connect_s': connect_s,
+            'rss_per_subscriber_kib': memory / len(subscribers),
+            'idle_loop_lag_ms': lag,
+            'fan_out': {'subscribers': len(targets), **{key + '_ms': value
+                                                       for key, value in bench.percentiles(fan_out).items()}},
+            'subscribers_left': events.broker.subscriber_count(),
+        }
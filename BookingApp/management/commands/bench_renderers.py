@@ -0,0 +1,64 @@
+from django.core.management.base import BaseCommand
+from rest_framework.renderers import JSONRenderer
+
+from BookingApp import bench, middleware
+from BookingApp.models import Reservation
+from BookingApp.renderers import ColumnarJSONRenderer, CSVRenderer, MessagePackRenderer, msgpack
+from BookingApp.serializers import ReservationSerializer, values_serializer
+
+RENDERERS = [('json', JSONRenderer), ('columnar', ColumnarJSONRenderer), ('csv', CSVRenderer)]
+if msgpack is not None:
+    RENDERERS.append(('msgpack', MessagePackRenderer))
+
+
+def median_ms(func, repeat):
+    samples = []
+    for _ in range(repeat):
+        with bench.timer(samples):
+            result = func()
+    return bench.percentiles(samples, points=(50,))['p50'], result
+
+
+class Command(BaseCommand):
+    help = ('Render the reservation list with every list renderer (JSON, columnar JSON, CSV, MessagePack when '
+            'installed) and report payload size and median encode time, raw and after gzip/brotli compression.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--hotels', type=int, default=100)
+        parser.add_argument('--rooms-per-hotel', type=int, default=20)
+        parser.add_argument('--reservations', type=int, default=50000)
+        parser.add_argument('--repeat', type=int, default=5)
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--output', help='Write the JSON report to this file.')
+
+    def handle(self, *args, **options):
+        encodings = [name for name in middleware.STREAMS if name == 'gzip' or middleware.brotli is not None]
+        report = {'benchmark': 'renderers', 'settings': {key: options[key] for key in (
+            'hotels', 'rooms_per_hotel', 'reservations', 'repeat')}, 'encodings': encodings, 'renderers': {}}
+        with bench.scratch_database():
+            rng = bench.make_rng(options['seed'])
+            users = bench.seed_users(10, rng)
+            _, rooms = bench.seed_catalog(options['hotels'], options['rooms_per_hotel'], rng)
+            bench.seed_reservations(bench.iter_stays(rooms, users, rng), options['reservations'])
+            # Вимірюємо лише кодування: рядки серіалізовано один раз, як їх отримує рендерер у view
+            fast = values_serializer(ReservationSerializer)
+            data = fast.data(fast.queryset(Reservation.objects.all()))
+
+        baseline = None
+        for name, renderer_class in RENDERERS:
+            renderer = renderer_class()
+            encode_ms, content = median_ms(lambda: renderer.render(data), options['repeat'])
+            baseline = baseline or len(content)
+            result = {'bytes': len(content), 'vs_json': len(content) / baseline, 'encode_ms': encode_ms}
+            for encoding in encodings:
+                compress_ms, compressed = median_ms(lambda: middleware.compress_body(content, encoding),
+                                                    options['repeat'])
+                result[encoding] = {'bytes': len(compressed), 'vs_json': len(compressed) / baseline,
+                                    'compress_ms': compress_ms}
+            report['renderers'][name] = result
+            self.stderr.write('%-9s %10d bytes (%3.0f%%) %8.1fms  %s' % (
+                name, len(content), 100.0 * len(content) / baseline, encode_ms, '  '.join(
+                    '%s %d bytes %.1fms' % (encoding, result[encoding]['bytes'], result[encoding]['compress_ms'])
+                    for encoding in encodings)))
+
+        bench.write_report(report, options['output'], self.stdout)
@@ -0,0 +1,68 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.renderers import JSONRenderer
+
+from BookingApp import bench
+from BookingApp.models import Hotel, Room, Reservation
+from BookingApp.serializers import HotelSerializer, RoomSerializer, ReservationSerializer, values_serializer
+
+LISTS = {
+    'hotels': (Hotel, HotelSerializer),
+    'rooms': (Room, RoomSerializer),
+    'reservations': (Reservation, ReservationSerializer),
+}
+
+
+def model_serializer_list(model, serializer_class):
+    return JSONRenderer().render(serializer_class(model.objects.all(), many=True).data)
+
+
+def values_list_serializer(model, serializer_class):
+    fast = values_serializer(serializer_class)
+    return JSONRenderer().render(fast.data(fast.queryset(model.objects.all())))
+
+
+class Command(BaseCommand):
+    help = ('Compare rows/sec of list serialization through ModelSerializer and through ValuesListSerializer '
+            '(query + serialization + JSON rendering) on a scratch database.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--hotels', type=int, default=200)
+        parser.add_argument('--rooms-per-hotel', type=int, default=50)
+        parser.add_argument('--reservations', type=int, default=50000)
+        parser.add_argument('--repeat', type=int, default=5)
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--output', help='Write the JSON report to this file.')
+
+    def handle(self, *args, **options):
+        report = {'benchmark': 'serializers', 'lists': {}}
+        with bench.scratch_database():
+            rng = bench.make_rng(options['seed'])
+            users = bench.seed_users(10, rng)
+            hotels, rooms = bench.seed_catalog(options['hotels'], options['rooms_per_hotel'], rng)
+            bench.seed_reservations(bench.iter_stays(rooms, users, rng), options['reservations'])
+
+            for name, (model, serializer_class) in LISTS.items():
+                rows = model.objects.count()
+                result = {'rows': rows}
+                outputs = set()
+                for label, serialize in [('model_serializer', model_serializer_list),
+                                         ('values_list', values_list_serializer)]:
+                    best = None
+                    for _ in range(options['repeat']):
+                        start = time.perf_counter()
+                        content = serialize(model, serializer_class)
+                        elapsed = time.perf_counter() - start
+                        best = elapsed if best is None else min(best, elapsed)
+                    outputs.add(content)
+                    result[label + '_rows_per_sec'] = rows / best
+                if len(outputs) != 1:
+                    raise CommandError('%s: values_list output differs from ModelSerializer output' % name)
+                result['speedup'] = result['values_list_rows_per_sec'] / result['model_serializer_rows_per_sec']
+                report['lists'][name] = result
+                self.stderr.write('%-12s %7d rows: %9.0f -> %9.0f rows/s (x%.1f)' % (
+                    name, rows, result['model_serializer_rows_per_sec'], result['values_list_rows_per_sec'],
+                    result['speedup']))
+
+        bench.write_report(report, options['output'], self.stdout)
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from BookingApp.idempotency import evict_keys
+
+
+class Command(BaseCommand):
+    help = 'Delete expired Idempotency-Key records in batches.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        removed = evict_keys(options['batch_size'])
+        self.stdout.write(self.style.SUCCESS('Evicted %d expired idempotency keys.' % removed))
@@ -0,0 +1,22 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from BookingApp.services import expire_holds
+
+
+class Command(BaseCommand):
+    help = ('Delete expired room holds in batches. Expired holds already stop blocking availability; '
+            'this only keeps the table small. Use --interval to keep sweeping.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--interval', type=float, help='Sweep again every N seconds until interrupted.')
+
+    def handle(self, *args, **options):
+        while True:
+            removed = expire_holds(options['batch_size'])
+            self.stdout.write(self.style.SUCCESS('Removed %d expired holds.' % removed))
+            if not options['interval']:
+                break
+            time.sleep(options['interval'])
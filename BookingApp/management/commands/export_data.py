@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+
+from BookingApp.transfer import FORMATS, SPECS, export_rows, write_rows
+
+
+class Command(BaseCommand):
+    help = 'Stream hotels, rooms or reservations to CSV or JSON lines without loading the table into memory.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('kind', choices=sorted(SPECS))
+        parser.add_argument('path', nargs='?', default='-', help="Output file, '-' for stdout (default).")
+        parser.add_argument('--format', choices=FORMATS, help='Defaults to the file extension, jsonl for stdout.')
+        parser.add_argument('--batch-size', type=int, default=2000)
+
+    def handle(self, *args, **options):
+        fmt = options['format'] or ('csv' if options['path'].endswith('.csv') else 'jsonl')
+        rows = export_rows(options['kind'], options['batch_size'])
+        fields = SPECS[options['kind']]['fields']
+
+        if options['path'] == '-':
+            count = write_rows(self.stdout, fmt, fields, rows)
+        else:
+            with open(options['path'], 'w', newline='', encoding='utf-8') as stream:
+                count = write_rows(stream, fmt, fields, rows)
+            self.stderr.write('Exported %d %s to %s' % (count, options['kind'], options['path']))
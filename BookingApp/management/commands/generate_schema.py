@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from BookingApp.schema import read_stored_schema, schema_path, write_schema
+
+
+class Command(BaseCommand):
+    help = 'Generate the OpenAPI schema once (build/deploy time) so /swagger.json and /redoc/ serve it from disk.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output', help='Schema file, defaults to settings.BOOKING_SCHEMA_PATH.')
+        parser.add_argument('--check', action='store_true',
+                            help='Do not write anything, fail if the stored schema is missing or out of date.')
+
+    def handle(self, *args, **options):
+        if options['check']:
+            if read_stored_schema() is None:
+                raise CommandError('OpenAPI schema %s is missing or out of date.' % schema_path())
+            self.stdout.write(self.style.SUCCESS('OpenAPI schema is up to date.'))
+            return
+        path, content = write_schema(options['output'])
+        self.stdout.write(self.style.SUCCESS('Wrote %d bytes to %s' % (len(content), path)))
@@ -0,0 +1,37 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from BookingApp.transfer import FORMATS, SPECS, import_rows, read_rows
+
+
+class Command(BaseCommand):
+    help = 'Bulk import hotels, rooms or reservations from CSV or JSON lines in chunked transactions.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('kind', choices=sorted(SPECS))
+        parser.add_argument('path', help="Input file, '-' for stdin.")
+        parser.add_argument('--format', choices=FORMATS, help='Defaults to the file extension.')
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        fmt = options['format'] or ('csv' if options['path'].endswith('.csv') else 'jsonl')
+
+        def progress(imported, skipped):
+            self.stderr.write('%s: %d imported, %d skipped' % (options['kind'], imported, skipped))
+
+        stream = sys.stdin if options['path'] == '-' else open(options['path'], newline='', encoding='utf-8')
+        try:
+            imported, errors = import_rows(options['kind'], read_rows(stream, fmt), options['batch_size'],
+                                           progress if options['verbosity'] > 0 else None)
+        except (ValueError, KeyError) as exc:
+            raise CommandError('Cannot read %s: %s' % (options['path'], exc))
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+
+        for error in errors[:50]:
+            self.stderr.write('row %(row)d: %(error)s' % error)
+        if len(errors) > 50:
+            self.stderr.write('... and %d more errors' % (len(errors) - 50))
+        self.stdout.write(self.style.SUCCESS('Imported %d %s, skipped %d rows.' % (imported, options['kind'], len(errors))))
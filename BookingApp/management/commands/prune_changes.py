@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from BookingApp.changes import KEEP_DAYS, prune_changes
+
+
+class Command(BaseCommand):
+    help = 'Delete change log entries older than BOOKING_CHANGES["KEEP_DAYS"] days (clients with older cursors must resync).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=KEEP_DAYS)
+        parser.add_argument('--batch-size', type=int, default=5000)
+
+    def handle(self, *args, **options):
+        removed = prune_changes(options['days'], options['batch_size'])
+        self.stdout.write(self.style.SUCCESS('Pruned %d change log entries.' % removed))
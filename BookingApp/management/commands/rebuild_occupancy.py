@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from BookingApp.occupancy import rebuild_room_nights
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the per-room nightly occupancy calendar and the daily rollups from reservations.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=2000)
+
+    def handle(self, *args, **options):
+        def progress(done):
+            if options['verbosity'] > 1:
+                self.stderr.write('%d reservations processed' % done)
+
+        total = rebuild_room_nights(batch_size=options['batch_size'], progress=progress)
+        self.stdout.write(self.style.SUCCESS('Occupancy calendar rebuilt from %d reservations.' % total))
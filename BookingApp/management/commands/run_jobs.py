@@ -0,0 +1,74 @@
+import os
+import signal
+import socket
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import OperationalError, close_old_connections
+
+from BookingApp.jobs import JOB_SETTINGS, VISIBILITY_TIMEOUT, claim_job, prune_jobs, run_job
+from BookingApp.services import is_lock_error
+
+PRUNE_INTERVAL = 3600
+
+
+class Command(BaseCommand):
+    help = ('Run a background job worker for the DB-backed queue (BookingApp.jobs). Start several processes to run '
+            'jobs concurrently; a job whose worker dies is picked up again after --visibility-timeout seconds.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--worker-id', default='%s:%d' % (socket.gethostname(), os.getpid()))
+        parser.add_argument('--poll-interval', type=float, default=JOB_SETTINGS.get('POLL_INTERVAL', 1),
+                            help='Seconds to sleep when the queue is empty.')
+        parser.add_argument('--visibility-timeout', type=int, default=VISIBILITY_TIMEOUT)
+        parser.add_argument('--once', action='store_true', help='Exit when no job is ready instead of polling.')
+        parser.add_argument('--max-jobs', type=int, help='Exit after running this many jobs.')
+
+    def handle(self, *args, **options):
+        stopping = []
+
+        def stop(signum, frame):
+            # поточну задачу доробляємо, нову не беремо
+            stopping.append(signum)
+
+        previous = {signum: signal.signal(signum, stop) for signum in (signal.SIGTERM, signal.SIGINT)}
+        try:
+            done, failed = self.work(options, stopping)
+        finally:
+            for signum, handler in previous.items():
+                signal.signal(signum, handler)
+        self.stdout.write(self.style.SUCCESS('Worker %s ran %d jobs, %d failed.' % (options['worker_id'], done, failed)))
+
+    def work(self, options, stopping):
+        worker_id = options['worker_id']
+        done = failed = 0
+        pruned_at = 0
+        while not stopping and (options['max_jobs'] is None or done + failed < options['max_jobs']):
+            try:
+                job = claim_job(worker_id, options['visibility_timeout'])
+            except OperationalError as exc:
+                # інший воркер саме пише в SQLite — спробуємо пізніше
+                if not is_lock_error(exc):
+                    raise
+                job = None
+            if job is None:
+                if options['once']:
+                    break
+                if time.monotonic() - pruned_at > PRUNE_INTERVAL:
+                    prune_jobs()
+                    pruned_at = time.monotonic()
+                # простій: закриваємо з'єднання, що пережили CONN_MAX_AGE або зламались
+                close_old_connections()
+                time.sleep(options['poll_interval'])
+                continue
+
+            start = time.perf_counter()
+            ok = run_job(job)
+            if ok:
+                done += 1
+            else:
+                failed += 1
+            if options['verbosity'] > 1:
+                self.stderr.write('%s job %d (%s) %s in %.2fs' % (
+                    worker_id, job.pk, job.name, 'done' if ok else 'failed', time.perf_counter() - start))
+        return done, failed
@@ -0,0 +1,40 @@
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from BookingApp import bench
+
+
+class Command(BaseCommand):
+    help = 'Seed the database with synthetic hotels, rooms, users and non-overlapping reservations (reproducible).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--hotels', type=int, default=100)
+        parser.add_argument('--rooms-per-hotel', type=int, default=20)
+        parser.add_argument('--users', type=int, default=1000)
+        parser.add_argument('--reservations', type=int, default=100000)
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--batch-size', type=int, default=5000)
+
+    def handle(self, *args, **options):
+        prefix = 'seed-%d' % options['seed']
+        if User.objects.filter(username__startswith=prefix + '-').exists():
+            raise CommandError('Data for --seed %d already exists, use another seed.' % options['seed'])
+        if options['users'] < 1 or options['hotels'] < 1 or options['rooms_per_hotel'] < 1:
+            raise CommandError('--users, --hotels and --rooms-per-hotel must be positive.')
+
+        rng = bench.make_rng(options['seed'])
+
+        def progress(done):
+            self.stderr.write('reservations: %d/%d' % (done, options['reservations']))
+
+        with transaction.atomic():
+            users = bench.seed_users(options['users'], rng, options['batch_size'], prefix=prefix)
+            hotels, rooms = bench.seed_catalog(options['hotels'], options['rooms_per_hotel'], rng, options['batch_size'])
+            stays = bench.iter_stays(rooms, users, rng)
+            bench.seed_reservations(stays, options['reservations'], options['batch_size'], with_nights=True,
+                                    progress=progress if options['verbosity'] > 1 else None)
+
+        self.stdout.write(self.style.SUCCESS(
+            'Seeded %d hotels, %d rooms, %d users and %d reservations (password "%s").' % (
+                len(hotels), len(rooms), len(users), options['reservations'], bench.BENCH_PASSWORD)))
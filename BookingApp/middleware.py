@@ -0,0 +1,322 @@
+import threading
+import time
+import zlib
+from collections import deque
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.utils.cache import patch_vary_headers
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+TIMING_SETTINGS = getattr(settings, 'BOOKING_SERVER_TIMING', {})
+COMPRESSION_SETTINGS = getattr(settings, 'BOOKING_COMPRESSION', {})
+# Без text/html: сторінки browsable API і адмінки містять CSRF-токен поруч з даними з запиту, і стиснення
+# без захисту від BREACH (випадкового доповнення, як у django GZipMiddleware) дозволило б його підбирати
+COMPRESSIBLE_TYPES = ('application/json', 'application/vnd.booking.columnar+json', 'application/msgpack',
+                      'text/csv', 'text/plain', 'text/css', 'application/javascript')
+METRICS = ('total', 'view', 'db', 'render', 'queries')
+
+# Лічильники поточного запиту. ContextVar, а не execute_wrapper на час запиту: під ASGI запити ORM
+# виконуються в іншому потоці (sync_to_async) з іншим з'єднанням, а контекст туди копіюється.
+current_timings = ContextVar('current_timings', default=None)
+
+
+class RequestTimings:
+    def __init__(self):
+        self.queries = 0
+        self.db = 0.0
+        self.view_start = None
+        self.view = 0.0
+        self.render = 0.0
+
+    def query(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db += time.perf_counter() - start
+            self.queries += 1
+
+    def end_view(self):
+        if self.view_start is not None:
+            self.view = time.perf_counter() - self.view_start
+            self.view_start = None
+
+
+def timed_execute(execute, sql, params, many, context):
+    timings = current_timings.get()
+    if timings is None:
+        return execute(sql, params, many, context)
+    return timings.query(execute, sql, params, many, context)
+
+
+def install_query_timer(connection):
+    # Викликається на connection_created; першим у списку, щоб не заважати execute_wrapper(), що знімають свій останнім
+    if TIMING_SETTINGS.get('ENABLED', True) and timed_execute not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, timed_execute)
+
+
+class EndpointStats:
+    # Ковзні вікна останніх WINDOW значень кожної метрики для кожного ендпоінту
+    def __init__(self, window=1000):
+        self.window = window
+        self.lock = threading.Lock()
+        self.endpoints = {}
+
+    def add(self, endpoint, values):
+        with self.lock:
+            series = self.endpoints.get(endpoint)
+            if series is None:
+                series = self.endpoints[endpoint] = {name: deque(maxlen=self.window) for name in METRICS}
+                series['count'] = 0
+            series['count'] += 1
+            for name in METRICS:
+                series[name].append(values[name])
+
+    def snapshot(self):
+        with self.lock:
+            copied = {endpoint: {name: list(values) if name != 'count' else values for name, values in series.items()}
+                      for endpoint, series in self.endpoints.items()}
+        return {endpoint: summarize(series) for endpoint, series in sorted(copied.items())}
+
+    def clear(self):
+        with self.lock:
+            self.endpoints.clear()
+
+
+def percentile(ordered, point):
+    return ordered[min(len(ordered) - 1, int(len(ordered) * point / 100))]
+
+
+def summarize(series):
+    result = {'count': series['count'], 'window': len(series['total'])}
+    for name in METRICS:
+        ordered = sorted(series[name])
+        result[name] = {
+            'mean': sum(ordered) / len(ordered),
+            'p50': percentile(ordered, 50),
+            'p95': percentile(ordered, 95),
+            'p99': percentile(ordered, 99),
+            'max': ordered[-1],
+        }
+    return result
+
+
+stats = EndpointStats(TIMING_SETTINGS.get('WINDOW', 1000))
+
+
+def endpoint_name(request):
+    # HotelListView.GET, register_user.POST ... (@api_view дає класу ім'я функції); 404 без маршруту — 'unresolved'
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return 'unresolved'
+    view = getattr(match.func, 'view_class', None)
+    return '%s.%s' % (view.__name__ if view is not None else match.func.__name__, request.method)
+
+
+def ms(seconds):
+    return seconds * 1000
+
+
+class ServerTimingMiddleware:
+    # Час запиту по частинах у заголовку Server-Timing (мс) і в статистиці /stats/timings/.
+    # view — від process_view до відповіді, включно з db; render — серіалізація Response в байти.
+    # Вимкнено (BOOKING_SERVER_TIMING['ENABLED'] = False) — Django викидає middleware з ланцюжка.
+    # Працює і під ASGI без переходу в потік, тож не заважає async-в'юхам.
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not TIMING_SETTINGS.get('ENABLED', True):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+            self.process_view = self.aprocess_view
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        timings, start, token = self.start(request)
+        try:
+            response = self.get_response(request)
+        finally:
+            current_timings.reset(token)
+        return self.finish(request, response, timings, start)
+
+    async def __acall__(self, request):
+        timings, start, token = self.start(request)
+        try:
+            response = await self.get_response(request)
+        finally:
+            current_timings.reset(token)
+        return self.finish(request, response, timings, start)
+
+    def start(self, request):
+        timings = request._server_timings = RequestTimings()
+        return timings, time.perf_counter(), current_timings.set(timings)
+
+    def finish(self, request, response, timings, start):
+        # Для стрімінгових відповідей тіло (і його запити) генерується вже після цього місця й не враховується
+        timings.end_view()
+        total = time.perf_counter() - start
+
+        if TIMING_SETTINGS.get('HEADER', True):
+            response['Server-Timing'] = ', '.join([
+                'db;dur=%.2f;desc="%d queries"' % (ms(timings.db), timings.queries),
+                'view;dur=%.2f' % ms(timings.view),
+                'render;dur=%.2f' % ms(timings.render),
+                'total;dur=%.2f' % ms(total),
+            ])
+        stats.add(endpoint_name(request), {
+            'total': ms(total), 'view': ms(timings.view), 'db': ms(timings.db),
+            'render': ms(timings.render), 'queries': timings.queries,
+        })
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request._server_timings.view_start = time.perf_counter()
+
+    async def aprocess_view(self, request, view_func, view_args, view_kwargs):
+        request._server_timings.view_start = time.perf_counter()
+
+    def process_template_response(self, request, response):
+        # Рендеримо тут, а не в обробнику Django, щоб виміряти час саме рендерингу
+        timings = request._server_timings
+        timings.end_view()
+        start = time.perf_counter()
+        response.render()
+        timings.render = time.perf_counter() - start
+        return response
+
+
+def accepted_encodings(header):
+    # Accept-Encoding: "gzip, br;q=0.8, identity;q=0" -> {'gzip', 'br'} (кодування з q=0 відкинуто)
+    encodings = set()
+    for part in header.split(','):
+        name, _, params = part.strip().partition(';')
+        if params.strip().replace(' ', '') in ('q=0', 'q=0.0', 'q=0.00', 'q=0.000'):
+            continue
+        encodings.add(name.strip().lower())
+    return encodings
+
+
+def choose_encoding(request):
+    accepted = accepted_encodings(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+    if brotli is not None and 'br' in accepted:
+        return 'br'
+    if 'gzip' in accepted:
+        return 'gzip'
+    return None
+
+
+class GzipStream:
+    def __init__(self):
+        # wbits=31 — формат gzip (заголовок і CRC), а не сирий zlib
+        self.compressor = zlib.compressobj(COMPRESSION_SETTINGS.get('GZIP_LEVEL', 6), zlib.DEFLATED, 31)
+
+    def process(self, data, flush=True):
+        # flush після кожної частини потоку: клієнт отримує дані одразу, а не коли назбирається блок
+        return self.compressor.compress(data) + (self.compressor.flush(zlib.Z_SYNC_FLUSH) if flush else b'')
+
+    def finish(self):
+        return self.compressor.flush()
+
+
+class BrotliStream:
+    def __init__(self):
+        self.compressor = brotli.Compressor(quality=COMPRESSION_SETTINGS.get('BROTLI_QUALITY', 5))
+
+    def process(self, data, flush=True):
+        return self.compressor.process(data) + (self.compressor.flush() if flush else b'')
+
+    def finish(self):
+        return self.compressor.finish()
+
+
+STREAMS = {'gzip': GzipStream, 'br': BrotliStream}
+
+
+def compress_body(content, encoding):
+    stream = STREAMS[encoding]()
+    return stream.process(content, flush=False) + stream.finish()
+
+
+def compress_sequence(chunks, encoding):
+    stream = STREAMS[encoding]()
+    for chunk in chunks:
+        data = stream.process(chunk)
+        if data:
+            yield data
+    yield stream.finish()
+
+
+async def acompress_sequence(chunks, encoding):
+    stream = STREAMS[encoding]()
+    async for chunk in chunks:
+        data = stream.process(chunk)
+        if data:
+            yield data
+    yield stream.finish()
+
+
+class CompressionMiddleware:
+    # brotli (якщо встановлено пакет brotli і клієнт його приймає) або gzip для текстових, JSON, CSV і msgpack
+    # відповідей від MIN_SIZE байт: менші не варті процесора, заголовки gzip їх навіть збільшують.
+    # Потокові відповіді стискаються частинами (без буферизації всього тіла); SSE (text/event-stream) — ні.
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not COMPRESSION_SETTINGS.get('ENABLED', True):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        return self.compress(request, self.get_response(request))
+
+    async def __acall__(self, request):
+        return self.compress(request, await self.get_response(request))
+
+    def compress(self, request, response):
+        content_type = response.get('Content-Type', '').split(';')[0].strip().lower()
+        if response.has_header('Content-Encoding') or content_type not in COMPRESSIBLE_TYPES:
+            return response
+        patch_vary_headers(response, ['Accept-Encoding'])
+        encoding = choose_encoding(request)
+        if encoding is None:
+            return response
+
+        if response.streaming:
+            if response.is_async:
+                response.streaming_content = acompress_sequence(response.streaming_content, encoding)
+            else:
+                response.streaming_content = compress_sequence(response.streaming_content, encoding)
+            del response['Content-Length']
+        else:
+            if len(response.content) < COMPRESSION_SETTINGS.get('MIN_SIZE', 1024):
+                return response
+            compressed = compress_body(response.content, encoding)
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response['Content-Length'] = str(len(compressed))
+
+        # інше кодування — інші байти: ETag стає слабким (як у django GZipMiddleware)
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response['ETag'] = 'W/' + etag
+        response['Content-Encoding'] = encoding
+        return response
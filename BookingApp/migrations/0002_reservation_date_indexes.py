@@ -0,0 +1,23 @@
+# Generated by Django 5.0 on 2026-10-18 03:08
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('BookingApp', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='reservation',
+            index=models.Index(fields=['room', 'check_in_date', 'check_out_date'], name='reservation_room_dates_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='reservation',
+            index=models.Index(fields=['hotel', 'check_in_date', 'check_out_date'], name='reservation_hotel_dates_idx'),
+        ),
+    ]
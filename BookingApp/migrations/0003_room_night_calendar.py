@@ -0,0 +1,47 @@
+# Generated by Django 5.0 on 2026-10-18 03:10
+
+from datetime import timedelta
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def backfill(apps, schema_editor):
+    # Ночі для вже наявних бронювань; далі календар веде post_save (і rebuild_occupancy)
+    Reservation = apps.get_model('BookingApp', 'Reservation')
+    RoomNight = apps.get_model('BookingApp', 'RoomNight')
+    rows = Reservation.objects.order_by('pk').values_list(
+        'pk', 'hotel_id', 'room_id', 'check_in_date', 'check_out_date').iterator(chunk_size=2000)
+    batch = []
+    for pk, hotel_id, room_id, night, check_out in rows:
+        while night < check_out:
+            batch.append(RoomNight(reservation_id=pk, hotel_id=hotel_id, room_id=room_id, date=night))
+            night += timedelta(days=1)
+        if len(batch) >= 5000:
+            RoomNight.objects.bulk_create(batch)
+            batch = []
+    RoomNight.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('BookingApp', '0002_reservation_date_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RoomNight',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('hotel', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='BookingApp.hotel')),
+                ('reservation', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='nights', to='BookingApp.reservation')),
+                ('room', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='BookingApp.room')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['hotel', 'date', 'room'], name='roomnight_hotel_date_idx'), models.Index(fields=['room', 'date'], name='roomnight_room_date_idx')],
+            },
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
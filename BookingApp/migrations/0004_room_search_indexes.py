@@ -0,0 +1,25 @@
+# Generated by Django 5.0 on 2026-10-18 03:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('BookingApp', '0003_room_night_calendar'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='room',
+            index=models.Index(fields=['hotel', 'room_type', 'price_per_night'], name='room_hotel_type_price_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='room',
+            index=models.Index(fields=['room_type', 'price_per_night'], name='room_type_price_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='room',
+            index=models.Index(fields=['price_per_night'], name='room_price_idx'),
+        ),
+    ]
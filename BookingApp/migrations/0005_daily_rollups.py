@@ -0,0 +1,44 @@
+# Generated by Django 5.0 on 2026-10-18 03:33
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, Sum
+
+
+def backfill(apps, schema_editor):
+    # Зведення з календаря RoomNight (його заповнила 0003) — як backfill_rollups
+    RoomNight = apps.get_model('BookingApp', 'RoomNight')
+    DailyRollup = apps.get_model('BookingApp', 'DailyRollup')
+    grouped = RoomNight.objects.order_by().values('hotel_id', 'room__room_type', 'date').annotate(
+        occupied=Count('pk'), total=Sum('room__price_per_night'),
+    ).values_list('hotel_id', 'room__room_type', 'date', 'occupied', 'total')
+    DailyRollup.objects.bulk_create([
+        DailyRollup(hotel_id=hotel_id, room_type=room_type, date=night, occupied_rooms=occupied, revenue=revenue)
+        for hotel_id, room_type, night, occupied, revenue in grouped.iterator(chunk_size=5000)
+    ], batch_size=5000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('BookingApp', '0004_room_search_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('room_type', models.CharField(max_length=50)),
+                ('date', models.DateField()),
+                ('occupied_rooms', models.IntegerField(default=0)),
+                ('revenue', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('hotel', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='BookingApp.hotel')),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='dailyrollup',
+            constraint=models.UniqueConstraint(fields=('hotel', 'date', 'room_type'), name='dailyrollup_hotel_date_type_uniq'),
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
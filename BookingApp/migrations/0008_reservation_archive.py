@@ -0,0 +1,31 @@
+# Generated by Django 5.0 on 2026-10-18 03:50
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('BookingApp', '0007_tombstones'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedReservation',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('check_in_date', models.DateField()),
+                ('check_out_date', models.DateField()),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+                ('client', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+                ('hotel', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='BookingApp.hotel')),
+                ('room', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='BookingApp.room')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['check_out_date', 'check_in_date'], name='archived_res_dates_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.0 on 2026-10-18 03:54
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('BookingApp', '0008_reservation_archive'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RoomHold',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('check_in_date', models.DateField()),
+                ('check_out_date', models.DateField()),
+                ('expires_at', models.DateTimeField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('client', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+                ('hotel', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='BookingApp.hotel')),
+                ('room', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='BookingApp.room')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['room', 'check_in_date', 'check_out_date'], name='roomhold_room_dates_idx'), models.Index(fields=['expires_at'], name='roomhold_expires_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 5.0 on 2026-10-18 03:59
+
+from itertools import islice
+
+from django.db import migrations, models
+
+
+def backfill(apps, schema_editor):
+    # Наявні рядки — як upsert, щоб since=0 давав повну синхронізацію
+    ChangeLog = apps.get_model('BookingApp', 'ChangeLog')
+    for resource, model, live in (('hotels', 'Hotel', True), ('rooms', 'Room', True), ('reservations', 'Reservation', False)):
+        queryset = apps.get_model('BookingApp', model).objects.order_by('pk')
+        if live:
+            queryset = queryset.filter(deleted_at__isnull=True)
+        pks = queryset.values_list('pk', flat=True).iterator(chunk_size=5000)
+        while batch := list(islice(pks, 5000)):
+            ChangeLog.objects.bulk_create([ChangeLog(resource=resource, object_id=pk, action='upsert') for pk in batch])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('BookingApp', '0010_idempotency_keys'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ChangeLog',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('resource', models.CharField(max_length=20)),
+                ('object_id', models.BigIntegerField()),
+                ('action', models.CharField(choices=[('upsert', 'Created or updated'), ('delete', 'Deleted')], max_length=10)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['created_at'], name='changelog_created_idx')],
+            },
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.0 on 2026-10-18 04:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('BookingApp', '0011_change_log'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EventMessage',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('topics', models.JSONField()),
+                ('event', models.JSONField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['created_at'], name='eventmessage_created_idx')],
+            },
+        ),
+    ]
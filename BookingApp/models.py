@@ -1,16 +1,122 @@
 from django.db import models
+from django.db.models import Avg, Case, Count, Exists, IntegerField, Max, Min, OuterRef, Prefetch, Q, Subquery, Value, When
+from django.db.models.functions import Coalesce
 from django.contrib.auth.models import AbstractBaseUser, BaseUserManager
 from django.contrib.auth.models import User
+from django.conf import settings
+from django.utils import timezone
+
+# Межі цінових діапазонів для фасетів пошуку кімнат
+PRICE_BUCKETS = getattr(settings, 'BOOKING_PRICE_BUCKETS', [50, 100, 150, 200, 300])
+
+
+def price_bucket(bounds):
+    # Номер цінового діапазону: 0 — дешевше bounds[0], i — [bounds[i-1], bounds[i]), len(bounds) — від останньої межі
+    whens = [When(price_per_night__lt=bound, then=Value(index)) for index, bound in enumerate(bounds)]
+    return Case(*whens, default=Value(len(bounds)), output_field=IntegerField())
+
+
+class RoomQuerySet(models.QuerySet):
+    def matching(self, hotel=None, room_type=None, min_price=None, max_price=None):
+        rooms = self
+        if hotel is not None:
+            rooms = rooms.filter(hotel_id=hotel)
+        if room_type is not None:
+            rooms = rooms.filter(room_type=room_type)
+        if min_price is not None:
+            rooms = rooms.filter(price_per_night__gte=min_price)
+        if max_price is not None:
+            rooms = rooms.filter(price_per_night__lte=max_price)
+        return rooms
+
+    def facet_counts(self, bounds):
+        # Один GROUP BY (room_type, ціновий діапазон); обидва фасети і загальна кількість складаються з цих рядків
+        return self.order_by().values('room_type', bucket=price_bucket(bounds)).annotate(count=Count('pk'))
+
+    def available(self, check_in_date, check_out_date):
+        # Кімнати без жодного бронювання і без активного утримання, що перетинається з [check_in_date, check_out_date)
+        busy = Reservation.objects.filter(room=OuterRef('pk')).overlapping(check_in_date, check_out_date)
+        held = RoomHold.objects.active().filter(room=OuterRef('pk')).overlapping(check_in_date, check_out_date)
+        return self.filter(~Exists(busy), ~Exists(held))
+
+    def with_occupancy(self, date):
+        # occupied — чи зайнята кімната в ніч date (по календарю RoomNight)
+        return self.annotate(occupied=Exists(RoomNight.objects.filter(room=OuterRef('pk'), date=date)))
+
+    def type_stats(self, date):
+        # Одна згрупована вибірка: кількість кімнат, зайняті в ніч date і ціни по кожному типу
+        return self.with_occupancy(date).order_by('room_type').values('room_type').annotate(
+            rooms=Count('pk'),
+            occupied_rooms=Count('pk', filter=Q(occupied=True)),
+            min_price=Min('price_per_night'),
+            max_price=Max('price_per_night'),
+            avg_price=Avg('price_per_night'),
+        )
+
+
+class HotelQuerySet(models.QuerySet):
+    def with_room_stats(self, date):
+        # JOIN кімнат іде повз менеджер Room, тож видалені (надгробки) відсіюємо явно
+        live = Q(room__deleted_at__isnull=True)
+        occupied = RoomNight.objects.filter(hotel=OuterRef('pk'), date=date, room__deleted_at__isnull=True)
+        occupied = occupied.order_by().values('hotel')
+        return self.annotate(
+            room_count=Count('room', filter=live),
+            min_price=Min('room__price_per_night', filter=live),
+            max_price=Max('room__price_per_night', filter=live),
+            avg_price=Avg('room__price_per_night', filter=live),
+            occupied_rooms=Coalesce(Subquery(occupied.annotate(count=Count('pk')).values('count'),
+                                             output_field=IntegerField()), 0),
+        )
+
+    def with_rooms(self, date):
+        return self.prefetch_related(
+            Prefetch('room_set', queryset=Room.objects.with_occupancy(date).order_by('pk'), to_attr='expanded_rooms'),
+        )
+
+
+class LiveManager(models.Manager):
+    # Менеджер за замовчуванням: видалені об'єкти (deleted_at) зникають з усіх читань і з валідації
+    # зовнішніх ключів у серіалізаторах; їх залежні рядки видаляє фонова задача (BookingApp.tasks)
+    def get_queryset(self):
+        return super().get_queryset().filter(deleted_at__isnull=True)
+
+
+class ReservationQuerySet(models.QuerySet):
+    def overlapping(self, check_in_date, check_out_date):
+        return self.filter(check_in_date__lt=check_out_date, check_out_date__gt=check_in_date)
+
+
+class RoomHoldQuerySet(ReservationQuerySet):
+    def active(self, now=None):
+        return self.filter(expires_at__gt=now or timezone.now())
+
 
 class Hotel(models.Model):
     name = models.CharField(max_length=255)
     address = models.TextField()
+    deleted_at = models.DateTimeField(null=True, blank=True)
+
+    objects = LiveManager.from_queryset(HotelQuerySet)()
+    all_objects = HotelQuerySet.as_manager()
 
 class Room(models.Model):
     hotel = models.ForeignKey(Hotel, on_delete=models.CASCADE)
     room_number = models.CharField(max_length=10)
     room_type = models.CharField(max_length=50)
     price_per_night = models.DecimalField(max_digits=8, decimal_places=2)
+    deleted_at = models.DateTimeField(null=True, blank=True)
+
+    objects = LiveManager.from_queryset(RoomQuerySet)()
+    all_objects = RoomQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # пошук кімнат: фільтр по готелю/типу і діапазон або сортування за ціною
+            models.Index(fields=['hotel', 'room_type', 'price_per_night'], name='room_hotel_type_price_idx'),
+            models.Index(fields=['room_type', 'price_per_night'], name='room_type_price_idx'),
+            models.Index(fields=['price_per_night'], name='room_price_idx'),
+        ]
 
 class Reservation(models.Model):
     hotel = models.ForeignKey(Hotel, on_delete=models.CASCADE)
@@ -18,3 +124,159 @@ class Reservation(models.Model):
     client = models.ForeignKey(User, on_delete=models.CASCADE)
     check_in_date = models.DateField()
     check_out_date = models.DateField()
+
+    objects = ReservationQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # пошук вільних кімнат: перетин дат у межах однієї кімнати
+            models.Index(fields=['room', 'check_in_date', 'check_out_date'], name='reservation_room_dates_idx'),
+            models.Index(fields=['hotel', 'check_in_date', 'check_out_date'], name='reservation_hotel_dates_idx'),
+        ]
+
+
+class RoomHold(models.Model):
+    # Тимчасове утримання кімнати на час оформлення (оплати): поки не минув expires_at, кімната на ці дати
+    # зайнята для всіх, крім власника; підтвердження перетворює його на Reservation (services.confirm_hold)
+    hotel = models.ForeignKey(Hotel, on_delete=models.CASCADE)
+    room = models.ForeignKey(Room, on_delete=models.CASCADE)
+    client = models.ForeignKey(User, on_delete=models.CASCADE)
+    check_in_date = models.DateField()
+    check_out_date = models.DateField()
+    expires_at = models.DateTimeField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    objects = RoomHoldQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['room', 'check_in_date', 'check_out_date'], name='roomhold_room_dates_idx'),
+            models.Index(fields=['expires_at'], name='roomhold_expires_idx'),
+        ]
+
+
+class RoomNight(models.Model):
+    # Матеріалізований календар зайнятості: один рядок на кожну ніч бронювання
+    reservation = models.ForeignKey(Reservation, on_delete=models.CASCADE, related_name='nights')
+    hotel = models.ForeignKey(Hotel, on_delete=models.CASCADE)
+    room = models.ForeignKey(Room, on_delete=models.CASCADE)
+    date = models.DateField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['hotel', 'date', 'room'], name='roomnight_hotel_date_idx'),
+            models.Index(fields=['room', 'date'], name='roomnight_room_date_idx'),
+        ]
+
+
+class DailyRollup(models.Model):
+    # Зайнятість і виручка готелю по типу кімнат за ніч; оновлюється інкрементно разом з RoomNight (BookingApp.rollups)
+    hotel = models.ForeignKey(Hotel, on_delete=models.CASCADE)
+    room_type = models.CharField(max_length=50)
+    date = models.DateField()
+    occupied_rooms = models.IntegerField(default=0)
+    revenue = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['hotel', 'date', 'room_type'], name='dailyrollup_hotel_date_type_uniq'),
+        ]
+
+
+class ArchivedReservation(models.Model):
+    # Холодне сховище: бронювання, що виїхали раніше за горизонт архівації (BookingApp.archive).
+    # id — той самий, що був у Reservation; в основній таблиці та її індексах лишаються лише актуальні.
+    id = models.BigIntegerField(primary_key=True)
+    hotel = models.ForeignKey(Hotel, on_delete=models.CASCADE)
+    room = models.ForeignKey(Room, on_delete=models.CASCADE)
+    client = models.ForeignKey(User, on_delete=models.CASCADE)
+    check_in_date = models.DateField()
+    check_out_date = models.DateField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['check_out_date', 'check_in_date'], name='archived_res_dates_idx'),
+        ]
+
+
+class IdempotencyKey(models.Model):
+    # Перша відповідь на POST із заголовком Idempotency-Key (BookingApp.idempotency); повтори отримують її ж.
+    # status_code порожній — перший запит ще виконується.
+    scope = models.CharField(max_length=150)
+    key = models.CharField(max_length=255)
+    request_hash = models.CharField(max_length=64)
+    status_code = models.PositiveSmallIntegerField(null=True, blank=True)
+    response_body = models.TextField(blank=True)
+    created_at = models.DateTimeField()
+    expires_at = models.DateTimeField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['scope', 'key'], name='idempotencykey_scope_key_uniq'),
+        ]
+        indexes = [
+            models.Index(fields=['expires_at'], name='idempotencykey_expires_idx'),
+        ]
+
+
+class ChangeLog(models.Model):
+    # Журнал змін каталогу і бронювань для дельта-синхронізації (GET /changes/?since=<id>, BookingApp.changes).
+    # id монотонно зростає і є курсором клієнта; delete — і надгробки (deleted_at), і фізичні видалення.
+    UPSERT = 'upsert'
+    DELETE = 'delete'
+    ACTIONS = [(UPSERT, 'Created or updated'), (DELETE, 'Deleted')]
+
+    resource = models.CharField(max_length=20)
+    object_id = models.BigIntegerField()
+    action = models.CharField(max_length=10, choices=ACTIONS)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['created_at'], name='changelog_created_idx'),
+        ]
+
+
+class EventMessage(models.Model):
+    # Подія бронювання для SSE при BOOKING_EVENTS['BROKER'] = 'database' (BookingApp.events): кожен процес
+    # ASGI читає нові рядки за id і розсилає своїм підписникам; старші за KEEP_SECONDS видаляються
+    topics = models.JSONField()
+    event = models.JSONField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['created_at'], name='eventmessage_created_idx'),
+        ]
+
+
+class Job(models.Model):
+    # Фонова задача в черзі в БД (BookingApp.jobs); виконують воркери manage.py run_jobs
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    STATUSES = [(QUEUED, 'Queued'), (RUNNING, 'Running'), (DONE, 'Done'), (FAILED, 'Failed')]
+
+    name = models.CharField(max_length=100)
+    payload = models.JSONField(default=dict)
+    status = models.CharField(max_length=10, choices=STATUSES, default=QUEUED)
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=5)
+    run_after = models.DateTimeField()
+    # Воркер, що взяв задачу, і до якого часу вона за ним; після цього її може забрати інший
+    locked_by = models.CharField(max_length=100, blank=True)
+    locked_until = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+    # Хід виконання, який обробник записує між порціями (report_progress), і хто поставив задачу
+    progress = models.JSONField(default=dict)
+    owner = models.ForeignKey(User, null=True, blank=True, on_delete=models.SET_NULL, related_name='+')
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'run_after'], name='job_status_run_after_idx'),
+            models.Index(fields=['status', 'locked_until'], name='job_status_locked_until_idx'),
+        ]
@@ -0,0 +1,105 @@
+from contextvars import ContextVar
+from datetime import timedelta
+
+from django.db import transaction
+
+from .changes import record_changes
+from .events import publish_reservations
+from .models import ChangeLog, Reservation, Room, RoomNight
+from .rollups import rebuild_rollups, update_rollups
+
+# Пакетне видалення бронювань: pre_delete не чіпає зведення — delete_reservations уже зменшив їх одним
+# проходом на всю порцію, а архівація (BookingApp.archive) лишає їх як історію
+bulk_delete = ContextVar('bulk_delete', default=False)
+
+
+def stay_nights(check_in_date, check_out_date):
+    return [check_in_date + timedelta(days=i) for i in range((check_out_date - check_in_date).days)]
+
+
+def build_room_nights(reservations):
+    return [
+        RoomNight(reservation_id=reservation.pk, hotel_id=reservation.hotel_id, room_id=reservation.room_id, date=night)
+        for reservation in reservations
+        for night in stay_nights(reservation.check_in_date, reservation.check_out_date)
+    ]
+
+
+def night_keys(nights):
+    return {(night.hotel_id, night.room_id, night.date) for night in nights}
+
+
+def sync_reservation_nights(reservation):
+    # Після створення/зміни бронювання перезаписуємо лише його ночі; у зведення йде лише різниця.
+    # Повертає (hotel_id, room_id) попередніх ночей — кімнати, з яких бронювання могли перенести
+    with transaction.atomic():
+        existing = RoomNight.objects.filter(reservation_id=reservation.pk)
+        old = set(existing.values_list('hotel_id', 'room_id', 'date'))
+        existing.delete()
+        new = night_keys(RoomNight.objects.bulk_create(build_room_nights([reservation])))
+        update_rollups(added=new - old, removed=old - new)
+    return {(hotel_id, room_id) for hotel_id, room_id, _ in old}
+
+
+def remove_reservation_nights(reservation):
+    # Перед видаленням бронювання: ночі видалить каскад, а зведення зменшуємо тут
+    if bulk_delete.get():
+        return
+    nights = RoomNight.objects.filter(reservation_id=reservation.pk).values_list('hotel_id', 'room_id', 'date')
+    update_rollups(removed=list(nights))
+
+
+def add_reservations_nights(reservations):
+    nights = RoomNight.objects.bulk_create(build_room_nights(reservations), batch_size=5000)
+    update_rollups(added=[(night.hotel_id, night.room_id, night.date) for night in nights])
+
+
+def delete_reservations(reservations):
+    # Видалення порції бронювань без запиту до БД на кожне в pre_delete: спершу зведення по всіх їхніх ночах,
+    # далі звичайний каскадний delete() (ночі видаляються одним DELETE), один INSERT у журнал змін і події SSE
+    with transaction.atomic():
+        rows = list(reservations.values_list('pk', 'hotel_id', 'room_id', 'check_in_date', 'check_out_date'))
+        nights = RoomNight.objects.filter(reservation__in=reservations).values_list('hotel_id', 'room_id', 'date')
+        update_rollups(removed=list(nights))
+        token = bulk_delete.set(True)
+        try:
+            reservations.delete()
+        finally:
+            bulk_delete.reset(token)
+        record_changes('reservations', [row[0] for row in rows], ChangeLog.DELETE)
+        publish_reservations('deleted', rows)
+
+
+def rebuild_room_nights(batch_size=2000, progress=None):
+    # Календар пишемо напряму, без інкрементних зведень (інакше кожен запуск додавав би ночі до вже наявних),
+    # а зведення потім перераховуємо з нового календаря в тій же транзакції
+    total = 0
+    with transaction.atomic():
+        RoomNight.objects.all().delete()
+        batch = []
+        fields = ('pk', 'hotel_id', 'room_id', 'check_in_date', 'check_out_date')
+        for reservation in Reservation.objects.only(*fields).iterator(chunk_size=batch_size):
+            batch.append(reservation)
+            if len(batch) >= batch_size:
+                RoomNight.objects.bulk_create(build_room_nights(batch), batch_size=5000)
+                total += len(batch)
+                batch = []
+                if progress:
+                    progress(total)
+        RoomNight.objects.bulk_create(build_room_nights(batch), batch_size=5000)
+        total += len(batch)
+        rebuild_rollups()
+    return total
+
+
+def occupancy_calendar(hotel_id, start_date, days):
+    # Дві вибірки по індексах: кімнати готелю та зайняті ночі у вікні.
+    # Результат — рядок-бітмапа на кімнату: символ i == '1', якщо ніч start_date + i зайнята.
+    end_date = start_date + timedelta(days=days)
+    room_ids = Room.objects.filter(hotel_id=hotel_id).order_by('pk').values_list('pk', flat=True)
+    rooms = {room_id: bytearray(b'0' * days) for room_id in room_ids}
+    nights = RoomNight.objects.filter(hotel_id=hotel_id, date__gte=start_date, date__lt=end_date)
+    for room_id, night in nights.values_list('room_id', 'date'):
+        if room_id in rooms:
+            rooms[room_id][(night - start_date).days] = ord('1')
+    return {room_id: bitmap.decode() for room_id, bitmap in rooms.items()}
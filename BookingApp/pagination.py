@@ -0,0 +1,154 @@
+from django.conf import settings
+from django.http import StreamingHttpResponse
+from rest_framework.pagination import CursorPagination
+from rest_framework.response import Response
+from rest_framework.utils.encoders import JSONEncoder
+
+from .serializers import values_serializer
+
+STREAM_CHUNK_SIZE = 2000
+TRUE_VALUES = ('1', 'true', 'yes')
+
+
+class ListCursorPagination(CursorPagination):
+    # Keyset-пагінація по первинному ключу: стабільний порядок і без OFFSET
+    ordering = 'pk'
+    page_size = getattr(settings, 'BOOKING_PAGE_SIZE', 100)
+    page_size_query_param = 'page_size'
+    max_page_size = 1000
+
+
+class RoomSearchPagination(ListCursorPagination):
+    # Курсор по першому полю порядку (DRF додає зсув для однакових значень)
+    def __init__(self, ordering):
+        self.ordering = ordering
+
+
+class UnionQuery:
+    # UNION ALL кількох вибірок з однаковими колонками (бронювання + архів) для list_response:
+    # filter/values_list застосовуються до кожної частини, порядок і зрізи — до всього об'єднання.
+    # Цього досить для ValuesListSerializer, курсорної пагінації і стрімінгу.
+    ordered = True
+
+    def __init__(self, parts, ordering=('pk',)):
+        self.parts = [part.order_by() for part in parts]
+        self.ordering = ordering
+
+    def order_by(self, *ordering):
+        return UnionQuery(self.parts, ordering)
+
+    def filter(self, *args, **kwargs):
+        return UnionQuery([part.filter(*args, **kwargs) for part in self.parts], self.ordering)
+
+    def values_list(self, *fields, **kwargs):
+        return UnionQuery([part.values_list(*fields, **kwargs) for part in self.parts], self.ordering)
+
+    @property
+    def db(self):
+        return self.parts[0].db
+
+    def using(self, alias):
+        return UnionQuery([part.using(alias) for part in self.parts], self.ordering)
+
+    def combined(self):
+        first, *rest = self.parts
+        return first.union(*rest, all=True).order_by(*self.ordering)
+
+    def iterator(self, chunk_size=None):
+        return self.combined().iterator(chunk_size=chunk_size)
+
+    def __getitem__(self, key):
+        return self.combined()[key]
+
+    def __iter__(self):
+        return iter(self.combined())
+
+
+def wants_stream(request):
+    return request.query_params.get('stream', '').lower() in TRUE_VALUES
+
+
+def wants_page(request):
+    return 'cursor' in request.query_params or 'page_size' in request.query_params
+
+
+def json_chunk(encoder, serialize, chunk, first):
+    return ('' if first else ',') + encoder.encode(serialize(chunk))[1:-1]
+
+
+def iter_chunks(queryset, chunk_size=STREAM_CHUNK_SIZE):
+    chunk = []
+    for obj in queryset.iterator(chunk_size=chunk_size):
+        chunk.append(obj)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def iter_json_array(queryset, serialize, chunk_size=STREAM_CHUNK_SIZE):
+    # Віддаємо JSON-масив частинами, серіалізуючи по chunk_size рядків за раз
+    encoder = JSONEncoder(ensure_ascii=False, separators=(',', ':'))
+    yield '['
+    for index, chunk in enumerate(iter_chunks(queryset, chunk_size)):
+        yield json_chunk(encoder, serialize, chunk, index == 0)
+    yield ']'
+
+
+async def aiter_json_array(queryset, serialize, chunk_size=STREAM_CHUNK_SIZE):
+    # Те саме для async-в'юх: рядки читаються через aiterator, між порціями цикл подій вільний
+    encoder = JSONEncoder(ensure_ascii=False, separators=(',', ':'))
+    yield '['
+    chunk = []
+    first = True
+    async for obj in queryset.aiterator(chunk_size=chunk_size):
+        chunk.append(obj)
+        if len(chunk) >= chunk_size:
+            yield json_chunk(encoder, serialize, chunk, first)
+            first = False
+            chunk = []
+    if chunk:
+        yield json_chunk(encoder, serialize, chunk, first)
+    yield ']'
+
+
+def pin_database(queryset):
+    # Аліас БД фіксуємо зараз: рядки потоку читатимуться вже після виходу з в'юхи (і з replica_read)
+    return queryset.using(queryset.db)
+
+
+def stream_json(queryset, serialize):
+    return StreamingHttpResponse(iter_json_array(pin_database(queryset).order_by('pk'), serialize),
+                                 content_type='application/json')
+
+
+def stream_response(request, queryset, fast):
+    # Потік у форматі, обраному за Accept / ?format=: рендерер зі stream() (columnar, csv) віддає свій,
+    # stream = None (msgpack) — потоку немає, звичайні JSON-рендерери — JSON-масив
+    queryset = pin_database(queryset)
+    renderer = getattr(request, 'accepted_renderer', None)
+    if not hasattr(renderer, 'stream'):
+        return stream_json(queryset, fast.data)
+    if renderer.stream is None:
+        return None
+    content_type = renderer.media_type
+    if renderer.charset:
+        content_type += '; charset=%s' % renderer.charset
+    return StreamingHttpResponse(renderer.stream(queryset.order_by('pk'), fast), content_type=content_type)
+
+
+def list_response(request, queryset, serializer_class, view):
+    # ?stream=true — потоковий експорт; ?cursor / ?page_size — посторінково; інакше як раніше, весь список.
+    # Рядки читаються через values_list і серіалізуються без моделей (ValuesListSerializer)
+    fast = values_serializer(serializer_class)
+    queryset = fast.queryset(queryset)
+    if wants_stream(request):
+        response = stream_response(request, queryset, fast)
+        if response is not None:
+            return response
+    if wants_page(request):
+        paginator = ListCursorPagination()
+        page = paginator.paginate_queryset(queryset, request, view=view)
+        return paginator.get_paginated_response(fast.data(page))
+    return Response(fast.data(queryset))
@@ -0,0 +1,119 @@
+import csv
+import io
+
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.settings import api_settings
+from rest_framework.utils.encoders import JSONEncoder
+
+from .pagination import iter_chunks
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+# Компактні формати для списків (Accept або ?format=): ключі не повторюються в кожному рядку.
+# Вміст той самий, що й у JSON: ті ж рядки ValuesListSerializer, та ж пагінація.
+
+encoder = JSONEncoder(ensure_ascii=False, separators=(',', ':'))
+
+
+def is_rows(data):
+    return isinstance(data, list) and all(isinstance(row, dict) for row in data[:1])
+
+
+def list_rows(data):
+    # Рядки списку: сам список, results сторінки або один об'єкт (деталі, помилки) як один рядок
+    if isinstance(data, dict) and is_rows(data.get('results')):
+        return data['results']
+    if is_rows(data):
+        return data
+    return [data]
+
+
+def to_columns(rows):
+    # Рядки одного серіалізатора мають однаковий порядок ключів
+    columns = list(rows[0]) if rows else []
+    return {'columns': columns, 'rows': [list(row.values()) for row in rows]}
+
+
+class ColumnarJSONRenderer(JSONRenderer):
+    # {"columns": ["hotel", "room", ...], "rows": [[1, 2, ...], ...]}; у сторінки так виглядає results.
+    # Інші відповіді (деталі, помилки) — звичайний JSON
+    media_type = 'application/vnd.booking.columnar+json'
+    format = 'columnar'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if isinstance(data, dict) and is_rows(data.get('results')):
+            data = dict(data, results=to_columns(data['results']))
+        elif is_rows(data):
+            data = to_columns(data)
+        return super().render(data, accepted_media_type, renderer_context)
+
+    def stream(self, queryset, fast):
+        yield '{"columns":%s,"rows":[' % encoder.encode(fast.names)
+        for index, chunk in enumerate(iter_chunks(queryset)):
+            rows = [list(item.values()) for item in fast.data(chunk)]
+            yield ('' if index == 0 else ',') + encoder.encode(rows)[1:-1]
+        yield ']}'
+
+
+def csv_cell(value):
+    return encoder.encode(value) if isinstance(value, (dict, list)) else value
+
+
+class CSVRenderer(BaseRenderer):
+    # Рядок заголовків і рядки значень; з ?stream=true — потоковий експорт всього списку.
+    # Сторінка (?page_size=) — лише її рядки, а курсори next/previous — у заголовку Link
+    media_type = 'text/csv'
+    format = 'csv'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        response = (renderer_context or {}).get('response')
+        if response is not None and isinstance(data, dict):
+            # У CSV немає місця для курсорів сторінки — вони йдуть у заголовок Link (RFC 8288)
+            links = ['<%s>; rel="%s"' % (data[rel], rel) for rel in ('next', 'previous') if data.get(rel)]
+            if links:
+                response['Link'] = ', '.join(links)
+        rows = list_rows(data)
+        out = io.StringIO()
+        writer = csv.writer(out)
+        columns = list(rows[0]) if rows else []
+        writer.writerow(columns)
+        writer.writerows([csv_cell(row.get(name)) for name in columns] for row in rows)
+        return out.getvalue().encode(self.charset)
+
+    def stream(self, queryset, fast):
+        out = io.StringIO()
+        writer = csv.writer(out)
+        writer.writerow(fast.names)
+        for chunk in iter_chunks(queryset):
+            writer.writerows(item.values() for item in fast.data(chunk))
+            yield out.getvalue()
+            out.seek(0)
+            out.truncate()
+        yield out.getvalue()
+
+
+class MessagePackRenderer(BaseRenderer):
+    # Бінарний MessagePack (пакет msgpack з requirements.txt; якщо його не встановлено, формат не пропонується).
+    # Масив msgpack вимагає кількість елементів наперед, тож ?stream=true віддає звичайну відповідь.
+    media_type = 'application/msgpack'
+    format = 'msgpack'
+    charset = None
+    render_style = 'binary'
+    stream = None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        # Decimal, дати, lazy-рядки — як у JSON
+        return msgpack.packb(data, default=encoder.default, use_bin_type=True)
+
+
+LIST_RENDERER_CLASSES = list(api_settings.DEFAULT_RENDERER_CLASSES) + [ColumnarJSONRenderer, CSVRenderer]
+if msgpack is not None:
+    LIST_RENDERER_CLASSES.append(MessagePackRenderer)
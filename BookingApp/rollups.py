@@ -0,0 +1,150 @@
+from collections import defaultdict
+from datetime import timedelta
+from decimal import Decimal
+from functools import reduce
+from operator import or_
+
+from django.db import transaction
+from django.db.models import Case, Count, DecimalField, F, IntegerField, Q, Sum, Value, When
+
+from .models import ArchivedReservation, DailyRollup, Room, RoomNight
+
+# Ключів на один UPDATE: кожен ключ — кілька параметрів у WHERE і двох CASE
+UPDATE_CHUNK_SIZE = 50
+
+
+def night_deltas(added=(), removed=()):
+    # Ночі — кортежі (hotel_id, room_id, date). Виручка ночі — поточна ціна кімнати (і видаленої теж).
+    added, removed = list(added), list(removed)
+    room_ids = {room_id for _, room_id, _ in added + removed}
+    rooms = {pk: (room_type, price) for pk, room_type, price in
+             Room.all_objects.filter(pk__in=room_ids).values_list('pk', 'room_type', 'price_per_night')} if room_ids else {}
+    deltas = defaultdict(lambda: [0, Decimal(0)])
+    for sign, nights in ((1, added), (-1, removed)):
+        for hotel_id, room_id, night in nights:
+            if room_id not in rooms:
+                continue
+            room_type, price = rooms[room_id]
+            delta = deltas[(hotel_id, room_type, night)]
+            delta[0] += sign
+            delta[1] += sign * price
+    return {key: delta for key, delta in deltas.items() if delta[0] or delta[1]}
+
+
+def room_night_counts(room_id):
+    # (hotel_id, date) -> кількість ночей кімнати: з календаря і з архіву (архівні ночі лишаються у зведеннях)
+    counts = defaultdict(int)
+    for hotel_id, night in RoomNight.objects.filter(room_id=room_id).values_list('hotel_id', 'date').iterator():
+        counts[(hotel_id, night)] += 1
+    for hotel_id, night, check_out in ArchivedReservation.objects.filter(room_id=room_id).values_list(
+            'hotel_id', 'check_in_date', 'check_out_date').iterator():
+        while night < check_out:
+            counts[(hotel_id, night)] += 1
+            night += timedelta(days=1)
+    return counts
+
+
+def reprice_room(room_id, old, new):
+    # old/new — (room_type, price) кімнати до і після зміни. Зведення рахують ночі за поточними типом і ціною
+    # кімнати (як і бекфіл), тож при їх зміні всі ночі кімнати переносимо зі старого ключа на новий —
+    # інакше видалення бронювання відняло б від нового ключа те, що додавалось до старого
+    deltas = defaultdict(lambda: [0, Decimal(0)])
+    for (hotel_id, night), count in room_night_counts(room_id).items():
+        for sign, (room_type, price) in ((-1, old), (1, new)):
+            delta = deltas[(hotel_id, room_type, night)]
+            delta[0] += sign * count
+            delta[1] += sign * count * price
+    deltas = {key: delta for key, delta in deltas.items() if delta[0] or delta[1]}
+    if deltas:
+        with transaction.atomic():
+            apply_deltas(deltas)
+
+
+def key_filter(hotel_id, room_type, night):
+    return Q(hotel_id=hotel_id, room_type=room_type, date=night)
+
+
+def apply_deltas(deltas):
+    # Відсутні рядки створюємо нулями (ignore_conflicts — на випадок паралельної вставки),
+    # потім один атомарний UPDATE x = x + CASE ... на порцію ключів
+    keys = list(deltas)
+    for start in range(0, len(keys), UPDATE_CHUNK_SIZE):
+        chunk = keys[start:start + UPDATE_CHUNK_SIZE]
+        DailyRollup.objects.bulk_create(
+            [DailyRollup(hotel_id=hotel_id, room_type=room_type, date=night) for hotel_id, room_type, night in chunk],
+            ignore_conflicts=True,
+        )
+        DailyRollup.objects.filter(reduce(or_, [key_filter(*key) for key in chunk])).update(
+            occupied_rooms=F('occupied_rooms') + Case(
+                *[When(key_filter(*key), then=Value(deltas[key][0])) for key in chunk],
+                default=Value(0), output_field=IntegerField(),
+            ),
+            revenue=F('revenue') + Case(
+                *[When(key_filter(*key), then=Value(deltas[key][1])) for key in chunk],
+                default=Value(Decimal(0)), output_field=DecimalField(max_digits=14, decimal_places=2),
+            ),
+        )
+
+
+def update_rollups(added=(), removed=()):
+    deltas = night_deltas(added, removed)
+    if deltas:
+        apply_deltas(deltas)
+
+
+def archived_totals(start_date=None, end_date=None):
+    # Архівні бронювання вже без ночей у календарі: рахуємо їх ночі в [start_date, end_date) тут
+    archived = ArchivedReservation.objects.all()
+    if start_date is not None:
+        archived = archived.filter(check_out_date__gt=start_date)
+    if end_date is not None:
+        archived = archived.filter(check_in_date__lt=end_date)
+    totals = defaultdict(lambda: [0, Decimal(0)])
+    for hotel_id, room_type, price, check_in, check_out in archived.values_list(
+            'hotel_id', 'room__room_type', 'room__price_per_night', 'check_in_date', 'check_out_date').iterator():
+        night = check_in if start_date is None else max(check_in, start_date)
+        last = check_out if end_date is None else min(check_out, end_date)
+        while night < last:
+            total = totals[(hotel_id, room_type, night)]
+            total[0] += 1
+            total[1] += price
+            night += timedelta(days=1)
+    return totals
+
+
+def rebuild_rollups(start_date=None, end_date=None, batch_size=5000, progress=None):
+    # Бекфіл з календаря RoomNight одним згрупованим запитом (плюс ночі з архіву); [start_date, end_date) або все
+    archived = archived_totals(start_date, end_date)
+    nights = RoomNight.objects.all()
+    rollups = DailyRollup.objects.all()
+    if start_date is not None:
+        nights, rollups = nights.filter(date__gte=start_date), rollups.filter(date__gte=start_date)
+    if end_date is not None:
+        nights, rollups = nights.filter(date__lt=end_date), rollups.filter(date__lt=end_date)
+    grouped = nights.order_by().values('hotel_id', 'room__room_type', 'date').annotate(
+        occupied=Count('pk'), total=Sum('room__price_per_night'),
+    ).values_list('hotel_id', 'room__room_type', 'date', 'occupied', 'total')
+
+    def rows():
+        for hotel_id, room_type, night, occupied, revenue in grouped.iterator(chunk_size=batch_size):
+            extra = archived.pop((hotel_id, room_type, night), (0, 0))
+            yield hotel_id, room_type, night, occupied + extra[0], revenue + extra[1]
+        for (hotel_id, room_type, night), (occupied, revenue) in archived.items():
+            yield hotel_id, room_type, night, occupied, revenue
+
+    total = 0
+    with transaction.atomic():
+        rollups.delete()
+        batch = []
+        for hotel_id, room_type, night, occupied, revenue in rows():
+            batch.append(DailyRollup(hotel_id=hotel_id, room_type=room_type, date=night,
+                                     occupied_rooms=occupied, revenue=revenue))
+            if len(batch) >= batch_size:
+                DailyRollup.objects.bulk_create(batch)
+                total += len(batch)
+                batch = []
+                if progress:
+                    progress(total)
+        DailyRollup.objects.bulk_create(batch)
+        total += len(batch)
+    return total
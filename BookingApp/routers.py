@@ -0,0 +1,50 @@
+from contextvars import ContextVar
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.db import connections
+
+REPLICA_ALIAS = 'replica'
+
+reading_from_replica = ContextVar('reading_from_replica', default=False)
+
+
+def replica_read(method):
+    # GET-обробники, позначені цим декоратором, читають через read-only з'єднання (якщо воно налаштоване)
+    if iscoroutinefunction(method):
+        @wraps(method)
+        async def async_wrapper(*args, **kwargs):
+            token = reading_from_replica.set(True)
+            try:
+                return await method(*args, **kwargs)
+            finally:
+                reading_from_replica.reset(token)
+        return async_wrapper
+
+    @wraps(method)
+    def wrapper(*args, **kwargs):
+        token = reading_from_replica.set(True)
+        try:
+            return method(*args, **kwargs)
+        finally:
+            reading_from_replica.reset(token)
+    return wrapper
+
+
+class ReadReplicaRouter:
+    # Запис і все, що всередині транзакції (бронювання) — лише на основну БД
+    def db_for_read(self, model, **hints):
+        if (reading_from_replica.get() and REPLICA_ALIAS in settings.DATABASES
+                and not connections['default'].in_atomic_block):
+            return REPLICA_ALIAS
+        return None
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == 'default'
@@ -0,0 +1,146 @@
+import hashlib
+import json
+import logging
+import threading
+from functools import lru_cache
+from importlib.metadata import PackageNotFoundError, version
+from pathlib import Path
+
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseNotModified
+from drf_yasg import openapi
+from drf_yasg.views import UI_RENDERERS
+from rest_framework.permissions import AllowAny
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+logger = logging.getLogger(__name__)
+
+FINGERPRINT_KEY = 'x-source-fingerprint'
+CACHE_CONTROL = 'public, max-age=%d' % getattr(settings, 'BOOKING_SCHEMA_MAX_AGE', 3600)
+# Файли, з яких drf_yasg будує схему: зміна будь-якого з них робить збережену схему застарілою
+SOURCE_FILES = [
+    'Booking/urls.py',
+    'Booking/yasg.py',
+    'BookingApp/urls.py',
+    'BookingApp/views.py',
+    'BookingApp/serializers.py',
+    'BookingApp/models.py',
+    'BookingApp/renderers.py',
+]
+# msgpack — бо від нього залежить перелік форматів (?format=) у схемі
+SOURCE_PACKAGES = ['djangorestframework', 'drf-yasg', 'djoser', 'djangorestframework-simplejwt', 'msgpack']
+
+
+def schema_path():
+    return Path(getattr(settings, 'BOOKING_SCHEMA_PATH', Path(settings.BASE_DIR) / 'schema' / 'openapi.json'))
+
+
+@lru_cache(maxsize=None)
+def source_fingerprint():
+    digest = hashlib.sha256()
+    for name in SOURCE_FILES:
+        path = Path(settings.BASE_DIR) / name
+        digest.update(name.encode())
+        digest.update(path.read_bytes() if path.exists() else b'')
+    for package in SOURCE_PACKAGES:
+        try:
+            digest.update(('%s==%s' % (package, version(package))).encode())
+        except PackageNotFoundError:
+            pass
+    return digest.hexdigest()
+
+
+def generate_schema():
+    from drf_yasg.codecs import OpenAPICodecJson
+    from drf_yasg.generators import OpenAPISchemaGenerator
+    from Booking.yasg import api_info
+
+    schema = OpenAPISchemaGenerator(info=api_info).get_schema(request=None, public=True)
+    data = json.loads(OpenAPICodecJson(validators=[], pretty=False).encode(schema))
+    data['info'][FINGERPRINT_KEY] = source_fingerprint()
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode()
+
+
+def write_schema(path=None):
+    path = Path(path or schema_path())
+    path.parent.mkdir(parents=True, exist_ok=True)
+    content = generate_schema()
+    path.write_bytes(content)
+    return path, content
+
+
+def stored_fingerprint(content):
+    try:
+        return json.loads(content)['info'].get(FINGERPRINT_KEY)
+    except (ValueError, KeyError, TypeError):
+        return None
+
+
+def read_stored_schema():
+    # None, якщо файлу немає або він згенерований для іншої версії коду
+    path = schema_path()
+    if not path.exists():
+        return None
+    content = path.read_bytes()
+    if stored_fingerprint(content) != source_fingerprint():
+        return None
+    return content
+
+
+class SchemaStore:
+    # Схема завантажується (або, якщо збережена застаріла, генерується) один раз на процес
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.content = None
+        self.etag = None
+
+    def get(self):
+        if self.content is None:
+            with self.lock:
+                if self.content is None:
+                    content = read_stored_schema()
+                    if content is None:
+                        logger.warning('Stored OpenAPI schema %s is missing or out of date, generating it in process. '
+                                       'Run "manage.py generate_schema" at deploy time.', schema_path())
+                        content = generate_schema()
+                    self.etag = '"%s"' % hashlib.md5(content).hexdigest()
+                    self.content = content
+        return self.content, self.etag
+
+
+store = SchemaStore()
+
+
+class SchemaUIView(APIView):
+    # Сторінка swagger/redoc — лише HTML-оболонка з назвою і версією API; саму схему вона підвантажує
+    # з ?format=openapi, тобто з файлу. drf_yasg будував би для цього всю схему на кожен запит
+    permission_classes = [AllowAny]
+
+    def get(self, request, *args, **kwargs):
+        from Booking.yasg import api_info
+
+        return Response(openapi.Swagger(info=api_info, _prefix='/', paths=openapi.Paths(paths={})))
+
+
+def stored_schema_view(fallback, ui=None):
+    # JSON-схема віддається з файлу, сторінка інтерфейсу ui ('swagger' / 'redoc') — без генерації схеми;
+    # інші формати (yaml) — як і раніше через drf_yasg
+    ui_view = SchemaUIView.as_view(renderer_classes=UI_RENDERERS[ui][:1]) if ui else None
+
+    def view(request, *args, **kwargs):
+        fmt = kwargs.get('format') or request.GET.get('format')
+        if ui_view is not None and not fmt:
+            return ui_view(request, *args, **kwargs)
+        if fmt not in ('.json', 'json', 'openapi'):
+            return fallback(request, *args, **kwargs)
+        content, etag = store.get()
+        # W/ — та сама мітка після стиснення (CompressionMiddleware)
+        if request.META.get('HTTP_IF_NONE_MATCH', '').removeprefix('W/') == etag:
+            response = HttpResponseNotModified()
+        else:
+            response = HttpResponse(content, content_type='application/json')
+        response['ETag'] = etag
+        response['Cache-Control'] = CACHE_CONTROL
+        return response
+    return view
@@ -1,6 +1,11 @@
+from functools import lru_cache
+
+from django.conf import settings
 from django.contrib.auth.models import User
+from django.core.exceptions import FieldDoesNotExist, ImproperlyConfigured
 from rest_framework import serializers
-from BookingApp.models import Hotel, Room, Reservation
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from BookingApp.models import Hotel, Job, Room, RoomHold, Reservation
 
 
 class UserRegistrationSerializer(serializers.ModelSerializer):
@@ -55,7 +60,252 @@ class RoomSerializer(serializers.ModelSerializer):
         model = Room
         fields = ['hotel', 'room_number', 'room_type', 'price_per_night']
 
+class ExpandedRoomSerializer(serializers.ModelSerializer):
+    occupied = serializers.BooleanField(read_only=True)
+
+    class Meta:
+        model = Room
+        fields = ['id', 'room_number', 'room_type', 'price_per_night', 'occupied']
+
+class RoomTypeStatsSerializer(serializers.Serializer):
+    room_type = serializers.CharField()
+    rooms = serializers.IntegerField()
+    occupied_rooms = serializers.IntegerField()
+    min_price = serializers.DecimalField(max_digits=8, decimal_places=2)
+    max_price = serializers.DecimalField(max_digits=8, decimal_places=2)
+    avg_price = serializers.DecimalField(max_digits=8, decimal_places=2)
+
+class HotelExpandedSerializer(serializers.ModelSerializer):
+    # Готель разом з кімнатами, агрегатами по типах і зайнятістю на дату (HotelQuerySet.with_room_stats / with_rooms)
+    date = serializers.DateField(source='stats_date', read_only=True)
+    room_count = serializers.IntegerField(read_only=True)
+    occupied_rooms = serializers.IntegerField(read_only=True)
+    min_price = serializers.DecimalField(max_digits=8, decimal_places=2, read_only=True)
+    max_price = serializers.DecimalField(max_digits=8, decimal_places=2, read_only=True)
+    avg_price = serializers.DecimalField(max_digits=8, decimal_places=2, read_only=True)
+    room_types = RoomTypeStatsSerializer(many=True, read_only=True)
+    rooms = ExpandedRoomSerializer(source='expanded_rooms', many=True, read_only=True)
+
+    class Meta:
+        model = Hotel
+        fields = ['id', 'name', 'address', 'date', 'room_count', 'occupied_rooms', 'min_price', 'max_price',
+                  'avg_price', 'room_types', 'rooms']
+
+class HotelExpandQuerySerializer(serializers.Serializer):
+    expand = serializers.ChoiceField(choices=['rooms'], required=False)
+    date = serializers.DateField(required=False)
+
+class BulkPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    # У пакетному запиті пов'язані об'єкти вже завантажені одним запитом на поле
+    # (див. ReservationListSerializer), тож тут без запиту на кожен елемент.
+    def to_internal_value(self, data):
+        preloaded = self.context.get('related_objects', {}).get(self.field_name)
+        if preloaded is None:
+            return super().to_internal_value(data)
+        if isinstance(data, bool):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        try:
+            return preloaded[int(data)]
+        except KeyError:
+            self.fail('does_not_exist', pk_value=data)
+        except (TypeError, ValueError):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+
+
+class ReservationListSerializer(serializers.ListSerializer):
+    def to_internal_value(self, data):
+        if isinstance(data, list):
+            self.context['related_objects'] = self.preload_related(data)
+        return super().to_internal_value(data)
+
+    def preload_related(self, data):
+        related = {}
+        for name, field in self.child.fields.items():
+            if not isinstance(field, BulkPrimaryKeyRelatedField) or field.read_only:
+                continue
+            pks = set()
+            for item in data:
+                value = item.get(name) if isinstance(item, dict) else None
+                if isinstance(value, (int, str)) and not isinstance(value, bool) and str(value).isdigit():
+                    pks.add(int(value))
+            related[name] = field.get_queryset().in_bulk(pks)
+        return related
+
+
 class ReservationSerializer(serializers.ModelSerializer):
+    serializer_related_field = BulkPrimaryKeyRelatedField
+
     class Meta:
         model = Reservation
-        fields = ['hotel', 'room', 'client', 'check_in_date', 'check_out_date']
\ No newline at end of file
+        fields = ['hotel', 'room', 'client', 'check_in_date', 'check_out_date']
+        list_serializer_class = ReservationListSerializer
+
+    def validate(self, data):
+        # При PATCH частину дат беремо з існуючого бронювання
+        check_in_date = data.get('check_in_date', getattr(self.instance, 'check_in_date', None))
+        check_out_date = data.get('check_out_date', getattr(self.instance, 'check_out_date', None))
+        if check_in_date and check_out_date and check_out_date <= check_in_date:
+            raise serializers.ValidationError('check_out_date must be later than check_in_date.')
+        return data
+
+class RoomHoldSerializer(serializers.ModelSerializer):
+    ttl_minutes = serializers.IntegerField(write_only=True, required=False, min_value=1,
+                                           max_value=getattr(settings, 'BOOKING_HOLDS', {}).get('MAX_TTL_MINUTES', 30))
+
+    class Meta:
+        model = RoomHold
+        fields = ['id', 'hotel', 'room', 'check_in_date', 'check_out_date', 'expires_at', 'ttl_minutes']
+        read_only_fields = ['expires_at']
+
+    def validate(self, data):
+        if data['check_out_date'] <= data['check_in_date']:
+            raise serializers.ValidationError('check_out_date must be later than check_in_date.')
+        return data
+
+class AvailableRoomSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Room
+        fields = ['id', 'hotel', 'room_number', 'room_type', 'price_per_night']
+
+class AvailabilitySearchSerializer(serializers.Serializer):
+    check_in_date = serializers.DateField()
+    check_out_date = serializers.DateField()
+    hotel = serializers.IntegerField(required=False)
+    room_type = serializers.CharField(required=False)
+    min_price = serializers.DecimalField(max_digits=8, decimal_places=2, required=False)
+    max_price = serializers.DecimalField(max_digits=8, decimal_places=2, required=False)
+
+    def validate(self, data):
+        if data['check_out_date'] <= data['check_in_date']:
+            raise serializers.ValidationError('check_out_date must be later than check_in_date.')
+        return data
+
+class ReservationRangeSerializer(serializers.Serializer):
+    # Бронювання, що перетинаються з [start_date, end_date); діапазон до горизонту архівації шукає і в архіві
+    start_date = serializers.DateField(required=False)
+    end_date = serializers.DateField(required=False)
+
+    def validate(self, data):
+        if 'start_date' in data and 'end_date' in data and data['end_date'] <= data['start_date']:
+            raise serializers.ValidationError('end_date must be later than start_date.')
+        return data
+
+class ChangesQuerySerializer(serializers.Serializer):
+    since = serializers.IntegerField(min_value=0, default=0)
+    limit = serializers.IntegerField(min_value=1, required=False,
+                                     max_value=getattr(settings, 'BOOKING_CHANGES', {}).get('MAX_PAGE_SIZE', 1000))
+
+class EventsQuerySerializer(serializers.Serializer):
+    # ?hotel=1&hotel=2&room=5 — теми підписки SSE
+    hotel = serializers.ListField(child=serializers.IntegerField(min_value=1), required=False)
+    room = serializers.ListField(child=serializers.IntegerField(min_value=1), required=False)
+
+    def validate(self, data):
+        count = len(data.get('hotel', [])) + len(data.get('room', []))
+        if not count:
+            raise serializers.ValidationError('Subscribe to at least one hotel or room.')
+        limit = getattr(settings, 'BOOKING_EVENTS', {}).get('MAX_TOPICS', 50)
+        if count > limit:
+            raise serializers.ValidationError('At most %d hotels and rooms per subscription.' % limit)
+        return data
+
+class AnalyticsQuerySerializer(serializers.Serializer):
+    start_date = serializers.DateField()
+    end_date = serializers.DateField()
+    room_type = serializers.CharField(required=False)
+
+    def validate(self, data):
+        days = (data['end_date'] - data['start_date']).days
+        if not 0 < days <= 731:
+            raise serializers.ValidationError('end_date must be later than start_date and at most 731 days after it.')
+        return data
+
+class RoomSearchSerializer(serializers.Serializer):
+    # ordering -> порядок для курсорної пагінації; pk в кінці робить порядок однозначним
+    ORDERINGS = {
+        'price': ('price_per_night', 'pk'),
+        '-price': ('-price_per_night', '-pk'),
+        'room_number': ('room_number', 'pk'),
+        'room_type': ('room_type', 'price_per_night', 'pk'),
+        'pk': ('pk',),
+    }
+
+    hotel = serializers.IntegerField(required=False)
+    room_type = serializers.CharField(required=False)
+    min_price = serializers.DecimalField(max_digits=8, decimal_places=2, required=False)
+    max_price = serializers.DecimalField(max_digits=8, decimal_places=2, required=False)
+    ordering = serializers.ChoiceField(choices=list(ORDERINGS), default='pk')
+
+class JobSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Job
+        fields = ['id', 'name', 'status', 'attempts', 'progress', 'created_at', 'finished_at']
+
+class CalendarQuerySerializer(serializers.Serializer):
+    start_date = serializers.DateField()
+    days = serializers.IntegerField(min_value=1, max_value=731, default=365)
+
+
+class ClaimsTokenObtainPairSerializer(TokenObtainPairSerializer):
+    # Дані користувача в самому токені: JWTStatelessUserAuthentication будує TokenUser без запиту до БД
+    @classmethod
+    def get_token(cls, user):
+        token = super().get_token(user)
+        token['username'] = user.get_username()
+        token['is_staff'] = user.is_staff
+        token['is_superuser'] = user.is_superuser
+        return token
+
+
+class ValuesListSerializer:
+    # Read-only серіалізація списків без створення моделей: рядки .values_list() перетворюються
+    # за наперед складеним планом (поле -> колонка -> to_representation поля DRF). Результат
+    # збігається з ModelSerializer(many=True).data. Перша колонка завжди pk — для курсорної пагінації.
+    PLAIN_FIELDS = (serializers.CharField, serializers.IntegerField)
+
+    def __init__(self, serializer_class):
+        fields = serializer_class().fields
+        model = serializer_class.Meta.model
+        self.columns = ['pk']
+        self.plan = []
+        for name, field in fields.items():
+            if field.write_only:
+                continue
+            try:
+                model_field = model._meta.get_field(field.source)
+            except FieldDoesNotExist:
+                raise ImproperlyConfigured('%s.%s is not a model field' % (serializer_class.__name__, name))
+            if isinstance(field, serializers.PrimaryKeyRelatedField) and field.pk_field is None:
+                column, convert = model_field.attname, None
+            elif model_field.is_relation:
+                raise ImproperlyConfigured('%s.%s: only primary key relations are supported' % (serializer_class.__name__, name))
+            else:
+                column = model_field.attname
+                convert = None if isinstance(field, self.PLAIN_FIELDS) else field.to_representation
+            self.plan.append((name, len(self.columns), convert))
+            self.columns.append(column)
+
+    @property
+    def names(self):
+        return [name for name, _, _ in self.plan]
+
+    def queryset(self, queryset):
+        # Без явного порядку — як у звичайного списку (порядок pk), але детерміновано
+        if not queryset.ordered:
+            queryset = queryset.order_by('pk')
+        return queryset.values_list(*self.columns, named=True)
+
+    def to_representation(self, row):
+        item = {}
+        for name, index, convert in self.plan:
+            value = row[index]
+            item[name] = value if convert is None or value is None else convert(value)
+        return item
+
+    def data(self, rows):
+        return [self.to_representation(row) for row in rows]
+
+
+@lru_cache(maxsize=None)
+def values_serializer(serializer_class):
+    return ValuesListSerializer(serializer_class)
@@ -0,0 +1,205 @@
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import OperationalError, connection, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .cache import invalidate_many
+from .changes import record_changes
+from .events import publish_reservations, reservation_row
+from .exceptions import BatchConflict, HoldExpired, ReservationConflict, RoomBusy
+from .jobs import enqueue
+from .models import ChangeLog, Reservation, Room, RoomHold
+from .occupancy import add_reservations_nights
+
+LOCK_ATTEMPTS = 3
+LOCK_BACKOFF = 0.05
+MAX_BATCH_SIZE = 200
+HOLD_SETTINGS = getattr(settings, 'BOOKING_HOLDS', {})
+HOLD_TTL_MINUTES = HOLD_SETTINGS.get('TTL_MINUTES', 10)
+
+
+def lock_rooms(room_ids):
+    # Блокування лише потрібних кімнат: на PostgreSQL/MySQL це SELECT ... FOR UPDATE по рядках Room
+    # (у порядку pk, щоб уникнути взаємоблокувань). SQLite не вміє блокувати рядки, тому порожній
+    # UPDATE одразу бере write-lock на початку транзакції (як BEGIN IMMEDIATE) і перевірка перетину
+    # та вставка не можуть переплестися.
+    rooms = Room.all_objects.filter(pk__in=sorted(set(room_ids)))
+    if connection.features.has_select_for_update:
+        list(rooms.select_for_update().order_by('pk').values_list('pk', flat=True))
+    else:
+        rooms.update(room_number=F('room_number'))
+
+
+def is_lock_error(exc):
+    message = str(exc).lower()
+    return 'locked' in message or 'busy' in message or 'deadlock' in message
+
+
+def check_room_free(room_id, check_in_date, check_out_date, exclude_pk=None, client=None):
+    overlapping = Reservation.objects.filter(room_id=room_id).overlapping(check_in_date, check_out_date)
+    if exclude_pk is not None:
+        overlapping = overlapping.exclude(pk=exclude_pk)
+    if overlapping.exists():
+        raise ReservationConflict()
+    # Чужі активні утримання на ці дати теж займають кімнату
+    held = RoomHold.objects.active().filter(room_id=room_id).overlapping(check_in_date, check_out_date)
+    if client is not None:
+        held = held.exclude(client=client)
+    if held.exists():
+        raise ReservationConflict()
+
+
+def run_locked(room_ids, func):
+    # Повторюємо при тимчасовому блокуванні БД; конфлікт дат (409) не повторюємо
+    for attempt in range(LOCK_ATTEMPTS):
+        try:
+            with transaction.atomic():
+                lock_rooms(room_ids)
+                return func()
+        except OperationalError as exc:
+            if not is_lock_error(exc):
+                raise
+            time.sleep(LOCK_BACKOFF * (2 ** attempt))
+    raise RoomBusy()
+
+
+def create_reservation(serializer, client):
+    data = serializer.validated_data
+    room = data['room']
+
+    def book():
+        check_room_free(room.pk, data['check_in_date'], data['check_out_date'], client=client)
+        return serializer.save(client=client)
+
+    return run_locked([room.pk], book)
+
+
+def update_reservation(serializer):
+    reservation = serializer.instance
+    data = serializer.validated_data
+    room_id = data['room'].pk if 'room' in data else reservation.room_id
+    check_in_date = data.get('check_in_date', reservation.check_in_date)
+    check_out_date = data.get('check_out_date', reservation.check_out_date)
+
+    def move():
+        check_room_free(room_id, check_in_date, check_out_date, exclude_pk=reservation.pk, client=reservation.client_id)
+        return serializer.save()
+
+    return run_locked({room_id, reservation.room_id}, move)
+
+
+def find_batch_conflicts(items, client=None):
+    # Один запит на всі елементи пакета: (room = r1 AND перетин дат) OR (room = r2 AND ...) ...
+    # Бронювання від імені client (не імпорт) — ще один такий самий запит по чужих активних утриманнях
+    if not items:
+        return set()
+    query = Q()
+    for item in items:
+        query |= Q(room=item['room'], check_in_date__lt=item['check_out_date'], check_out_date__gt=item['check_in_date'])
+    sources = [Reservation.objects.filter(query)]
+    if client is not None:
+        sources.append(RoomHold.objects.active().filter(query).exclude(client=client))
+    booked = {}
+    for source in sources:
+        for room_id, check_in, check_out in source.values_list('room_id', 'check_in_date', 'check_out_date'):
+            booked.setdefault(room_id, []).append((check_in, check_out))
+
+    conflicts = set()
+    accepted = {}
+    for index, item in enumerate(items):
+        stay = (item['check_in_date'], item['check_out_date'])
+        for other in booked.get(item['room'].pk, []) + accepted.get(item['room'].pk, []):
+            if stay[0] < other[1] and stay[1] > other[0]:
+                conflicts.add(index)
+                break
+        else:
+            # перетини всередині самого пакета теж конфлікт
+            accepted.setdefault(item['room'].pk, []).append(stay)
+    return conflicts
+
+
+def create_reservations_batch(serializer, client):
+    items = serializer.validated_data
+
+    def book():
+        conflicts = find_batch_conflicts(items, client=client)
+        if conflicts:
+            raise BatchConflict([
+                {'index': index, 'status': 'conflict' if index in conflicts else 'ok'}
+                for index in range(len(items))
+            ])
+        reservations = Reservation.objects.bulk_create([Reservation(**dict(item, client=client)) for item in items])
+        # bulk_create не викликає post_save, тому календар оновлюємо явно
+        add_reservations_nights(reservations)
+        record_changes('reservations', [reservation.pk for reservation in reservations])
+        publish_reservations('created', [reservation_row(reservation) for reservation in reservations])
+        return reservations
+
+    return run_locked([item['room'].pk for item in items], book)
+
+
+def delete_hotel(hotel, owner=None):
+    # Одразу лише надгробки на готель і його кімнати (два короткі UPDATE) — вони зникають з читань.
+    # Бронювання, зведення і самі рядки видаляє порціями фонова задача purge_hotel.
+    now = timezone.now()
+    with transaction.atomic():
+        room_ids = list(Room.objects.filter(hotel=hotel).values_list('pk', flat=True))
+        Room.objects.filter(pk__in=room_ids).update(deleted_at=now)
+        hotel.deleted_at = now
+        hotel.save(update_fields=['deleted_at'])
+        # UPDATE по кімнатах минає post_save — надгробки в журнал змін пишемо явно
+        record_changes('rooms', room_ids, ChangeLog.DELETE)
+        job = enqueue('purge_hotel', {'hotel_id': hotel.pk}, owner=owner)
+    invalidate_many('rooms', room_ids)
+    return job
+
+
+def delete_room(room, owner=None):
+    with transaction.atomic():
+        room.deleted_at = timezone.now()
+        room.save(update_fields=['deleted_at'])
+        return enqueue('purge_room', {'room_id': room.pk}, owner=owner)
+
+
+def create_hold(serializer, client):
+    # Одна коротка транзакція з блокуванням кімнати: перевірка перетинів і вставка утримання.
+    # Далі оплата йде вже без блокувань — кімнату тримає сам запис RoomHold до expires_at.
+    data = serializer.validated_data
+    room = data['room']
+    ttl = data.pop('ttl_minutes', HOLD_TTL_MINUTES)
+
+    def hold():
+        check_room_free(room.pk, data['check_in_date'], data['check_out_date'], client=client)
+        return serializer.save(client=client, expires_at=timezone.now() + timedelta(minutes=ttl))
+
+    return run_locked([room.pk], hold)
+
+
+def confirm_hold(hold, client):
+    # Поки утримання діє, інші на ці дати не заброньують — але сам власник міг забронювати ці дати напряму
+    # (його утримання йому не заважає). Тож під тим же блокуванням видаляємо ще активне утримання і ще раз
+    # перевіряємо перетин з бронюваннями; при конфлікті транзакція відкочується і утримання лишається.
+    def confirm():
+        if not RoomHold.objects.active().filter(pk=hold.pk, client=client).delete()[0]:
+            raise HoldExpired()
+        if Reservation.objects.filter(room_id=hold.room_id).overlapping(hold.check_in_date, hold.check_out_date).exists():
+            raise ReservationConflict()
+        return Reservation.objects.create(hotel_id=hold.hotel_id, room_id=hold.room_id, client=client,
+                                          check_in_date=hold.check_in_date, check_out_date=hold.check_out_date)
+
+    return run_locked([hold.room_id], confirm)
+
+
+def expire_holds(batch_size=1000, now=None):
+    # Прибирання прострочених утримань порціями; на зайнятість вони не впливають і до прибирання
+    now = now or timezone.now()
+    expired = RoomHold.objects.filter(expires_at__lte=now).order_by('pk').values_list('pk', flat=True)
+    total = 0
+    while True:
+        batch = list(expired[:batch_size])
+        if not batch:
+            return total
+        total += RoomHold.objects.filter(pk__in=batch).delete()[0]
@@ -0,0 +1,117 @@
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from .authentication import forget_user
+from .cache import invalidate
+from .changes import record_change
+from .events import publish_reservation
+from .middleware import install_query_timer
+from .models import ChangeLog, Hotel, Room, Reservation
+from .occupancy import bulk_delete, remove_reservation_nights, sync_reservation_nights
+from .rollups import reprice_room
+
+RESOURCE_NAMES = {Hotel: 'hotels', Room: 'rooms'}
+ROLLUP_FIELDS = ('room_type', 'price_per_night')
+STAY_FIELDS = ('check_in_date', 'check_out_date')
+
+
+@receiver(post_save, sender=Reservation)
+def reservation_saved(sender, instance, created=False, raw=False, **kwargs):
+    if raw:
+        return
+    # create(check_in_date='2024-05-10') зберігає рядок як є; ночам і подіям потрібні date
+    for name in STAY_FIELDS:
+        setattr(instance, name, Reservation._meta.get_field(name).to_python(getattr(instance, name)))
+    previous_rooms = sync_reservation_nights(instance)
+    record_change('reservations', instance.pk)
+    publish_reservation('created' if created else 'updated', instance, previous_rooms)
+
+
+@receiver(pre_delete, sender=Reservation)
+def reservation_deleted(sender, instance, **kwargs):
+    remove_reservation_nights(instance)
+
+
+@receiver(post_delete, sender=Reservation)
+def reservation_removed(sender, instance, **kwargs):
+    # пакетні шляхи (occupancy.delete_reservations) пишуть журнал самі; архівування — не видалення
+    if not bulk_delete.get():
+        record_change('reservations', instance.pk, ChangeLog.DELETE)
+        publish_reservation('deleted', instance)
+
+
+@receiver(post_save, sender=Hotel)
+@receiver(post_delete, sender=Hotel)
+def hotel_changed(sender, instance, **kwargs):
+    invalidate('hotels', instance.pk)
+
+
+@receiver(post_save, sender=Room)
+@receiver(post_delete, sender=Room)
+def room_changed(sender, instance, **kwargs):
+    invalidate('rooms', instance.pk)
+
+
+def rollup_key(room):
+    return tuple(Room._meta.get_field(name).to_python(getattr(room, name)) for name in ROLLUP_FIELDS)
+
+
+@receiver(pre_save, sender=Room)
+def room_saving(sender, instance, raw=False, update_fields=None, **kwargs):
+    # Тип і ціна до збереження — щоб перенести зведення ночей кімнати, якщо вони зміняться
+    instance._rollup_key = None
+    if raw or instance.pk is None or (update_fields is not None and not set(ROLLUP_FIELDS) & set(update_fields)):
+        return
+    instance._rollup_key = Room.all_objects.filter(pk=instance.pk).values_list(*ROLLUP_FIELDS).first()
+
+
+@receiver(post_save, sender=Room)
+def room_saved(sender, instance, **kwargs):
+    old, new = getattr(instance, '_rollup_key', None), rollup_key(instance)
+    if old is not None and old != new:
+        reprice_room(instance.pk, old, new)
+
+
+@receiver(post_save, sender=Hotel)
+@receiver(post_save, sender=Room)
+def catalog_saved(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    action = ChangeLog.DELETE if instance.deleted_at else ChangeLog.UPSERT
+    record_change(RESOURCE_NAMES[sender], instance.pk, action)
+
+
+@receiver(post_delete, sender=Hotel)
+@receiver(post_delete, sender=Room)
+def catalog_deleted(sender, instance, **kwargs):
+    # надгробок уже записано при збереженні deleted_at; тут — лише видалення в обхід надгробків
+    if instance.deleted_at is None:
+        record_change(RESOURCE_NAMES[sender], instance.pk, ChangeLog.DELETE)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def user_changed(sender, instance, **kwargs):
+    forget_user(instance.pk)
+
+
+@receiver(connection_created)
+def add_query_timer(sender, connection, **kwargs):
+    install_query_timer(connection)
+
+
+@receiver(connection_created)
+def apply_sqlite_pragmas(sender, connection, **kwargs):
+    pragmas = getattr(settings, 'BOOKING_SQLITE_PRAGMAS', None)
+    if not pragmas or connection.vendor != 'sqlite':
+        return
+    read_only = 'mode=ro' in str(connection.settings_dict['NAME'])
+    with connection.cursor() as cursor:
+        for name, value in pragmas.items():
+            # journal_mode зберігається у файлі БД; з read-only з'єднання його не змінити
+            if read_only and name == 'journal_mode':
+                continue
+            cursor.execute('PRAGMA %s = %s' % (name, value))
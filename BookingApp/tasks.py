@@ -0,0 +1,77 @@
+from django.contrib.auth.models import User
+from django.db import transaction
+
+from .jobs import report_progress, task
+from .models import ArchivedReservation, DailyRollup, Hotel, Reservation, Room
+from .occupancy import delete_reservations
+
+# Рядків на одну транзакцію: SQLite тримає блокування запису лише на час порції
+PURGE_BATCH_SIZE = 500
+
+
+def delete_rows(queryset):
+    with transaction.atomic():
+        queryset.delete()
+
+
+def purge(job, steps):
+    # steps — [(назва, queryset, delete)]. Видаляємо порціями по PURGE_BATCH_SIZE, кожна — окрема коротка
+    # транзакція; після кожної в job.progress пишемо {назва: {'deleted': n, 'total': m}} і продовжуємо оренду.
+    # Повтор після збою продовжує з місця зупинки: вже видалені рядки просто не знайдуться.
+    progress = {name: job.progress.get(name, {'deleted': 0}) for name, _, _ in steps}
+    for name, queryset, _ in steps:
+        progress[name]['total'] = progress[name]['deleted'] + queryset.count()
+    report_progress(job, **progress)
+
+    for name, queryset, delete in steps:
+        manager = queryset.model._base_manager
+        pks = queryset.order_by('pk').values_list('pk', flat=True)
+        while True:
+            batch = list(pks[:PURGE_BATCH_SIZE])
+            if not batch:
+                break
+            delete(manager.filter(pk__in=batch))
+            progress[name]['deleted'] += len(batch)
+            report_progress(job, **{name: progress[name]})
+
+
+@task('delete_user')
+def delete_user(job):
+    # Видалення облікового запису після DELETE /delete-user/: користувач уже неактивний
+    user = User.objects.filter(pk=job.payload['user_id'], is_active=False).first()
+    if user is None:
+        return
+    purge(job, [
+        ('reservations', Reservation.objects.filter(client=user), delete_reservations),
+        ('archive', ArchivedReservation.objects.filter(client=user), delete_rows),
+    ])
+    user.delete()
+
+
+@task('purge_hotel')
+def purge_hotel(job):
+    # Готель і його кімнати вже надгробки (services.delete_hotel); тут — усе, що від них залежить.
+    # Ночі календаря йдуть каскадом разом з бронюваннями, зведення — після них (інакше delete_reservations
+    # створив би їх наново з від'ємними значеннями).
+    hotel = Hotel.all_objects.filter(pk=job.payload['hotel_id'], deleted_at__isnull=False).first()
+    if hotel is None:
+        return
+    purge(job, [
+        ('reservations', Reservation.objects.filter(hotel=hotel), delete_reservations),
+        ('archive', ArchivedReservation.objects.filter(hotel=hotel), delete_rows),
+        ('rollups', DailyRollup.objects.filter(hotel=hotel), delete_rows),
+        ('rooms', Room.all_objects.filter(hotel=hotel), delete_rows),
+    ])
+    hotel.delete()
+
+
+@task('purge_room')
+def purge_room(job):
+    room = Room.all_objects.filter(pk=job.payload['room_id'], deleted_at__isnull=False).first()
+    if room is None:
+        return
+    purge(job, [
+        ('reservations', Reservation.objects.filter(room=room), delete_reservations),
+        ('archive', ArchivedReservation.objects.filter(room=room), delete_rows),
+    ])
+    room.delete()
@@ -0,0 +1,168 @@
+import csv
+import json
+from itertools import islice
+
+from django.contrib.auth.models import User
+from django.core.exceptions import ValidationError
+from django.db import transaction
+
+from .models import ArchivedReservation, Hotel, Room, Reservation
+from .cache import invalidate
+from .changes import record_changes
+from .events import publish_reservations, reservation_row
+from .occupancy import add_reservations_nights
+from .services import find_batch_conflicts, lock_rooms
+
+# Які колонки читаємо/пишемо для кожної моделі; зовнішні ключі — це первинні ключі пов'язаних об'єктів
+SPECS = {
+    'hotels': {'model': Hotel, 'fields': ['id', 'name', 'address'], 'related': {}},
+    'rooms': {'model': Room, 'fields': ['id', 'hotel', 'room_number', 'room_type', 'price_per_night'],
+              'related': {'hotel': Hotel}},
+    'reservations': {'model': Reservation, 'fields': ['id', 'hotel', 'room', 'client', 'check_in_date', 'check_out_date'],
+                     'related': {'hotel': Hotel, 'room': Room, 'client': User}},
+}
+FORMATS = ('csv', 'jsonl')
+
+
+def read_rows(stream, fmt):
+    if fmt == 'csv':
+        yield from csv.DictReader(stream)
+    else:
+        for line in stream:
+            if line.strip():
+                yield json.loads(line)
+
+
+def chunks(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def convert_row(spec, row, related):
+    # Значення перетворюємо полями моделі (Decimal, date ...), без повного full_clean на кожен рядок
+    model = spec['model']
+    values = {}
+    for name in spec['fields']:
+        value = row.get(name)
+        if value in (None, ''):
+            if name == 'id':
+                continue
+            raise ValidationError('%s is required' % name)
+        if name in spec['related']:
+            try:
+                values[name] = related[name][int(value)]
+            except (KeyError, TypeError, ValueError):
+                raise ValidationError('%s %s does not exist' % (name, value))
+        else:
+            values[name] = model._meta.get_field(name).to_python(value)
+    obj = model(**values)
+    if model is Reservation and obj.check_out_date <= obj.check_in_date:
+        raise ValidationError('check_out_date must be later than check_in_date')
+    return obj
+
+
+def load_related(spec, rows):
+    # Один запит на кожен зовнішній ключ для всієї порції рядків
+    related = {}
+    for name, model in spec['related'].items():
+        pks = set()
+        for row in rows:
+            try:
+                pks.add(int(row.get(name)))
+            except (TypeError, ValueError):
+                pass
+        related[name] = model.objects.in_bulk(pks)
+    return related
+
+
+def import_rows(kind, rows, batch_size=1000, progress=None):
+    spec = SPECS[kind]
+    model = spec['model']
+    imported = 0
+    errors = []
+    line = 0
+    for chunk in chunks(rows, batch_size):
+        related = load_related(spec, chunk)
+        objs = []
+        lines = []
+        for row in chunk:
+            line += 1
+            try:
+                objs.append(convert_row(spec, row, related))
+                lines.append(line)
+            except ValidationError as exc:
+                errors.append({'row': line, 'error': '; '.join(exc.messages)})
+        with transaction.atomic():
+            if model is Reservation:
+                lock_rooms([reservation.room_id for reservation in objs])
+            objs, lines = skip_existing(model, objs, lines, errors)
+            if model is Reservation:
+                objs = skip_conflicts(objs, lines, errors)
+            created = model.objects.bulk_create(objs)
+            if model is Reservation:
+                # bulk_create не викликає post_save, тому календар оновлюємо явно
+                add_reservations_nights(created)
+                publish_reservations('created', [reservation_row(reservation) for reservation in created])
+            record_changes(kind, [obj.pk for obj in created])
+        imported += len(created)
+        if model is not Reservation:
+            invalidate(kind)
+        if progress:
+            progress(imported, len(errors))
+    return imported, errors
+
+
+def skip_existing(model, objs, lines, errors):
+    # id з експорту вставляємо як є; зайняті id (у тому числі надгробками й архівом) і повтори в порції
+    # пропускаємо з помилкою на рядок — інакше IntegrityError втратив би всю порцію
+    pks = {obj.pk for obj in objs if obj.pk is not None}
+    existing = set(model._base_manager.filter(pk__in=pks).values_list('pk', flat=True)) if pks else set()
+    if pks and model is Reservation:
+        existing.update(ArchivedReservation.objects.filter(pk__in=pks).values_list('pk', flat=True))
+    kept, kept_lines = [], []
+    for obj, line in zip(objs, lines):
+        if obj.pk is not None:
+            if obj.pk in existing:
+                errors.append({'row': line, 'error': 'id %s already exists' % obj.pk})
+                continue
+            existing.add(obj.pk)
+        kept.append(obj)
+        kept_lines.append(line)
+    return kept, kept_lines
+
+
+def skip_conflicts(reservations, lines, errors):
+    items = [{'room': r.room, 'check_in_date': r.check_in_date, 'check_out_date': r.check_out_date}
+             for r in reservations]
+    conflicts = find_batch_conflicts(items)
+    for index in sorted(conflicts):
+        errors.append({'row': lines[index], 'error': 'room is already booked for these dates'})
+    return [r for index, r in enumerate(reservations) if index not in conflicts]
+
+
+def export_rows(kind, batch_size=2000):
+    # values_list + iterator: у пам'яті лише одна порція рядків
+    spec = SPECS[kind]
+    columns = [name + '_id' if name in spec['related'] else name for name in spec['fields']]
+    queryset = spec['model'].objects.order_by('pk').values_list(*columns)
+    for values in queryset.iterator(chunk_size=batch_size):
+        yield dict(zip(spec['fields'], values))
+
+
+def write_rows(stream, fmt, fields, rows):
+    count = 0
+    if fmt == 'csv':
+        writer = csv.DictWriter(stream, fieldnames=fields)
+        writer.writeheader()
+        for row in rows:
+            writer.writerow(row)
+            count += 1
+    else:
+        for row in rows:
+            stream.write(json.dumps(row, default=str, ensure_ascii=False) + '\n')
+            count += 1
+    return count
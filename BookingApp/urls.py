@@ -8,10 +8,32 @@ urlpatterns = [
     # вивід готелів, кімнат, бронювань і їх деталей
     path('hotels/', views.HotelListView.as_view(), name='hotel-list'),
     path('hotels/<int:pk>/', views.HotelDetailView.as_view(), name='hotel-detail'),
+    # календар зайнятості кімнат готелю
+    path('hotels/<int:pk>/calendar/', views.HotelCalendarView.as_view(), name='hotel-calendar'),
+    # денна зайнятість і виручка готелю зі зведень (лише для адміністраторів)
+    path('hotels/<int:pk>/analytics/', views.HotelAnalyticsView.as_view(), name='hotel-analytics'),
     path('rooms/', views.RoomListView.as_view(), name='room-list'),
+    # пошук кімнат з фільтрами, сортуванням і фасетами
+    path('rooms/search/', views.RoomSearchView.as_view(), name='room-search'),
     path('room/<int:pk>/', views.RoomDetailView.as_view(), name='room-detail'),
     path('reservations/', views.ReservationListView.as_view(), name='reservation-list'),
+    # групове бронювання багатьох кімнат одним запитом
+    path('reservations/batch/', views.ReservationBatchView.as_view(), name='reservation-batch'),
     path('reservation/<int:pk>/', views.ReservationDetailView.as_view(), name='reservation-detail'),
+    # тимчасове утримання кімнати на час оформлення і його підтвердження в бронювання
+    path('holds/', views.RoomHoldListView.as_view(), name='hold-list'),
+    path('holds/<int:pk>/', views.RoomHoldDetailView.as_view(), name='hold-detail'),
+    path('holds/<int:pk>/confirm/', views.RoomHoldConfirmView.as_view(), name='hold-confirm'),
+    # пошук вільних кімнат на період check_in_date - check_out_date
+    path('availability/', views.AvailabilitySearchView.as_view(), name='availability-search'),
+    # статистика часу запитів по ендпоінтах (лише для адміністраторів)
+    path('stats/timings/', views.TimingStatsView.as_view(), name='timing-stats'),
+    # дельта-синхронізація: зміни каталогу і бронювань після курсора ?since=
+    path('changes/', views.ChangesView.as_view(), name='changes'),
+    # стан і хід фонової задачі (видалення готелю/кімнати повертає 202 з Location сюди)
+    path('jobs/<int:pk>/', views.JobDetailView.as_view(), name='job-detail'),
+    # async-версії GET-ендпоінтів вище (BookingApp/async_urls.py)
+    path('async/', include('BookingApp.async_urls')),
     # аутентифікація звичайна по логіну та паролю
     path('drf-auth/', include('rest_framework.urls')),
     # реєстрація користувача POST запит email, first_name, last_name, password
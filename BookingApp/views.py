@@ -3,35 +3,86 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status, viewsets, permissions
 from rest_framework.decorators import api_view, permission_classes
-from rest_framework.permissions import IsAuthenticatedOrReadOnly, IsAuthenticated, AllowAny
+from rest_framework.permissions import IsAuthenticatedOrReadOnly, IsAuthenticated, AllowAny, IsAdminUser
 
 #______________Django______________________
+from django.db.models import Sum
 from django.http import Http404
+from django.utils import timezone
 from django.contrib.auth.models import User
 from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.utils.cache import patch_vary_headers
 
 #___________OTHER___________________________
-from .models import Hotel, Room, Reservation
+from decimal import Decimal
+from .models import Hotel, Room, RoomHold, Reservation, ArchivedReservation, DailyRollup, Job, PRICE_BUCKETS
 from .serializers import HotelSerializer, RoomSerializer, ReservationSerializer, UserSerializer, UserRegistrationSerializer
+from .serializers import AvailableRoomSerializer, AvailabilitySearchSerializer, CalendarQuerySerializer
+from .serializers import HotelExpandedSerializer, HotelExpandQuerySerializer, RoomSearchSerializer, values_serializer
+from .serializers import AnalyticsQuerySerializer, JobSerializer, ReservationRangeSerializer, RoomHoldSerializer
+from .serializers import ChangesQuerySerializer
+from .occupancy import occupancy_calendar, stay_nights
+from .pagination import list_response, RoomSearchPagination, TRUE_VALUES
+from .cache import cached_get
+from .authentication import as_user
+from .routers import replica_read
+from .middleware import TIMING_SETTINGS, stats as timing_stats
+from .services import MAX_BATCH_SIZE, create_reservation, create_reservations_batch, update_reservation
+from .services import delete_hotel, delete_room, create_hold, confirm_hold
+from .jobs import enqueue
+from .archive import reservations_in_range
+from .idempotency import idempotent
+from .renderers import LIST_RENDERER_CLASSES
+from .changes import PAGE_SIZE as CHANGES_PAGE_SIZE, changes_page
 
 #___________SWAGGER_________________________
 from drf_yasg import openapi
 from drf_yasg.utils import swagger_auto_schema
 
+CENTS = Decimal('0.01')
+
+IDEMPOTENCY_KEY = openapi.Parameter('Idempotency-Key', openapi.IN_HEADER, type=openapi.TYPE_STRING,
+                                    description="Retries with the same key get the first response replayed (24h)")
+
+LIST_PARAMETERS = [
+    openapi.Parameter('cursor', openapi.IN_QUERY, description="Cursor of the page (returned as next/previous)", type=openapi.TYPE_STRING),
+    openapi.Parameter('page_size', openapi.IN_QUERY, description="Enables cursor pagination with the given page size", type=openapi.TYPE_INTEGER),
+    openapi.Parameter('stream', openapi.IN_QUERY, description="Stream the whole list (JSON array, columnar or CSV)", type=openapi.TYPE_BOOLEAN),
+    openapi.Parameter('format', openapi.IN_QUERY, description="Response format instead of the Accept header (CSV pages carry next/previous in the Link header)",
+                      type=openapi.TYPE_STRING, enum=[renderer.format for renderer in LIST_RENDERER_CLASSES]),
+]
+
+class ListFormatsMixin:
+    # Списки віддаються також у компактних форматах (Accept або ?format=columnar|csv|msgpack)
+    renderer_classes = LIST_RENDERER_CLASSES
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        patch_vary_headers(response, ['Accept'])
+        return response
+
+def job_accepted(request, job):
+    url = request.build_absolute_uri(reverse('job-detail', args=[job.pk]))
+    return Response(JobSerializer(job).data, status=status.HTTP_202_ACCEPTED, headers={'Location': url})
+
 @swagger_auto_schema(
     method='delete',
     operation_description="Delete the authenticated user",
-    responses={204: 'No Content', 403: 'Permission denied'}
+    responses={202: 'Accepted', 403: 'Permission denied'}
 )
 @api_view(['DELETE'])
 @permission_classes([permissions.IsAuthenticated])
 def delete_user(request):
-    user_to_delete = request.user  # Отримання користувача, який намагається видалити свій обліковий запис
+    user_to_delete = as_user(request.user)  # Отримання користувача, який намагається видалити свій обліковий запис
 
     # Перевірка, чи користувач спробує видалити себе
-    if user_to_delete == request.user:
-        user_to_delete.delete()
-        return Response({'message': 'User deleted successfully'}, status=status.HTTP_204_NO_CONTENT)
+    if user_to_delete.pk == request.user.pk:
+        # Вимикаємо обліковий запис одразу, а видалення з усіма бронюваннями виконає фоновий воркер (run_jobs)
+        user_to_delete.is_active = False
+        user_to_delete.save(update_fields=['is_active'])
+        job = enqueue('delete_user', {'user_id': user_to_delete.pk})
+        return Response({'message': 'User deletion scheduled', 'job': job.pk}, status=status.HTTP_202_ACCEPTED)
     else:
         return Response({'error': 'Permission denied'}, status=status.HTTP_403_FORBIDDEN)
 
@@ -39,9 +90,11 @@ def delete_user(request):
     method='post',
     operation_description="Register a new user",
     request_body=UserRegistrationSerializer,
-    responses={201: 'Created', 400: 'Bad Request'}
+    manual_parameters=[IDEMPOTENCY_KEY],
+    responses={201: 'Created', 400: 'Bad Request', 409: 'Same Idempotency-Key in progress', 422: 'Idempotency-Key reused'}
 )
 @api_view(['POST'])
+@idempotent('register')
 def register_user(request):
     # Перевірка наявності користувача з таким самим email
     existing_user = User.objects.filter(email=request.data.get('email')).first()
@@ -67,17 +120,19 @@ class UserViewSet(viewsets.ModelViewSet):
         headers = self.get_success_headers(serializer.data)
         return Response(serializer.data, status=status.HTTP_201_CREATED, headers=headers)
 
-class HotelListView(APIView):
+class HotelListView(ListFormatsMixin, APIView):
     permission_classes = [IsAuthenticatedOrReadOnly]
 
     @swagger_auto_schema(
         operation_description="Get a list of hotels",
+        manual_parameters=LIST_PARAMETERS,
         responses={200: openapi.Response('List of hotels', HotelSerializer(many=True))}
     )
+    @cached_get('hotels')
+    @replica_read
     def get(self, request, format=None):
         hotels = Hotel.objects.all()
-        serializer = HotelSerializer(hotels, many=True)
-        return Response(serializer.data)
+        return list_response(request, hotels, HotelSerializer, self)
 
     @swagger_auto_schema(
         operation_description="Create a new hotel",
@@ -97,14 +152,31 @@ class HotelDetailView(APIView):
         operation_description="Get details of a specific hotel",
         manual_parameters=[
             openapi.Parameter('pk', openapi.IN_PATH, description="Hotel ID", type=openapi.TYPE_INTEGER),
+            openapi.Parameter('expand', openapi.IN_QUERY, description="'rooms' adds rooms, room type aggregates and occupancy", type=openapi.TYPE_STRING, enum=['rooms']),
+            openapi.Parameter('date', openapi.IN_QUERY, description="Night for occupancy with expand=rooms (YYYY-MM-DD, default today)", type=openapi.TYPE_STRING),
         ],
-        responses={200: openapi.Response('Hotel details', HotelSerializer)}
+        responses={200: openapi.Response('Hotel details', HotelSerializer), 400: 'Bad Request'}
     )
+    @cached_get('hotels', bypass=lambda request: 'expand' in request.query_params)
+    @replica_read
     def get(self, request, pk, format=None):
+        params = HotelExpandQuerySerializer(data=request.query_params)
+        if not params.is_valid():
+            return Response(params.errors, status=status.HTTP_400_BAD_REQUEST)
+        if params.validated_data.get('expand') == 'rooms':
+            return self.get_expanded(pk, params.validated_data.get('date') or timezone.localdate())
         hotel = get_object_or_404(Hotel, pk=pk)
         serializer = HotelSerializer(hotel)
         return Response(serializer.data)
 
+    def get_expanded(self, pk, date):
+        # Три запити незалежно від кількості кімнат: готель з агрегатами, кімнати із зайнятістю, статистика по типах.
+        # Зайнятість жива, тому ця відповідь не кешується.
+        hotel = get_object_or_404(Hotel.objects.with_room_stats(date).with_rooms(date), pk=pk)
+        hotel.stats_date = date
+        hotel.room_types = Room.objects.filter(hotel_id=pk).type_stats(date)
+        return Response(HotelExpandedSerializer(hotel).data)
+
     @swagger_auto_schema(
         operation_description="Update details of a specific hotel",
         manual_parameters=[
@@ -126,23 +198,25 @@ class HotelDetailView(APIView):
         manual_parameters=[
             openapi.Parameter('pk', openapi.IN_PATH, description="Hotel ID", type=openapi.TYPE_INTEGER),
         ],
-        responses={204: 'No Content'}
+        responses={202: JobSerializer}
     )
     def delete(self, request, pk, format=None):
+        # Готель зникає одразу, кімнати й бронювання видаляються у фоні; хід — за посиланням Location
         hotel = get_object_or_404(Hotel, pk=pk)
-        hotel.delete()
-        return Response(status=status.HTTP_204_NO_CONTENT)
-class RoomListView(APIView):
+        return job_accepted(request, delete_hotel(hotel, owner=as_user(request.user)))
+class RoomListView(ListFormatsMixin, APIView):
     permission_classes = [IsAuthenticatedOrReadOnly]
 
     @swagger_auto_schema(
         operation_description="Get a list of rooms",
+        manual_parameters=LIST_PARAMETERS,
         responses={200: openapi.Response('List of rooms', RoomSerializer(many=True))}
     )
+    @cached_get('rooms')
+    @replica_read
     def get(self, request, format=None):
         rooms = Room.objects.all()
-        serializer = RoomSerializer(rooms, many=True)
-        return Response(serializer.data)
+        return list_response(request, rooms, RoomSerializer, self)
 
     @swagger_auto_schema(
         operation_description="Create a new room",
@@ -156,6 +230,63 @@ class RoomListView(APIView):
             return Response(serializer.data, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
+class RoomSearchView(ListFormatsMixin, APIView):
+    permission_classes = [IsAuthenticatedOrReadOnly]
+
+    @swagger_auto_schema(
+        operation_description="Search rooms by hotel, type and price range with ordering. Besides the page of results "
+                              "returns the total count and facet counts by room type and price bucket for the filtered rooms. "
+                              "The page and the facets are two database queries in one request, not one: the cursor "
+                              "condition of the page must not narrow the facet counts, so they cannot share a WHERE "
+                              "(window aggregates would count only rows after the cursor). Both are cached together "
+                              "with the response until the rooms change",
+        manual_parameters=[
+            openapi.Parameter('hotel', openapi.IN_QUERY, description="Hotel ID", type=openapi.TYPE_INTEGER),
+            openapi.Parameter('room_type', openapi.IN_QUERY, description="Room type", type=openapi.TYPE_STRING),
+            openapi.Parameter('min_price', openapi.IN_QUERY, description="Minimal price per night", type=openapi.TYPE_NUMBER),
+            openapi.Parameter('max_price', openapi.IN_QUERY, description="Maximal price per night", type=openapi.TYPE_NUMBER),
+            openapi.Parameter('ordering', openapi.IN_QUERY, description="Sort order", type=openapi.TYPE_STRING, enum=list(RoomSearchSerializer.ORDERINGS)),
+            openapi.Parameter('cursor', openapi.IN_QUERY, description="Cursor of the page (returned as next/previous)", type=openapi.TYPE_STRING),
+            openapi.Parameter('page_size', openapi.IN_QUERY, description="Page size", type=openapi.TYPE_INTEGER),
+        ],
+        responses={200: 'Rooms page with count and facets', 400: 'Bad Request'}
+    )
+    @cached_get('rooms')
+    @replica_read
+    def get(self, request, format=None):
+        params = RoomSearchSerializer(data=request.query_params)
+        if not params.is_valid():
+            return Response(params.errors, status=status.HTTP_400_BAD_REQUEST)
+        data = params.validated_data
+        rooms = Room.objects.matching(data.get('hotel'), data.get('room_type'), data.get('min_price'), data.get('max_price'))
+
+        # Два запити, а не один: сторінка результатів і один GROUP BY для фасетів та загальної кількості.
+        # Умова курсора звужує лише сторінку, тож віконні агрегати в тому ж запиті рахували б фасети лише
+        # після курсора; UNION із рядками фасетів не пройде через курсорну пагінацію. Обидва кешуються з відповіддю
+        facets = room_facets(rooms.facet_counts(PRICE_BUCKETS), PRICE_BUCKETS)
+        fast = values_serializer(AvailableRoomSerializer)
+        paginator = RoomSearchPagination(RoomSearchSerializer.ORDERINGS[data['ordering']])
+        page = paginator.paginate_queryset(fast.queryset(rooms), request, view=self)
+        response = paginator.get_paginated_response(fast.data(page))
+        response.data['count'] = facets.pop('count')
+        response.data['facets'] = facets
+        return response
+
+
+def room_facets(rows, bounds):
+    room_types = {}
+    buckets = [0] * (len(bounds) + 1)
+    for row in rows:
+        room_types[row['room_type']] = room_types.get(row['room_type'], 0) + row['count']
+        buckets[row['bucket']] += row['count']
+    edges = [None] + list(bounds) + [None]
+    return {
+        'count': sum(buckets),
+        'room_type': [{'value': value, 'count': count} for value, count in sorted(room_types.items())],
+        'price': [{'min': edges[i], 'max': edges[i + 1], 'count': count} for i, count in enumerate(buckets)],
+    }
+
+
 class RoomDetailView(APIView):
     permission_classes = [IsAuthenticated]
 
@@ -166,6 +297,8 @@ class RoomDetailView(APIView):
         ],
         responses={200: openapi.Response('Room details', RoomSerializer)}
     )
+    @cached_get('rooms')
+    @replica_read
     def get(self, request, pk, format=None):
         room = get_object_or_404(Room, pk=pk)
         serializer = RoomSerializer(room)
@@ -192,36 +325,124 @@ class RoomDetailView(APIView):
         manual_parameters=[
             openapi.Parameter('pk', openapi.IN_PATH, description="Room ID", type=openapi.TYPE_INTEGER),
         ],
-        responses={204: 'No Content'}
+        responses={202: JobSerializer}
     )
     def delete(self, request, pk, format=None):
         room = get_object_or_404(Room, pk=pk)
-        room.delete()
-        return Response(status=status.HTTP_204_NO_CONTENT)
+        return job_accepted(request, delete_room(room, owner=as_user(request.user)))
 
-class ReservationListView(APIView):
+class ReservationListView(ListFormatsMixin, APIView):
     permission_classes = [IsAuthenticatedOrReadOnly]
 
     @swagger_auto_schema(
-        operation_description="Get a list of reservations",
-        responses={200: openapi.Response('List of reservations', ReservationSerializer(many=True))}
+        operation_description="Get a list of reservations. With start_date/end_date only stays overlapping the range; "
+                              "a range that starts before the archive horizon also searches archived reservations",
+        manual_parameters=LIST_PARAMETERS + [
+            openapi.Parameter('start_date', openapi.IN_QUERY, type=openapi.TYPE_STRING, format=openapi.FORMAT_DATE),
+            openapi.Parameter('end_date', openapi.IN_QUERY, type=openapi.TYPE_STRING, format=openapi.FORMAT_DATE),
+        ],
+        responses={200: openapi.Response('List of reservations', ReservationSerializer(many=True)), 400: 'Bad Request'}
     )
+    @replica_read
     def get(self, request, format=None):
-        reservations = Reservation.objects.all()
-        serializer = ReservationSerializer(reservations, many=True)
-        return Response(serializer.data)
+        params = ReservationRangeSerializer(data=request.query_params)
+        if not params.is_valid():
+            return Response(params.errors, status=status.HTTP_400_BAD_REQUEST)
+        reservations = reservations_in_range(params.validated_data.get('start_date'), params.validated_data.get('end_date'))
+        return list_response(request, reservations, ReservationSerializer, self)
 
     @swagger_auto_schema(
         operation_description="Create a new reservation",
         request_body=ReservationSerializer,
-        responses={201: 'Created', 400: 'Bad Request'}
+        manual_parameters=[IDEMPOTENCY_KEY],
+        responses={201: 'Created', 400: 'Bad Request', 409: 'Room already booked', 422: 'Idempotency-Key reused',
+                   503: 'Room busy, retry'}
     )
+    @idempotent('reservation-list')
     def post(self, request, format=None):
+        client = as_user(request.user)  # деактивований або видалений власник JWT — 401 ще до валідації
         serializer = ReservationSerializer(data=request.data)
         if serializer.is_valid():
-            serializer.save(client=request.user)  # Використовую client для збереження користувача
+            # перевірка перетину дат і вставка атомарно, з блокуванням лише цієї кімнати
+            create_reservation(serializer, client=client)  # Використовую client для збереження користувача
             return Response(serializer.data, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+class ReservationBatchView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    @swagger_auto_schema(
+        operation_description="Create many reservations at once (all or nothing). "
+                              "Overlaps are checked for the whole batch in one query",
+        request_body=ReservationSerializer(many=True),
+        manual_parameters=[IDEMPOTENCY_KEY],
+        responses={201: 'Created', 400: 'Bad Request', 409: 'Some rooms already booked', 422: 'Idempotency-Key reused',
+                   503: 'Rooms busy, retry'}
+    )
+    @idempotent('reservation-batch')
+    def post(self, request, format=None):
+        client = as_user(request.user)
+        serializer = ReservationSerializer(data=request.data, many=True, allow_empty=False, max_length=MAX_BATCH_SIZE)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        reservations = create_reservations_batch(serializer, client=client)
+        results = [
+            dict(data, index=index, status='created', id=reservation.pk)
+            for index, (reservation, data) in enumerate(
+                zip(reservations, ReservationSerializer(reservations, many=True).data))
+        ]
+        return Response({'results': results}, status=status.HTTP_201_CREATED)
+
+class RoomHoldListView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    @swagger_auto_schema(
+        operation_description="Hold a room for a date range for ttl_minutes while the client completes checkout. "
+                              "Active holds make the room unavailable to everyone else",
+        request_body=RoomHoldSerializer,
+        responses={201: RoomHoldSerializer, 400: 'Bad Request', 409: 'Room already booked or held', 503: 'Room busy, retry'}
+    )
+    def post(self, request, format=None):
+        client = as_user(request.user)
+        serializer = RoomHoldSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        create_hold(serializer, client=client)
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+class RoomHoldDetailView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get_hold(self, request, pk):
+        return get_object_or_404(RoomHold.objects.active(), pk=pk, client_id=request.user.pk)
+
+    @swagger_auto_schema(
+        operation_description="Get an active hold of the authenticated user",
+        responses={200: RoomHoldSerializer, 404: 'Not Found or expired'}
+    )
+    def get(self, request, pk, format=None):
+        return Response(RoomHoldSerializer(self.get_hold(request, pk)).data)
+
+    @swagger_auto_schema(
+        operation_description="Release a hold",
+        responses={204: 'No Content', 404: 'Not Found or expired'}
+    )
+    def delete(self, request, pk, format=None):
+        self.get_hold(request, pk).delete()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+class RoomHoldConfirmView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    @swagger_auto_schema(
+        operation_description="Turn an active hold into a reservation",
+        responses={201: ReservationSerializer, 404: 'Not Found', 410: 'Hold expired', 503: 'Room busy, retry'}
+    )
+    def post(self, request, pk, format=None):
+        client = as_user(request.user)
+        hold = get_object_or_404(RoomHold, pk=pk, client_id=client.pk)
+        reservation = confirm_hold(hold, client=client)
+        return Response(ReservationSerializer(reservation).data, status=status.HTTP_201_CREATED)
+
 class ReservationDetailView(APIView):
     permission_classes = [IsAuthenticated]
 
@@ -229,11 +450,17 @@ class ReservationDetailView(APIView):
         operation_description="Get details of a specific reservation",
         manual_parameters=[
             openapi.Parameter('pk', openapi.IN_PATH, description="Reservation ID", type=openapi.TYPE_INTEGER),
+            openapi.Parameter('archived', openapi.IN_QUERY, description="Also look in archived reservations", type=openapi.TYPE_BOOLEAN),
         ],
         responses={200: openapi.Response('Reservation details', ReservationSerializer)}
     )
+    @replica_read
     def get(self, request, pk, format=None):
-        reservation = get_object_or_404(Reservation, pk=pk)
+        reservation = Reservation.objects.filter(pk=pk).first()
+        if reservation is None and request.query_params.get('archived', '').lower() in TRUE_VALUES:
+            reservation = ArchivedReservation.objects.filter(pk=pk).first()
+        if reservation is None:
+            raise Http404
         serializer = ReservationSerializer(reservation)
         return Response(serializer.data)
 
@@ -243,7 +470,7 @@ class ReservationDetailView(APIView):
             openapi.Parameter('pk', openapi.IN_PATH, description="Reservation ID", type=openapi.TYPE_INTEGER),
         ],
         request_body=ReservationSerializer,
-        responses={200: 'Updated', 400: 'Bad Request'}
+        responses={200: 'Updated', 400: 'Bad Request', 409: 'Room already booked', 503: 'Room busy, retry'}
     )
     def patch(self, request, pk, format=None):
         reservation = get_object_or_404(Reservation, pk=pk)
@@ -252,7 +479,7 @@ class ReservationDetailView(APIView):
 
         serializer = ReservationSerializer(reservation, data=request.data, partial=True)
         if serializer.is_valid():
-            serializer.save()
+            update_reservation(serializer)
             return Response(serializer.data)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
@@ -267,3 +494,184 @@ class ReservationDetailView(APIView):
         reservation = get_object_or_404(Reservation, pk=pk)
         reservation.delete()
         return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class AvailabilitySearchView(ListFormatsMixin, APIView):
+    permission_classes = [IsAuthenticatedOrReadOnly]
+
+    @swagger_auto_schema(
+        operation_description="Search rooms that are free for the whole [check_in_date, check_out_date) range",
+        manual_parameters=[
+            openapi.Parameter('check_in_date', openapi.IN_QUERY, description="Check-in date (YYYY-MM-DD)", type=openapi.TYPE_STRING, required=True),
+            openapi.Parameter('check_out_date', openapi.IN_QUERY, description="Check-out date (YYYY-MM-DD)", type=openapi.TYPE_STRING, required=True),
+            openapi.Parameter('hotel', openapi.IN_QUERY, description="Hotel ID", type=openapi.TYPE_INTEGER),
+            openapi.Parameter('room_type', openapi.IN_QUERY, description="Room type", type=openapi.TYPE_STRING),
+            openapi.Parameter('min_price', openapi.IN_QUERY, description="Minimal price per night", type=openapi.TYPE_NUMBER),
+            openapi.Parameter('max_price', openapi.IN_QUERY, description="Maximal price per night", type=openapi.TYPE_NUMBER),
+        ],
+        responses={200: openapi.Response('List of available rooms', AvailableRoomSerializer(many=True)), 400: 'Bad Request'}
+    )
+    @replica_read
+    def get(self, request, format=None):
+        params = AvailabilitySearchSerializer(data=request.query_params)
+        if not params.is_valid():
+            return Response(params.errors, status=status.HTTP_400_BAD_REQUEST)
+        data = params.validated_data
+
+        # Один запит: фільтри по кімнаті + NOT EXISTS по індексу (room, check_in_date, check_out_date)
+        rooms = Room.objects.available(data['check_in_date'], data['check_out_date']).matching(
+            data.get('hotel'), data.get('room_type'), data.get('min_price'), data.get('max_price'))
+
+        serializer = AvailableRoomSerializer(rooms.order_by('pk'), many=True)
+        return Response(serializer.data)
+
+
+class HotelCalendarView(APIView):
+    permission_classes = [IsAuthenticatedOrReadOnly]
+
+    @swagger_auto_schema(
+        operation_description="Occupancy calendar of all hotel rooms. Each room gets a string of '0'/'1' "
+                              "where position i tells whether the night start_date + i is booked",
+        manual_parameters=[
+            openapi.Parameter('pk', openapi.IN_PATH, description="Hotel ID", type=openapi.TYPE_INTEGER),
+            openapi.Parameter('start_date', openapi.IN_QUERY, description="First night (YYYY-MM-DD)", type=openapi.TYPE_STRING, required=True),
+            openapi.Parameter('days', openapi.IN_QUERY, description="Window length in nights (default 365)", type=openapi.TYPE_INTEGER),
+        ],
+        responses={200: 'Occupancy calendar', 400: 'Bad Request', 404: 'Not Found'}
+    )
+    @replica_read
+    def get(self, request, pk, format=None):
+        params = CalendarQuerySerializer(data=request.query_params)
+        if not params.is_valid():
+            return Response(params.errors, status=status.HTTP_400_BAD_REQUEST)
+        start_date = params.validated_data['start_date']
+        days = params.validated_data['days']
+
+        rooms = occupancy_calendar(pk, start_date, days)
+        if not rooms and not Hotel.objects.filter(pk=pk).exists():
+            raise Http404
+        return Response({
+            'hotel': pk,
+            'start_date': start_date,
+            'days': days,
+            'rooms': [{'room': room_id, 'occupancy': bitmap} for room_id, bitmap in rooms.items()],
+        })
+
+
+class HotelAnalyticsView(APIView):
+    permission_classes = [IsAdminUser]
+
+    @swagger_auto_schema(
+        operation_description="Daily occupancy rate and revenue of a hotel for [start_date, end_date), read from the "
+                              "incrementally maintained DailyRollup table. Occupancy rate uses the current number of rooms",
+        manual_parameters=[
+            openapi.Parameter('pk', openapi.IN_PATH, description="Hotel ID", type=openapi.TYPE_INTEGER),
+            openapi.Parameter('start_date', openapi.IN_QUERY, description="First night (YYYY-MM-DD)", type=openapi.TYPE_STRING, required=True),
+            openapi.Parameter('end_date', openapi.IN_QUERY, description="Night after the last one (YYYY-MM-DD), at most 731 days later", type=openapi.TYPE_STRING, required=True),
+            openapi.Parameter('room_type', openapi.IN_QUERY, description="Only this room type", type=openapi.TYPE_STRING),
+        ],
+        responses={200: 'Daily occupancy and revenue', 400: 'Bad Request', 403: 'Forbidden', 404: 'Not Found'}
+    )
+    @replica_read
+    def get(self, request, pk, format=None):
+        params = AnalyticsQuerySerializer(data=request.query_params)
+        if not params.is_valid():
+            return Response(params.errors, status=status.HTTP_400_BAD_REQUEST)
+        data = params.validated_data
+        rooms = Room.objects.filter(hotel_id=pk)
+        rollups = DailyRollup.objects.filter(hotel_id=pk, date__gte=data['start_date'], date__lt=data['end_date'])
+        if 'room_type' in data:
+            rooms = rooms.filter(room_type=data['room_type'])
+            rollups = rollups.filter(room_type=data['room_type'])
+
+        room_count = rooms.count()
+        if not room_count and not Hotel.objects.filter(pk=pk).exists():
+            raise Http404
+        # Сума по типах кімнат за кожну ніч — по унікальному індексу (hotel, date, room_type)
+        by_date = {
+            row['date']: row for row in
+            rollups.order_by('date').values('date').annotate(occupied=Sum('occupied_rooms'), total=Sum('revenue'))
+        }
+        days = []
+        for night in stay_nights(data['start_date'], data['end_date']):
+            row = by_date.get(night, {'occupied': 0, 'total': Decimal(0)})
+            days.append({
+                'date': night,
+                'occupied_rooms': row['occupied'],
+                'occupancy_rate': round(row['occupied'] / room_count, 4) if room_count else 0,
+                'revenue': str(row['total'].quantize(CENTS)),
+            })
+        occupied = sum(day['occupied_rooms'] for day in days)
+        return Response({
+            'hotel': pk,
+            'start_date': data['start_date'],
+            'end_date': data['end_date'],
+            'room_count': room_count,
+            'occupied_room_nights': occupied,
+            'occupancy_rate': round(occupied / (room_count * len(days)), 4) if room_count else 0,
+            'revenue': str(sum((row['total'] for row in by_date.values()), Decimal(0)).quantize(CENTS)),
+            'days': days,
+        })
+
+
+class TimingStatsView(APIView):
+    permission_classes = [IsAdminUser]
+
+    @swagger_auto_schema(
+        operation_description="Rolling per-endpoint timings (ms) collected by ServerTimingMiddleware: "
+                              "total, view, db, render and query count with mean/p50/p95/p99/max",
+        responses={200: 'Timing statistics', 403: 'Forbidden'}
+    )
+    def get(self, request, format=None):
+        return Response({
+            'enabled': TIMING_SETTINGS.get('ENABLED', True),
+            'window': timing_stats.window,
+            'endpoints': timing_stats.snapshot(),
+        })
+
+    @swagger_auto_schema(
+        operation_description="Reset collected timings",
+        responses={204: 'No Content', 403: 'Forbidden'}
+    )
+    def delete(self, request, format=None):
+        timing_stats.clear()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class JobDetailView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    @swagger_auto_schema(
+        operation_description="Status and progress of a background job (e.g. a hotel or room deletion). "
+                              "Users see the jobs they started, administrators see all jobs",
+        manual_parameters=[
+            openapi.Parameter('pk', openapi.IN_PATH, description="Job ID", type=openapi.TYPE_INTEGER),
+        ],
+        responses={200: JobSerializer, 404: 'Not Found'}
+    )
+    def get(self, request, pk, format=None):
+        jobs = Job.objects.all()
+        if not request.user.is_staff:
+            jobs = jobs.filter(owner_id=request.user.pk)
+        return Response(JobSerializer(get_object_or_404(jobs, pk=pk)).data)
+
+
+class ChangesView(APIView):
+    permission_classes = [IsAuthenticatedOrReadOnly]
+
+    @swagger_auto_schema(
+        operation_description="Delta sync: hotels, rooms and reservations changed since the cursor, each once with "
+                              "its latest action ('upsert' with current data or 'delete'). Start with since=0, then "
+                              "pass the returned cursor; repeat while has_more. 410 means the cursor is too old, resync from 0",
+        manual_parameters=[
+            openapi.Parameter('since', openapi.IN_QUERY, description="Cursor from the previous response (0 for a full sync)", type=openapi.TYPE_INTEGER),
+            openapi.Parameter('limit', openapi.IN_QUERY, description="Change log entries per page", type=openapi.TYPE_INTEGER),
+        ],
+        responses={200: 'Changes page', 400: 'Bad Request', 410: 'Cursor expired'}
+    )
+    @replica_read
+    def get(self, request, format=None):
+        params = ChangesQuerySerializer(data=request.query_params)
+        if not params.is_valid():
+            return Response(params.errors, status=status.HTTP_400_BAD_REQUEST)
+        return Response(changes_page(params.validated_data['since'], params.validated_data.get('limit', CHANGES_PAGE_SIZE)))